@@ -1,15 +1,18 @@
 from dotenv import load_dotenv
 load_dotenv()
-import json
 import logging
-import os
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
 
 
 import requests
 
+from backend.agents.state_store import open_state_store
+from backend.agents.telemetry import RunStats, record_agent_run
+from backend.queue.base import DEFAULT_VISIBILITY_TIMEOUT, PermanentError
+
 class AgentConfig:
     """
     Holds configuration shared by all agents.
@@ -18,11 +21,14 @@ class AgentConfig:
         self,
         backend_url: str = "http://127.0.0.1:8000",
         state_path: str = "agent_state.json",
-        sleep_interval: int = 5
+        sleep_interval: int = 5,
+        state_backend: Optional[str] = None,
     ):
         self.backend_url = backend_url
         self.state_path = state_path
         self.sleep_interval = sleep_interval
+        # None = ALFRED_STATE_BACKEND ("json" or "sqlite")
+        self.state_backend = state_backend
 
 
 class BaseAgent(ABC):
@@ -31,18 +37,22 @@ class BaseAgent(ABC):
     Provides:
       - Logging
       - Persistent state
-      - HTTP client for backend
-      - Lifecycle: run → step()
+      - HTTP client for backend (calls and bytes are counted per run)
+      - Lifecycle: run → run_step() → step(), each run recorded in agent_runs
     """
 
     def __init__(self, name: str, config: AgentConfig):
         self.name = name
         self.config = config
+        self.state_store = open_state_store(config.state_path, config.state_backend)
         self.state = self._load_state()
+        self.run_stats = RunStats()
 
         # Setup logger
         self.logger = logging.getLogger(self.name)
-        if not self.logger.handlers:
+        # Under the supervisor the root logger already forwards records to
+        # the parent process; only add a console handler when standalone
+        if not self.logger.handlers and not logging.getLogger().handlers:
             handler = logging.StreamHandler()
             formatter = logging.Formatter(
                 "%(asctime)s [%(name)s] %(levelname)s: %(message)s"
@@ -58,26 +68,66 @@ class BaseAgent(ABC):
     # ----------------------------------------------------------------------
     def _load_state(self) -> Dict[str, Any]:
         """
-        Load agent state from file.
+        Load agent state from the state store.
         """
-        if not os.path.exists(self.config.state_path):
-            return {}
-        try:
-            with open(self.config.state_path, "r") as f:
-                return json.load(f)
-        except Exception:
-            return {}
+        return self.state_store.load()
+
+    def _state_put(self, section: str, key: Any, value: Any):
+        """
+        Set self.state[section][key] and persist only that entry.
+        Thread-safe; cheap enough to call from worker threads.
+        """
+        self.state_store.put(section, str(key), value)
+
+    def _state_delete(self, section: str, key: Any):
+        """
+        Remove self.state[section][key] and persist the removal.
+        """
+        self.state_store.delete(section, str(key))
+
+    def _state_drop(self, section: str):
+        """
+        Remove self.state[section] entirely and persist the removal.
+        """
+        self.state_store.drop(section)
 
-    def _save_state(self):
+    def flush_state(self):
         """
-        Save agent state to file.
+        Write pending state changes now (end of step, shutdown).
         """
         try:
-            with open(self.config.state_path, "w") as f:
-                json.dump(self.state, f, indent=2)
+            self.state_store.flush()
         except Exception as e:
             self.logger.error(f"Failed to save state: {e}")
 
+    # ----------------------------------------------------------------------
+    # Run Telemetry
+    # ----------------------------------------------------------------------
+    def record_items(self, n: int = 1):
+        """Count items handled successfully in the current run."""
+        self.run_stats.add(items=n)
+
+    def record_failures(self, n: int = 1):
+        """Count items that failed in the current run."""
+        self.run_stats.add(failures=n)
+
+    def record_http(self, bytes_fetched: int = 0):
+        """Count one outside HTTP call made without http_request() (e.g. async)."""
+        self.run_stats.add(api_calls=1, bytes_fetched=bytes_fetched)
+
+    def http_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        requests.request() that counts toward the current run's API calls
+        and bytes fetched. Agents use this for any outside HTTP call.
+        """
+        self.run_stats.add(api_calls=1)
+        resp = requests.request(method, url, **kwargs)
+        self.run_stats.add(bytes_fetched=len(resp.content))
+        return resp
+
+    def http_get(self, url: str, **kwargs) -> requests.Response:
+        return self.http_request("GET", url, **kwargs)
+
     # ----------------------------------------------------------------------
     # Backend API Helper
     # ----------------------------------------------------------------------
@@ -87,7 +137,7 @@ class BaseAgent(ABC):
         """
         try:
             url = f"{self.config.backend_url}{path}"
-            resp = requests.post(url, json=payload, timeout=180)
+            resp = self.http_request("POST", url, json=payload, timeout=180)
             resp.raise_for_status()
             return resp.json()
         except Exception as e:
@@ -100,34 +150,125 @@ class BaseAgent(ABC):
         """
         try:
             url = f"{self.config.backend_url}{path}"
-            resp = requests.get(url, timeout=30)
+            resp = self.http_get(url, timeout=30)
             resp.raise_for_status()
             return resp.json()
         except Exception as e:
             self.logger.error(f"GET {path} failed: {e}")
             return None
 
+    # ----------------------------------------------------------------------
+    # Queue Consumption
+    # ----------------------------------------------------------------------
+    def drain_queue(self, queue, handler: Callable[[Any], None], batch_size: int) -> int:
+        """
+        Lease batches from `queue` and call handler(item) for each until the
+        queue is empty. Returns the number of items handled successfully.
+
+        Successful items are acked. A handler exception schedules a retry
+        with exponential backoff; PermanentError, or running out of attempts,
+        moves the item to the queue's dead-letter store with the error.
+        """
+        processed = 0
+        while True:
+            # The lease timeout covers handling every item in the batch
+            leases = queue.lease(
+                batch_size,
+                visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT * batch_size,
+            )
+            if not leases:
+                return processed
+
+            for lease in leases:
+                if lease.attempts > queue.max_attempts:
+                    # Leased and never acked/nacked this often: the worker
+                    # keeps dying on it, so stop handing it out.
+                    queue.dead_letter(lease, f"lease expired {lease.attempts - 1} times without ack")
+                    self.record_failures()
+                    self.logger.error(f"Dead-lettered queue item {lease.item}: lease kept expiring")
+                    continue
+                if lease.attempts > 1:
+                    self.logger.info(f"Re-delivered queue item (attempt {lease.attempts}/{queue.max_attempts})")
+
+                try:
+                    handler(lease.item)
+                except PermanentError as e:
+                    queue.dead_letter(lease, str(e))
+                    self.record_failures()
+                    self.logger.error(f"Dead-lettered queue item {lease.item}: {e}")
+                    continue
+                except Exception as e:
+                    self.record_failures()
+                    error = f"{type(e).__name__}: {e}"
+                    if queue.retry(lease, error):
+                        self.logger.error(f"Queue item {lease.item} failed, will retry: {error}")
+                    else:
+                        self.logger.error(
+                            f"Dead-lettered queue item {lease.item} after {lease.attempts} attempts: {error}"
+                        )
+                    continue
+
+                queue.ack(lease)
+                self.record_items()
+                processed += 1
+
     # ----------------------------------------------------------------------
     # Agent Lifecycle
     # ----------------------------------------------------------------------
+    def run_step(self) -> Any:
+        """
+        Run step() once and record the run in agent_runs: start/end,
+        duration, items processed, failures, API calls and bytes fetched.
+        Returns step()'s result; exceptions are recorded, then re-raised.
+        """
+        self.run_stats = RunStats()
+        started_at = datetime.now(timezone.utc)
+        t0 = time.perf_counter()
+        error = None
+        try:
+            return self.step()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record_agent_run(
+                self.name,
+                started_at,
+                datetime.now(timezone.utc),
+                (time.perf_counter() - t0) * 1000.0,
+                self.run_stats,
+                error,
+            )
+
     def run(self):
         """
-        Main loop. Agent repeatedly calls step(), saves state, and sleeps.
+        Main loop. Agent repeatedly calls step(), saves state, and waits.
         """
         self.logger.info(f"{self.name} starting run loop.")
 
         while True:
             try:
-                self.step()
-                self._save_state()
+                self.run_step()
             except Exception as e:
                 self.logger.error(f"Error in step(): {e}")
+            self.flush_state()
+
+            self.wait_for_work(self.config.sleep_interval)
 
-            time.sleep(self.config.sleep_interval)
+    def wait_for_work(self, timeout: float) -> bool:
+        """
+        Pause between steps. Queue-driven agents override this to block on
+        their input queue so they wake as soon as work arrives.
+        Returns True if woken early because work is waiting.
+        """
+        time.sleep(timeout)
+        return False
 
     @abstractmethod
     def step(self):
         """
         Must be implemented by child agents.
+        May return the amount of work produced for downstream agents (new
+        jobs, queued items); the orchestrator wakes them when it is truthy.
         """
         pass
@@ -3,9 +3,12 @@ import re
 from typing import Dict, Any, Optional
 
 from .base import BaseAgent, AgentConfig
+from backend.queue.base import PermanentError
+from backend.queue.factory import get_queue
 from backend.utils.pdf_writer import write_pdf
 from backend.db.repo import SessionLocal
 from backend.db.models import ApplicationPackage, GeneratedArtifact  # make sure this model exists
+from backend.utils.near_duplicate import canonical_artifact
 from dotenv import load_dotenv
 
 
@@ -25,20 +28,29 @@ class CoverLetterAgent(BaseAgent):
     CoverLetterAgent V2
 
     Responsibilities:
-      - Pops "strong match" jobs from agent state.
+      - Leases jobs that ResumeAgent pushed to the "cover_letter_queue" queue;
+        failures are retried with backoff, then dead-lettered.
       - Fetches job details from /jobs/{id}.
       - Calls /jobs/generate_cover_letter to generate tailored CL text.
       - Writes a PDF copy to backend/generated/cover_letters.
       - Persists metadata into ApplicationPackage.
       - Persists full text into GeneratedArtifact (artifact_type='cover_letter').
       - Tracks completed cover letters in agent state.
+      - Reuses the canonical job's cover letter for a near-duplicate job
+        (jobs.canonical_job_id) posted by the same company; a letter
+        addressed to another company is never reused.
     """
 
+    DEFAULT_BATCH_SIZE = 5
+
     def __init__(self, config: AgentConfig):
         super().__init__("CoverLetterAgent", config)
 
-        if "completed_cover_letters" not in self.state:
-            self.state["completed_cover_letters"] = {}
+
+        self.batch_size = max(1, int(os.getenv("COVER_LETTER_AGENT_BATCH_SIZE", self.DEFAULT_BATCH_SIZE)))
+
+        # Queue: jobs with a finished resume, pushed by ResumeAgent
+        self.cover_letter_queue = get_queue("cover_letter_queue")
 
     # -------------------------
     # Backend Helpers
@@ -46,18 +58,29 @@ class CoverLetterAgent(BaseAgent):
     def fetch_job(self, job_id: int) -> Optional[Dict[str, Any]]:
         return self.api_get(f"/jobs/{job_id}")
 
+    def reusable_cover_letter(self, job_id: int, company: str) -> Optional[GeneratedArtifact]:
+        """The canonical job's cover letter, if job_id is a near-duplicate from the same company."""
+        db = SessionLocal()
+        try:
+            return canonical_artifact(db, job_id, "cover_letter", company=company or "")
+        finally:
+            db.close()
+
     def generate_cover_letter(
         self,
         title: str,
         company: str,
         description: str,
         extra_config: Optional[Dict[str, Any]] = None,
+        job_id: Optional[int] = None,
     ) -> Optional[str]:
+        # job_id lets the endpoint use the job's precomputed artifact neighbors
         payload: Dict[str, Any] = {
             "title": title,
             "company": company,
             "description": description,
             "top_k": 5,
+            "job_id": job_id,
         }
         if extra_config:
             payload["config"] = extra_config
@@ -70,14 +93,8 @@ class CoverLetterAgent(BaseAgent):
     # -------------------------
     # State Helpers
     # -------------------------
-    def get_next_match(self) -> Optional[Dict[str, Any]]:
-        matches = self.state.get("strong_matches", [])
-        if matches:
-            return matches.pop(0)
-        return None
-
     def is_completed(self, job_id: int) -> bool:
-        return str(job_id) in self.state["completed_cover_letters"]
+        return str(job_id) in self.state.get("completed_cover_letters", {})
 
     def mark_completed(
         self,
@@ -87,32 +104,45 @@ class CoverLetterAgent(BaseAgent):
         pdf_path: str,
         score: Any,
     ) -> None:
-        self.state["completed_cover_letters"][str(job_id)] = {
+        self._state_put("completed_cover_letters", job_id, {
             "job_id": job_id,
             "title": title,
             "company": company,
             "cover_letter_pdf": pdf_path,
             "score": score,
-        }
+        })
 
     # -------------------------
     # Main Step
     # -------------------------
-    def step(self) -> None:
+    def step(self) -> int:
+        """Drain cover_letter_queue; returns how many items were completed."""
 
-        self.logger.info("CoverLetterAgent: checking matches...")
+        self.logger.info("CoverLetterAgent: checking cover_letter_queue...")
 
-        match = self.get_next_match()
-        if not match:
+        # Failed items are retried with backoff, then dead-lettered
+        processed = self.drain_queue(self.cover_letter_queue, self.process_match, self.batch_size)
+
+        if processed:
+            self.logger.info(f"CoverLetterAgent: drained {processed} queue items.")
+        else:
             self.logger.info("CoverLetterAgent: no matches.")
-            return
+        return processed
+
+    def wait_for_work(self, timeout: float) -> bool:
+        """Sleep only while cover_letter_queue is empty."""
+        return self.cover_letter_queue.wait_for_items(timeout)
 
+    def process_match(self, match: Dict[str, Any]) -> None:
+        """
+        Generate, store and record the cover letter for one queue message.
+        Raises on failure so the queue item is retried.
+        """
         job_id = match.get("job_id")
         score = match.get("score")
 
         if job_id is None:
-            self.logger.error("CoverLetterAgent: malformed match, missing job_id.")
-            return
+            raise PermanentError("Malformed match: missing job_id")
 
         if self.is_completed(job_id):
             self.logger.info(f"CoverLetterAgent: job {job_id} already processed.")
@@ -120,8 +150,7 @@ class CoverLetterAgent(BaseAgent):
 
         job = self.fetch_job(job_id)
         if not job:
-            self.logger.error(f"CoverLetterAgent: failed to fetch job {job_id}")
-            return
+            raise RuntimeError(f"Failed to fetch job {job_id}")
 
         title = job.get("title", "")
         company = job.get("company", "")
@@ -130,10 +159,16 @@ class CoverLetterAgent(BaseAgent):
         # Optional future config hook (role, template, tone, etc.)
         extra_config: Dict[str, Any] = {}
 
-        cl_text = self.generate_cover_letter(title, company, description, extra_config)
-        if cl_text is None:
-            self.logger.error(f"CoverLetterAgent: generation failed for job {job_id}")
-            return
+        reused = self.reusable_cover_letter(job_id, company)
+        if reused is not None:
+            cl_text = reused.content
+            self.logger.info(
+                f"CoverLetterAgent: job {job_id} is a near-duplicate, reusing cover letter of job {reused.job_id}"
+            )
+        else:
+            cl_text = self.generate_cover_letter(title, company, description, extra_config, job_id=job_id)
+            if cl_text is None:
+                raise RuntimeError(f"Cover letter generation failed for job {job_id}")
 
         prefix = f"{job_id}_{safe_filename(company)}_{safe_filename(title)}"
         pdf_path = os.path.join(CL_DIR, prefix + ".pdf")
@@ -141,8 +176,7 @@ class CoverLetterAgent(BaseAgent):
         try:
             write_pdf(pdf_path, cl_text)
         except Exception as e:
-            self.logger.error(f"CoverLetterAgent: failed writing PDF for job {job_id}: {e}")
-            return
+            raise RuntimeError(f"Failed writing PDF for job {job_id}: {e}") from e
 
         self.logger.info(f"CoverLetterAgent: saved PDF → {pdf_path}")
 
@@ -156,7 +190,10 @@ class CoverLetterAgent(BaseAgent):
                 score=str(score) if score is not None else None,
                 resume_path=None,
                 cover_letter_path=pdf_path,
-                package_metadata={"agent": "CoverLetterAgent"},
+                package_metadata={
+                    "agent": "CoverLetterAgent",
+                    "reused_from_job_id": reused.job_id if reused is not None else None,
+                },
             )
             db.add(pkg)
 
@@ -181,8 +218,7 @@ class CoverLetterAgent(BaseAgent):
 
         except Exception as e:
             db.rollback()
-            self.logger.error(f"CoverLetterAgent: DB error for job {job_id}: {e}")
-            return
+            raise RuntimeError(f"DB error for job {job_id}: {e}") from e
         finally:
             db.close()
 
@@ -1,5 +1,4 @@
 import json
-import requests
 from typing import Dict, Any, Optional, List
 import os
 import re
@@ -58,12 +57,7 @@ class GitHubIngestionAgent(BaseAgent):
         #       }
         #   }
         # }
-        if "repos" not in self.state:
-            self.state["repos"] = {}
-
-        # Keep old key if it exists, but we don't rely on it anymore
-        if "ingested_repos" not in self.state:
-            self.state["ingested_repos"] = []
+        # (an old "ingested_repos" key may still exist; it is not used)
 
     # -------------------------------------------------------------------------
     # GitHub helpers
@@ -77,7 +71,7 @@ class GitHubIngestionAgent(BaseAgent):
     def fetch_repos(self) -> Optional[List[Dict[str, Any]]]:
         url = f"{self.GITHUB_API}/users/{self.github_username}/repos?per_page=100"
         try:
-            resp = requests.get(url, headers=self.headers(), timeout=30)
+            resp = self.http_get(url, headers=self.headers(), timeout=30)
             resp.raise_for_status()
             return resp.json()
         except Exception as e:
@@ -87,7 +81,7 @@ class GitHubIngestionAgent(BaseAgent):
     def fetch_repo_tree(self, repo_name: str, branch: str) -> Optional[List[Dict[str, Any]]]:
         url = f"{self.GITHUB_API}/repos/{self.github_username}/{repo_name}/git/trees/{branch}?recursive=1"
         try:
-            resp = requests.get(url, headers=self.headers(), timeout=30)
+            resp = self.http_get(url, headers=self.headers(), timeout=30)
             resp.raise_for_status()
             return resp.json().get("tree", [])
         except Exception as e:
@@ -97,7 +91,7 @@ class GitHubIngestionAgent(BaseAgent):
     def download_file(self, repo: str, path: str, branch: str) -> Optional[str]:
         raw_url = f"https://raw.githubusercontent.com/{self.github_username}/{repo}/{branch}/{path}"
         try:
-            resp = requests.get(raw_url, headers=self.headers(), timeout=30)
+            resp = self.http_get(raw_url, headers=self.headers(), timeout=30)
             if resp.status_code != 200:
                 self.logger.debug(f"Skipping {repo}/{path}, HTTP {resp.status_code}")
                 return None
@@ -232,6 +226,10 @@ Return:
 
         return self.api_post("/artifacts/ingest_raw", payload)
 
+    def _save_repo_state(self, repo: str, repo_state: Dict[str, Any], files_state: Dict[str, str]):
+        """Persist one repo's file SHAs (copied, so later edits stay local)."""
+        self._state_put("repos", repo, {**repo_state, "files": dict(files_state)})
+
     # -------------------------------------------------------------------------
     # Main step – SHA-based file-level fingerprints
     # -------------------------------------------------------------------------
@@ -247,8 +245,6 @@ Return:
             self.logger.warning("No repositories fetched from GitHub.")
             return
 
-        repos_state = self.state.setdefault("repos", {})
-
         for repo in repos:
             repo_name = repo.get("name")
             if not repo_name:
@@ -259,9 +255,9 @@ Return:
             print(f">>>[INGEST] Repo: {repo_name} (branch={default_branch})")
             self.logger.info(f"Ingesting repo: {repo_name} (branch={default_branch})")
 
-            # Get or init state for this repo
-            repo_state = repos_state.setdefault(repo_name, {})
-            files_state: Dict[str, str] = repo_state.setdefault("files", {})
+            # Working copy of this repo's state, saved through _save_repo_state()
+            repo_state = dict(self.state.get("repos", {}).get(repo_name, {}))
+            files_state: Dict[str, str] = dict(repo_state.get("files", {}))
 
             tree = self.fetch_repo_tree(repo_name, default_branch)
             if tree is None:
@@ -299,6 +295,7 @@ Return:
                 raw = self.download_file(repo_name, path, default_branch)
                 if raw is None:
                     print(f"---!! Failed to download {path}")
+                    self.record_failures()
                     continue
 
                 if ext == ".ipynb":
@@ -316,32 +313,29 @@ Return:
                 summary = self.summarize_file(repo_name, path, content)
                 if summary is None:
                     print(f"---!! Summary generation failed for {path}")
+                    self.record_failures()
                     continue
 
                 resp = self.ingest_file(repo_name, path, summary, content)
                 if resp is None:
                     print(f"---!! Artifact ingestion failed for {path}")
+                    self.record_failures()
                     continue
 
                 artifact_id = resp.get("id")
                 print(f"--OK-- Ingested file as artifact {artifact_id}")
+                self.record_items()
 
                 # Update SHA fingerprint and save state immediately
                 files_state[path] = sha
-                try:
-                    self._save_state()
-                except Exception as e:
-                    self.logger.error(f"Failed to save state after {repo_name}/{path}: {e}")
+                self._save_repo_state(repo_name, repo_state, files_state)
 
             # Optional: remove fingerprints for files that no longer exist
             removed_paths = [p for p in files_state.keys() if p not in seen_paths]
             if removed_paths:
                 for p in removed_paths:
                     del files_state[p]
-                try:
-                    self._save_state()
-                except Exception as e:
-                    self.logger.error(f"Failed to save state after pruning {repo_name}: {e}")
+                self._save_repo_state(repo_name, repo_state, files_state)
 
             print(f"--[DONE]-- Completed repo: {repo_name}")
 
@@ -384,6 +378,6 @@ if __name__ == "__main__":
     print("-->>>-->>> GitHubIngestionAgent starting...")
     print(f"   State file: {state_file}")
 
-    agent.step()  # step() saves state after each file
+    agent.run_step()  # step() saves state after each file
 
     print("✔✔✔ Done ✔✔✔")
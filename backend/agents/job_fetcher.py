@@ -1,59 +1,105 @@
 # backend/agents/job_fetcher.py
+import asyncio
 import os
 import json
-import hashlib
-import requests
-import re
-from html import unescape
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Set, Tuple
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from backend.sources.base import JobSource, SourceJob
+from backend.sources.factory import get_sources
+from backend.utils.async_http import PoliteAsyncClient
+from backend.utils.html_extract import EXTRACTOR_VERSION, extract_text
+from backend.utils.http_cache import PageCache
 from .base import BaseAgent, AgentConfig
 
 
 class JobFetcherAgent(BaseAgent):
     """
-    Fetch jobs from Adzuna and insert them into the backend.
-    Includes dedupe so we don't reinsert the same job repeatedly.
+    Fetch jobs from the configured sources (JOB_FETCHER_SOURCES, see
+    backend/sources/) and insert them into the backend.
+    Includes dedupe so we don't reinsert the same job repeatedly:
+    fingerprints are stored in jobs.job_fingerprint (unique), checked for
+    a whole fetch in one /jobs/fingerprints/lookup call, and cached in
+    memory for the life of the process. New jobs are stored with one
+    /jobs/bulk call per cycle.
+
+    All sources' pages and description hydration run concurrently on one
+    pooled async client, with a per-host concurrency cap and rate limit
+    (JOB_FETCHER_MAX_CONNECTIONS / _PER_HOST / _HOST_RPS).
+
+    Extracted descriptions are cached on disk by URL (JOB_FETCHER_CACHE_*):
+    fresh entries skip the download, stale ones are revalidated with a
+    conditional GET.
+
+    Every (query, location) combination from preferences (target_titles x
+    locations) is searched in the same cycle. Results are deduped across
+    searches and sources before hydration, and each search's yield of new
+    jobs is kept in state: after LOW_YIELD_CYCLES cycles without a new job,
+    a search is only paged JOB_FETCHER_LOW_YIELD_PAGES deep until it finds
+    one again.
+
+    Searches are sorted newest first and paged incrementally: paging stops
+    at the first page whose postings are all already stored (by fingerprint
+    or URL), so max_pages only costs requests when there is new work (e.g.
+    a backfill). The newest posting date seen per search is kept as its
+    high-water mark: a page with anything newer is new without a lookup.
     """
 
-    BASE_URL = "https://api.adzuna.com/v1/api/jobs/us/search"
     DEFAULT_QUERY = "data engineer"
     DEFAULT_LOCATION = "New York City"
     DEFAULT_RESULTS_PER_PAGE = 20
     DEFAULT_MAX_PAGES = 3  # fetch first 3 pages -> up to ~60 jobs
+    DEFAULT_MAX_CONNECTIONS = 20
+    DEFAULT_PER_HOST = 4      # requests in flight per host
+    DEFAULT_HOST_RPS = 5.0    # request starts per second per host
+    HYDRATE_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; AlfredJobFetcher/1.0)"}
+    DEFAULT_CACHE_PATH = "job_page_cache.db"
+    DEFAULT_CACHE_TTL_HOURS = 72
+    DEFAULT_CACHE_MAX_MB = 50
+    DEFAULT_LOW_YIELD_PAGES = 1
+    LOW_YIELD_CYCLES = 3      # cycles without a new job before paging less deeply
     PREFERENCES_PATH = Path(__file__).resolve().parents[1] / "profile" / "preferences.json"
 
     def __init__(self, config: AgentConfig):
         super().__init__("JobFetcher", config)
 
         # -----------------------------------------
-        # DEDUPE: track fingerprints we've already submitted
+        # DEDUPE: fingerprints known to be in the database (fast path;
+        # the database is the source of truth)
         # -----------------------------------------
-        self.state.setdefault("seen_job_hashes", [])
-        fetch_config = self.state.setdefault("fetch_config", {})
+        self.known_fingerprints: Set[str] = set()
+        self.known_urls: Set[str] = set()
+        if "seen_job_hashes" in self.state:
+            # Superseded by jobs.job_fingerprint (init_db backfills it for
+            # older rows); same hash, so still good for the fast path
+            self.known_fingerprints.update(self.state["seen_job_hashes"] or [])
+            self._state_drop("seen_job_hashes")
+        fetch_config = self.state.get("fetch_config", {})
         prefs = self._load_preferences()
 
-        pref_query = prefs.get("target_title") or ""
-        pref_location = prefs.get("location") or ""
+        pref_queries = self._as_list(prefs.get("target_titles")) or self._as_list(prefs.get("target_title"))
+        pref_locations = self._as_list(prefs.get("locations")) or self._as_list(prefs.get("location"))
         pref_results = prefs.get("results_per_page")
         pref_max_pages = prefs.get("max_pages")
 
-        # Runtime configuration (preferences -> state -> env -> defaults)
-        self.query = (
-            pref_query
-            or fetch_config.get("query")
-            or os.getenv("JOB_FETCHER_QUERY", self.DEFAULT_QUERY)
+        # Runtime configuration (preferences -> state -> env -> defaults);
+        # the env vars take several values separated by "|"
+        self.queries = (
+            pref_queries
+            or self._as_list(fetch_config.get("query"))
+            or self._as_list(os.getenv("JOB_FETCHER_QUERY", self.DEFAULT_QUERY))
         )
-        self.location = (
-            pref_location
-            or fetch_config.get("location")
-            or os.getenv("JOB_FETCHER_LOCATION", self.DEFAULT_LOCATION)
+        self.locations = (
+            pref_locations
+            or self._as_list(fetch_config.get("location"))
+            or self._as_list(os.getenv("JOB_FETCHER_LOCATION", self.DEFAULT_LOCATION))
         )
+        self.query = self.queries[0]
+        self.location = self.locations[0]
         self.results_per_page = int(
             pref_results
             or fetch_config.get("results_per_page")
@@ -64,166 +110,404 @@ class JobFetcherAgent(BaseAgent):
             or fetch_config.get("max_pages")
             or os.getenv("JOB_FETCHER_MAX_PAGES", self.DEFAULT_MAX_PAGES)
         )
+        self.low_yield_pages = min(
+            self.max_pages,
+            int(os.getenv("JOB_FETCHER_LOW_YIELD_PAGES", self.DEFAULT_LOW_YIELD_PAGES)),
+        )
+        self.max_connections = int(os.getenv("JOB_FETCHER_MAX_CONNECTIONS", self.DEFAULT_MAX_CONNECTIONS))
+        self.per_host = int(os.getenv("JOB_FETCHER_PER_HOST", self.DEFAULT_PER_HOST))
+        self.host_rps = float(os.getenv("JOB_FETCHER_HOST_RPS", self.DEFAULT_HOST_RPS))
+
+        # Hydrated page cache (empty JOB_FETCHER_CACHE_PATH disables it)
+        cache_path = os.getenv("JOB_FETCHER_CACHE_PATH", self.DEFAULT_CACHE_PATH)
+        self.page_cache: Optional[PageCache] = None
+        if cache_path:
+            self.page_cache = PageCache(
+                cache_path,
+                ttl_seconds=float(os.getenv("JOB_FETCHER_CACHE_TTL_HOURS", self.DEFAULT_CACHE_TTL_HOURS)) * 3600,
+                max_bytes=int(float(os.getenv("JOB_FETCHER_CACHE_MAX_MB", self.DEFAULT_CACHE_MAX_MB)) * 1024 * 1024),
+            )
+        self.sources: List[JobSource] = get_sources(results_per_page=self.results_per_page)
+        self._migrate_search_keys()
         self.logger.info(
-            f"JobFetcher configured for query='{self.query}', location='{self.location}', "
+            f"JobFetcher configured for sources={[src.name for src in self.sources]}, queries={self.queries}, locations={self.locations}, "
             f"results_per_page={self.results_per_page}, max_pages={self.max_pages}"
         )
 
+    @staticmethod
+    def _as_list(value: Any) -> List[str]:
+        """A list of strings (or one "|"-separated string) -> unique non-empty values."""
+        if not value:
+            return []
+        items = value.split("|") if isinstance(value, str) else value
+        out: List[str] = []
+        for item in items:
+            item = str(item).strip()
+            if item and item.lower() not in (o.lower() for o in out):
+                out.append(item)
+        return out
+
     # -----------------------------------------
-    # Helper: job fingerprint
+    # Searches: (source, query, location) fan-out and yield
     # -----------------------------------------
-    def job_fingerprint(self, job: Dict[str, Any]) -> str:
+    def searches(self) -> List[Tuple[JobSource, str, str]]:
+        return [
+            (source, query, location)
+            for source in self.sources
+            for query, location in source.searches(self.queries, self.locations)
+        ]
+
+    @staticmethod
+    def _search_key(source: str, query: str, location: str) -> str:
+        return f"{source}:{query}|{location}"
+
+    def _migrate_search_keys(self):
+        """Yield/watermark entries from before sources were keyed by source name."""
+        for section in ("search_yield", "search_watermark"):
+            for key, value in list(self.state.get(section, {}).items()):
+                if ":" not in key.split("|", 1)[0]:
+                    self._state_delete(section, key)
+                    self._state_put(section, f"adzuna:{key}", value)
+
+    def search_depth(self, source: JobSource, query: str, location: str) -> int:
+        """Pages to fetch for a search: fewer once it has stopped yielding new jobs."""
+        if not source.paged:
+            return 1
+        stats = self.state.get("search_yield", {}).get(self._search_key(source.name, query, location)) or {}
+        if stats.get("dry_cycles", 0) >= self.LOW_YIELD_CYCLES:
+            return self.low_yield_pages
+        return self.max_pages
+
+    def _record_search_yield(self, key: str, fetched: int, new: int):
+        stats = dict(self.state.get("search_yield", {}).get(key) or {})
+        stats["cycles"] = stats.get("cycles", 0) + 1
+        stats["fetched"] = stats.get("fetched", 0) + fetched
+        stats["new"] = stats.get("new", 0) + new
+        stats["last_fetched"] = fetched
+        stats["last_new"] = new
+        stats["dry_cycles"] = 0 if new else stats.get("dry_cycles", 0) + 1
+        self._state_put("search_yield", key, stats)
+
+    def search_watermark(self, key: str) -> Optional[str]:
+        """Newest posting date (SourceJob.posted_at, ISO 8601) seen by a search."""
+        return self.state.get("search_watermark", {}).get(key)
+
+    def _advance_watermark(self, key: str, jobs: List[SourceJob]):
+        newest = max((job.posted_at or "" for job in jobs), default="")
+        if newest and newest > (self.search_watermark(key) or ""):
+            self._state_put("search_watermark", key, newest)
+
+    def _page_is_known(self, jobs: List[SourceJob], watermark: Optional[str]) -> bool:
         """
-        Deterministic hash based on title + company + description.
-        This survives redirect_url churn.
+        True if every posting on the page is already stored, by fingerprint
+        or URL. Postings newer than the watermark are new without asking
+        the backend; the rest are looked up in one call.
         """
-        title = job.get("title", "") or ""
-        company = (job.get("company", {}) or {}).get("display_name", "") or ""
-        desc = job.get("description", "") or ""
-        key = (title + "|" + company + "|" + desc).strip().lower()
-        return hashlib.sha256(key.encode("utf-8")).hexdigest()
-
-    def fetch_adzuna_jobs(self) -> Optional[List[Dict[str, Any]]]:
-        """Fetch Data Engineering jobs in NYC from Adzuna with basic pagination."""
+        if watermark and any((job.posted_at or "") > watermark for job in jobs):
+            return False
+
+        unknown = [
+            (job.fingerprint, job.url) for job in jobs
+            if job.fingerprint not in self.known_fingerprints and job.url not in self.known_urls
+        ]
+        if not unknown:
+            return True
+
+        resp = self.api_post(
+            "/jobs/fingerprints/lookup",
+            {
+                "fingerprints": [fp for fp, _ in unknown],
+                "source_urls": [url for _, url in unknown],
+            },
+        )
+        if resp is None:
+            # Can't tell: keep paging
+            return False
+        self.known_fingerprints.update(resp.get("known", []))
+        self.known_urls.update(resp.get("known_urls", []))
+        return all(fp in self.known_fingerprints or url in self.known_urls for fp, url in unknown)
 
-        app_id = os.getenv("ADZUNA_AI_ID")
-        api_key = os.getenv("ADZUNA_API_KEY")
+    # -----------------------------------------
+    # Async HTTP
+    # -----------------------------------------
+    def http_client(self) -> PoliteAsyncClient:
+        """Pooled, per-host limited client; requests count toward run telemetry."""
+        return PoliteAsyncClient(
+            max_connections=self.max_connections,
+            per_host=self.per_host,
+            per_host_rps=self.host_rps,
+            timeout=30,
+            on_request=self.record_http,
+        )
 
-        if not app_id or not api_key:
-            self.logger.error("--XX-- ADZUNA_API_KEY or ADZUNA_AI_ID missing")
-            return None
+    def _run_with_client(self, fetch):
+        """Run the coroutine `fetch(client)` on a fresh event loop."""
+        async def run():
+            async with self.http_client() as client:
+                return await fetch(client)
+
+        return asyncio.run(run())
+
+    async def fetch_sources_async(self, client: PoliteAsyncClient) -> Dict[str, List[SourceJob]]:
+        """Run every search of every source at once. Returns normalized jobs per search key."""
+        runnable = []
+        for source in self.sources:
+            problem = source.check()
+            if problem:
+                self.logger.error(f"--XX-- Job source {source.name} skipped: {problem}")
+            else:
+                runnable.append(source)
+
+        searches = [s for s in self.searches() if s[0] in runnable]
+        results = await asyncio.gather(
+            *(self._fetch_search(client, source, q, loc) for source, q, loc in searches)
+        )
+        return {
+            self._search_key(source.name, q, loc): jobs
+            for (source, q, loc), jobs in zip(searches, results)
+        }
 
-        all_results: List[Dict[str, Any]] = []
+    async def _fetch_search(
+        self, client: PoliteAsyncClient, source: JobSource, query: str, location: str
+    ) -> List[SourceJob]:
+        """
+        Fetch a search newest first, one page at a time, up to its depth,
+        the first empty or failed page, or the first page of known postings.
+        """
+        key = self._search_key(source.name, query, location)
+        depth = self.search_depth(source, query, location)
+        watermark = self.search_watermark(key)
+
+        all_results: List[SourceJob] = []
+        for page in range(1, depth + 1):
+            page_results = await self._fetch_page(client, source, query, location, page)
+            if not page_results:
+                break
+            all_results.extend(page_results)
+            if page < depth and await asyncio.to_thread(self._page_is_known, page_results, watermark):
+                self.logger.info(
+                    f">>-->> {source.name} '{query}' in '{location}': page {page} is all known postings, stopping"
+                )
+                break
 
-        for page in range(1, self.max_pages + 1):
-            url = f"{self.BASE_URL}/{page}"
+        self._advance_watermark(key, all_results)
+        return all_results
 
-            params = {
-                "app_id": app_id,
-                "app_key": api_key,
-                "what": self.query,
-                "where": self.location,
-                "results_per_page": self.results_per_page,
-                "content-type": "application/json",
-            }
+    async def _fetch_page(
+        self, client: PoliteAsyncClient, source: JobSource, query: str, location: str, page: int
+    ) -> Optional[List[SourceJob]]:
+        try:
+            raw_jobs = await source.fetch_page(client, query, location, page)
+        except Exception as e:
+            self.record_failures()
+            self.logger.error(
+                f"--XX-- {source.name} request failed on page {page} "
+                f"('{query}' in '{location}'): {e}"
+            )
+            return None
 
+        jobs = []
+        for raw in raw_jobs:
             try:
-                resp = requests.get(url, params=params, timeout=30)
-                resp.raise_for_status()
-                page_results = resp.json().get("results", [])
-                if not page_results:
-                    break
-                all_results.extend(page_results)
+                job = source.normalize(raw, (query, location))
             except Exception as e:
-                self.logger.error(f"--XX-- Adzuna request failed on page {page}: {e}")
-                break
-
-        return all_results
-
-    def insert_job(self, job: Dict[str, Any]):
-        """Send job to FastAPI with dedupe protection."""
+                self.record_failures()
+                self.logger.error(f"--XX-- {source.name}: unreadable posting skipped: {e}")
+                continue
+            if job is not None:
+                jobs.append(job._replace(fingerprint=source.fingerprint(job)))
+        return jobs
+
+    def collect_new_jobs(self) -> List[SourceJob]:
+        """Fetch, dedupe and hydrate one cycle of jobs; see collect_new_jobs_async."""
+        return self._run_with_client(self.collect_new_jobs_async)
+
+    async def collect_new_jobs_async(self, client: PoliteAsyncClient) -> List[SourceJob]:
+        """
+        Run all sources' searches, drop already-stored jobs and jobs
+        repeated across searches or sources, then hydrate the rest
+        concurrently. Returns the new jobs with their final descriptions.
+        """
+        results = await self.fetch_sources_async(client)
+        jobs = [job for found in results.values() for job in found]
+        if not jobs:
+            self.logger.info("!! No jobs found.")
+            return []
+
+        # Dedupe before hydrating: known jobs never cost a page download
+        fresh = await asyncio.to_thread(self.filter_new_jobs, jobs)
+
+        # A new job counts toward every search that surfaced it
+        new_fps = {job.fingerprint for job in fresh}
+        for key, found in results.items():
+            new = len({job.fingerprint for job in found} & new_fps)
+            self._record_search_yield(key, len(found), new)
+
+        hydrating = {source.name for source in self.sources if source.hydrate}
+        descriptions = await asyncio.gather(
+            *(
+                self._hydrate_description_async(client, job)
+                for job in fresh
+                if job.source in hydrating
+            )
+        )
+        if self.page_cache is not None and descriptions:
+            await asyncio.to_thread(self.page_cache.evict)
 
-        url = job.get("redirect_url", "") or ""
-        fp = self.job_fingerprint(job)
+        hydrated = iter(descriptions)
+        return [
+            job._replace(description=next(hydrated)) if job.source in hydrating else job
+            for job in fresh
+        ]
 
-        # -----------------------------------------
-        # HARD DEDUPE: Skip jobs we've already seen via fingerprint
-        # -----------------------------------------
-        if fp in self.state["seen_job_hashes"]:
-            self.logger.info(f">>-->> Skipping already-seen job (hash): {job.get('title')}")
-            return
-
-        description = self._hydrate_description(job)
+    def filter_new_jobs(self, jobs: List[SourceJob]) -> List[SourceJob]:
+        """
+        Drop jobs whose fingerprint or URL is already stored (or repeated
+        within `jobs`). Unknown ones are checked in a single backend call.
+        """
+        fresh: Dict[str, SourceJob] = {}
+        urls: Set[str] = set()
+        for job in jobs:
+            fp = job.fingerprint
+            if fp in self.known_fingerprints or fp in fresh or job.url in self.known_urls or job.url in urls:
+                self.logger.info(f">>-->> Skipping already-seen job (hash): {job.title}")
+                continue
+            fresh[fp] = job
+            urls.add(job.url)
+
+        if not fresh:
+            return []
+
+        resp = self.api_post(
+            "/jobs/fingerprints/lookup",
+            {
+                "fingerprints": list(fresh),
+                "source_urls": [job.url for job in fresh.values()],
+            },
+        )
+        if resp is None:
+            # Lookup failed: still safe, the unique columns reject duplicates
+            return list(fresh.values())
+
+        self.known_fingerprints.update(resp.get("known", []))
+        self.known_urls.update(resp.get("known_urls", []))
+        for fp, job in list(fresh.items()):
+            if fp in self.known_fingerprints or job.url in self.known_urls:
+                del fresh[fp]
+                self.logger.info(f">>-->> Skipping already-seen job (hash): {job.title}")
+        return list(fresh.values())
+
+    def insert_jobs(self, jobs: List[SourceJob]) -> List[Dict[str, Any]]:
+        """
+        Store jobs with one /jobs/bulk call (duplicates are rejected by
+        source_url/fingerprint). Returns the newly inserted jobs.
+        """
+        if not jobs:
+            return []
 
         payload = {
-            "title": job.get("title", "Unknown Title"),
-            "company": job.get("company", {}).get("display_name", ""),
-            "location": job.get("location", {}).get("display_name", ""),
-            "description": description,
-            "source_url": url,
+            "jobs": [
+                {
+                    "title": job.title or "Unknown Title",
+                    "company": job.company,
+                    "location": job.location,
+                    "description": job.description,
+                    "source_url": job.url,
+                    "job_fingerprint": job.fingerprint,
+                }
+                for job in jobs
+            ]
         }
-
-        resp = self.api_post("/jobs/", payload)
+        resp = self.api_post("/jobs/bulk", payload)
 
         if not resp:
-            self.logger.error("--XX-- Failed to insert job into backend")
-            return
-
-        duplicate = resp.get("duplicate", False)
-        job_info = resp.get("job") or {}
-
-        if duplicate:
-            self.logger.info(f">>==>> Duplicate skipped (backend): {payload['title']}")
-        else:
-            inserted_id = job_info.get("id")
-            self.logger.info(
-                f"--OK-- Inserted job: {payload['title']} (id={inserted_id})"
-            )
-
-        # -----------------------------------------
-        # Add to seen list after successful insert
-        # -----------------------------------------
-        self.state["seen_job_hashes"].append(fp)
-
-        # keep dedupe list from exploding
-        if len(self.state["seen_job_hashes"]) > 2000:
-            self.state["seen_job_hashes"] = self.state["seen_job_hashes"][-1000:]
-
-        self._save_state()
-
-    def step(self):
-        self.logger.info("===>>> JobFetcher: checking Adzuna for new jobs...")
-        # print("DEBUG:", os.getenv("ADZUNA_AI_ID"), os.getenv("ADZUNA_API_KEY"))
-
-        jobs = self.fetch_adzuna_jobs()
-        if not jobs:
-            self.logger.info("!! No jobs found.")
-            return
-
-        for job in jobs:
-            self.insert_job(job)
-
-        self.logger.info("--OK-- JobFetcher: fetch cycle complete.")
+            self.record_failures(len(jobs))
+            self.logger.error(f"--XX-- Failed to insert {len(jobs)} jobs into backend")
+            return []
+
+        inserted = []
+        for job, result in zip(jobs, resp.get("results", [])):
+            job_info = result.get("job") or {}
+            if result.get("error"):
+                # Rejected by the database: marked known below so the same
+                # posting doesn't fail again every cycle
+                self.record_failures()
+                self.logger.error(f"--XX-- Failed to insert job {job.title} ({job.url}): {result['error']}")
+            elif result.get("duplicate", False):
+                self.logger.info(f">>==>> Duplicate skipped (backend): {job.title}")
+            else:
+                self.record_items()
+                canonical_id = job_info.get("canonical_job_id")
+                self.logger.info(
+                    f"--OK-- Inserted job: {job.title} (id={job_info.get('id')}, {job.source})"
+                    + (f", near-duplicate of job {canonical_id}" if canonical_id else "")
+                )
+                inserted.append(job_info)
+            self.known_fingerprints.add(job.fingerprint)
+            self.known_urls.add(job.url)
+        return inserted
+
+    def step(self) -> int:
+        self.logger.info("===>>> JobFetcher: checking job sources for new jobs...")
+
+        inserted = len(self.insert_jobs(self.collect_new_jobs()))
+
+        self.logger.info(f"--OK-- JobFetcher: fetch cycle complete ({inserted} new jobs).")
+        return inserted
 
     # -----------------------------------------
     # Helpers: description hydration
     # -----------------------------------------
-    def _hydrate_description(self, job: Dict[str, Any]) -> str:
-        base_desc = job.get("description", "") or ""
-        url = job.get("redirect_url")
-        if not url:
+    async def _hydrate_description_async(self, client: PoliteAsyncClient, job: SourceJob) -> str:
+        base_desc = job.description
+        url = job.url
+        if not url.startswith(("http://", "https://")):
             return base_desc
 
+        # Versioned key: text cached by an older extractor is fetched again.
+        # Cache calls are blocking SQLite I/O (up to a 30s lock wait), so
+        # they run in threads to keep the other hydrations going.
+        cache_key = f"v{EXTRACTOR_VERSION}:{url}"
+        cached = None
+        if self.page_cache is not None:
+            cached = await asyncio.to_thread(self.page_cache.get, cache_key)
+        if cached is not None and cached.fresh:
+            return self._pick_description(base_desc, cached.text)
+
+        headers = dict(self.HYDRATE_HEADERS)
+        if cached is not None:
+            headers.update(cached.validators())
+
         try:
-            resp = requests.get(
-                url,
-                timeout=20,
-                headers={"User-Agent": "Mozilla/5.0 (compatible; AlfredJobFetcher/1.0)"},
-            )
+            resp = await client.get(url, timeout=20, headers=headers)
+            if resp.status_code == 304 and cached is not None:
+                await asyncio.to_thread(self.page_cache.touch, cache_key)
+                return self._pick_description(base_desc, cached.text)
             resp.raise_for_status()
         except Exception as e:
             self.logger.debug(f"Failed to fetch full description ({url}): {e}")
-            return base_desc
+            # A stale copy still beats the search snippet
+            return self._pick_description(base_desc, cached.text if cached else "")
 
         enriched = self._extract_text(resp.text)
+        if self.page_cache is not None:
+            await asyncio.to_thread(
+                self.page_cache.put,
+                cache_key,
+                enriched,
+                etag=resp.headers.get("ETag"),
+                last_modified=resp.headers.get("Last-Modified"),
+            )
+        return self._pick_description(base_desc, enriched)
+
+    def _pick_description(self, base_desc: str, enriched: str) -> str:
         if len(enriched) > len(base_desc):
             return enriched[:20000]  # safety cap
         return base_desc
 
     def _extract_text(self, html: str) -> str:
-        if not html:
-            return ""
-
         # Focus on Adzuna job body when available
-        match = re.search(r'<section class="adp-body.*?">(.*?)</section>', html, re.S | re.I)
-        if match:
-            html = match.group(1)
-
-        html = re.sub(r"(?is)<(script|style).*?>.*?</\\1>", " ", html)
-        html = re.sub(r"(?s)<.*?>", " ", html)
-        text = unescape(html)
-        text = re.sub(r"\s+", " ", text)
-        return text.strip()
+        return extract_text(html, section_class="adp-body")
 
     def _load_preferences(self) -> Dict[str, Any]:
         if not self.PREFERENCES_PATH.exists():
@@ -1,10 +1,12 @@
 # backend/agents/job_matcher.py
+import json
 import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
 from typing import List, Dict, Any, Optional, Tuple
 
-from backend.queue.simple_queue import SimpleQueue
+from backend.agents.state_store import open_state_store
+from backend.queue.factory import get_queue
 from .base import BaseAgent, AgentConfig
 
 
@@ -14,19 +16,48 @@ class JobMatcherAgent(BaseAgent):
     ------------------
     Matches job descriptions to user artifacts using:
       - semantic similarity
-      - (LLM) skill overlap via /jobs/match
-      - combined hybrid score (computed in backend)
+      - (LLM) skill overlap via backend/utils/matching.py
+      - combined hybrid score (computed by matching.match_job)
 
     Produces:
-      processed_jobs[job_id] = { score, matches }
+      job_matches rows and jobs.match_score (written by matching.match_job)
 
     Strong matches are pushed into:
-      resume_queue.json
+      the "resume_queue" queue (see backend/queue/factory.py)
+
+    When artifacts are added (e.g. by GitHubIngestionAgent), jobs whose
+    top-k artifact set changes are re-matched (backend/utils/rescoring.py)
+    and queued if they became strong; state keeps an artifact watermark.
+    Local transport only; JOB_MATCHER_RESCORE=0 disables it.
+
+    With the local transport each step also folds new artifacts and newly
+    embedded jobs into job_artifact_neighbors (backend/utils/neighbors.py),
+    the precomputed top artifacts that matching and generation read.
+
+    Jobs the matching prefilter marks low-match (JOB_MATCH_PREFILTER) are
+    never queued; each decision is logged with its estimate, and the
+    counts once per step, to tune JOB_MATCH_PREFILTER_FLOOR.
+
+    State holds only a watermark (highest job id handled) plus the few
+    jobs whose match call failed and should be retried.
+
+    Matching runs in-process through backend/utils/matching.py by
+    default, sharing its artifact skill cache across jobs;
+    JOB_MATCHER_TRANSPORT=http calls POST /jobs/match on backend_url
+    instead (e.g. when the agent runs away from the database).
+
+    Replicas (see backend/agents/supervisor.py) each take one shard of
+    the job ids, shard=(index, count), and keep their own state. A new
+    shard starts from the watermark in `seed_state_path`, the unsharded
+    matcher's state, instead of re-matching every job.
     """
 
     MATCH_THRESHOLD = 0.6  # tightened to require stronger matches
     MIN_DESC_LEN = 80       # ignore ultra-short / broken job posts
     DEFAULT_MAX_WORKERS = 4
+    MATCH_TOP_K = 10
+    TRANSPORTS = ("local", "http")
+    MAX_MATCH_ATTEMPTS = 3  # then give up on a job (see scripts/match_unscored_jobs.py)
     SKIP_POSTINGS: Tuple[Tuple[str, str], ...] = (
         ("data engineer / senior data engineer (ai/ml)", "applied systems inc"),
         ("data engineer / senior data engineer (gcp, bigquery)", "applied systems inc"),
@@ -34,22 +65,49 @@ class JobMatcherAgent(BaseAgent):
         ("data engineer", "pixelplex"),
     )
 
-    def __init__(self, config: AgentConfig):
+    def __init__(
+        self,
+        config: AgentConfig,
+        shard: Tuple[int, int] = (0, 1),
+        seed_state_path: Optional[str] = None,
+    ):
         super().__init__("JobMatcher", config)
 
-        self.state.setdefault("processed_jobs", {})
-        self.state.setdefault("queued_jobs", {})
-        self.state.setdefault("skipped_jobs", {})
-        self.state.setdefault("processed_signatures", {})
+        self.shard_index, self.shard_count = shard
+        if not 0 <= self.shard_index < self.shard_count:
+            raise ValueError(f"Invalid matcher shard {shard}")
+
+        if "match_progress" not in self.state and seed_state_path:
+            self._seed_watermark(seed_state_path)
+        self._watermark_lock = Lock()
+        self._prefilter_lock = Lock()
+        self.prefilter_counts = {"passed": 0, "low_match": 0}
 
-        self._state_lock = Lock()
         self.max_workers = max(
             1,
             int(os.getenv("JOB_MATCHER_WORKERS", self.DEFAULT_MAX_WORKERS)),
         )
 
+        self.transport = os.getenv("JOB_MATCHER_TRANSPORT", "local").lower()
+        if self.transport not in self.TRANSPORTS:
+            raise ValueError(f"Unknown JOB_MATCHER_TRANSPORT: {self.transport}")
+        self._matching = None
+        self._neighbors = None
+        self._rescoring = None
+        if self.transport == "local":
+            # Imported lazily: needs DATABASE_URL and OPENAI_API_KEY
+            from backend.utils import matching, neighbors
+
+            self._matching = matching
+            self._neighbors = neighbors
+            if os.getenv("JOB_MATCHER_RESCORE", "1").lower() not in ("0", "false", "no"):
+                from backend.utils import rescoring
+
+                self._rescoring = rescoring
+        self._migrate_legacy_state()
+
         # Queue used to send work to ResumeAgent
-        self.resume_queue = SimpleQueue("resume_queue.json")
+        self.resume_queue = get_queue("resume_queue")
 
     # ----------------------------------------------------------
     # Helpers
@@ -65,20 +123,109 @@ class JobMatcherAgent(BaseAgent):
         return resp
 
     def match_job(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Hybrid match for a job (stored in job_matches); None on failure."""
         payload = {
             "job_id": job.get("id"),
             "title": job.get("title", ""),
             "company": job.get("company", "") or "",
             "description": job.get("description", "") or "",
-            "top_k": 10,
+            "top_k": self.MATCH_TOP_K,
         }
-        return self.api_post("/jobs/match", payload)
+        if self._matching is None:
+            return self.api_post("/jobs/match", payload)
+
+        try:
+            return self._matching.match_job(
+                payload["title"],
+                payload["company"],
+                payload["description"],
+                top_k=payload["top_k"],
+                job_id=payload["job_id"],
+            )
+        except Exception as e:
+            self.logger.error(f"--XX-- Match failed for job {payload['job_id']}: {type(e).__name__}: {e}")
+            return None
 
-    def is_processed(self, job_id: int) -> bool:
-        return str(job_id) in self.state["processed_jobs"]
+    def _migrate_legacy_state(self):
+        """
+        Replace the old per-job processed/queued/skipped maps by a watermark.
+        The old sections are first written to <state_path>.legacy.json; with
+        the local transport their matches are imported into job_matches,
+        otherwise the backup is left for scripts/backfill_match_scores.py.
+        """
+        from backend.utils.legacy_matches import LEGACY_STATE_KEYS, legacy_matches
+
+        legacy = {key: self.state[key] for key in LEGACY_STATE_KEYS if key in self.state}
+        if not legacy:
+            return
+        backup_path = f"{self.config.state_path}.legacy.json"
+        with open(backup_path, "w") as f:
+            json.dump(legacy, f)
+
+        imported = None
+        if self._matching is not None:
+            try:
+                imported = self._import_legacy_matches(legacy_matches(legacy) or {})
+            except Exception as e:
+                self.logger.error(f"--XX-- Importing legacy matches failed: {type(e).__name__}: {e}")
+
+        seen_ids = [
+            int(job_id)
+            for section in legacy.values()
+            for job_id in section
+            if str(job_id).isdigit()
+        ]
+        if seen_ids and max(seen_ids) > self.watermark():
+            self._state_put("match_progress", "watermark", max(seen_ids))
+        for key in legacy:
+            self._state_drop(key)
+        self.flush_state()
+
+        if imported is None:
+            self.logger.info(
+                f"--OK-- Migrated matcher state to watermark {self.watermark()} "
+                f"(import old scores with scripts/backfill_match_scores.py --import-state {backup_path})"
+            )
+        else:
+            self.logger.info(
+                f"--OK-- Migrated matcher state to watermark {self.watermark()}; "
+                f"imported {imported} job_matches rows (old state kept in {backup_path})"
+            )
 
-    def has_been_queued(self, job_id: int) -> bool:
-        return str(job_id) in self.state["queued_jobs"]
+    def _import_legacy_matches(self, legacy: Dict[int, List[Dict[str, Any]]]) -> int:
+        from backend.db.repo import SessionLocal
+        from backend.utils.legacy_matches import import_legacy_matches
+
+        session = SessionLocal()
+        try:
+            imported = import_legacy_matches(session, legacy)
+            session.commit()
+            return imported
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _seed_watermark(self, seed_state_path: str):
+        seed = open_state_store(seed_state_path, self.config.state_backend).load()
+        watermark = int(seed.get("match_progress", {}).get("watermark", 0))
+        if watermark:
+            self._state_put("match_progress", "watermark", watermark)
+            self.logger.info(f"--OK-- Shard starts at watermark {watermark} from {seed_state_path}")
+
+    def owns_job(self, job_id: int) -> bool:
+        """True if this replica's shard covers job_id."""
+        return job_id % self.shard_count == self.shard_index
+
+    def watermark(self) -> int:
+        return int(self.state.get("match_progress", {}).get("watermark", 0))
+
+    def advance_watermark(self, job_id: int):
+        """Move the watermark up to job_id (never down). Thread-safe."""
+        with self._watermark_lock:
+            if job_id > self.watermark():
+                self._state_put("match_progress", "watermark", job_id)
 
     def should_skip_posting(self, title: str, company: str) -> bool:
         key = (title.strip().lower(), (company or "").strip().lower())
@@ -101,140 +248,287 @@ class JobMatcherAgent(BaseAgent):
 
         return sum(scores) / len(scores)
 
-    def _mark_processed_short_desc(self, job_id: int):
-        with self._state_lock:
-            self.state["processed_jobs"][str(job_id)] = {
-                "score": 0.0,
-                "matches": [],
-            }
-            self._save_state()
-
-    def _record_processed(self, job_id: int, score: float, matches: List[Dict[str, Any]]):
-        with self._state_lock:
-            self.state["processed_jobs"][str(job_id)] = {
-                "score": score,
-                "matches": matches,
-            }
-            self._save_state()
-
-    def _record_queue_entry(self, job_id: int, score: float, title: str, company: str):
-        with self._state_lock:
-            self.state["queued_jobs"][str(job_id)] = {
-                "score": score,
-                "title": title,
-                "company": company,
-            }
-            self._save_state()
-
-    def _record_skip(self, job_id: int, score: float, title: str, company: str):
-        with self._state_lock:
-            self.state["skipped_jobs"][str(job_id)] = {
-                "score": score,
-                "title": title,
-                "company": company,
-            }
-            self._save_state()
-
-    def _process_single_job(self, job: Dict[str, Any]) -> None:
+    def _process_single_job(self, job: Dict[str, Any]) -> Tuple[bool, bool]:
+        """
+        Match one job and queue it if strong.
+        Returns (ok, queued); ok is False if the job should be retried.
+        """
         job_id = job.get("id")
         title = job.get("title", "Unknown")
         company = job.get("company", "") or ""
 
-        self.logger.info(f"===>>> Matching job {job_id}: {title}")
+        score, low_match = self.score_job(job)
+        if score is None:
+            return False, False
+        if low_match:
+            return True, False
+
+        if self.should_skip_posting(title, company):
+            self.logger.info(
+                f"--XX-- Skipping job {job_id} ({title} @ {company}) per skip list"
+            )
+            return True, False
+
+        if score >= self.MATCH_THRESHOLD:
+            self.logger.info(
+                f"--OK-- Strong match detected (score={score:.4f}) for job {job_id}"
+            )
+
+            # Best matches are generated first when the queue is in priority mode
+            self.resume_queue.push(
+                {
+                    "job_id": job_id,
+                    "title": title,
+                    "score": score,
+                },
+                priority=score,
+            )
+            return True, True
+        return True, False
+
+    def score_job(self, job: Dict[str, Any]) -> Tuple[Optional[float], bool]:
+        """
+        Match a job. Returns (hybrid score, low_match); the score is None
+        on failure, and the prefilter's estimate if it marked the job
+        low-match.
+        """
+        job_id = job.get("id")
+        self.logger.info(f"===>>> Matching job {job_id}: {job.get('title', 'Unknown')}")
 
+        # match_job stores the per-artifact scores in job_matches
         results = self.match_job(job)
         if results is None:
-            self.logger.error(f"--XX-- /jobs/match failed for job {job_id}")
-            return
+            self.logger.error(f"--XX-- Matching failed for job {job_id} ({self.transport})")
+            return None, False
+
+        check = results.get("prefilter")
+        if check is not None:
+            self.record_prefilter(check["low_match"])
+            signals = (
+                f"max_similarity={check['max_similarity']:.4f}, "
+                f"keyword_overlap={check['keyword_overlap']:.2f}, "
+                f"estimate={check['estimate']:.4f}, floor={check['floor']:.2f}"
+            )
+            if check["low_match"] and not results.get("matches"):
+                self.logger.info(f"--XX-- Prefilter: job {job_id} low-match, no LLM match ({signals})")
+                return check["estimate"], True
+            # Passed, or low-match in shadow mode: compare with the full match
+            decision = "low-match (shadow)" if check["low_match"] else "passed"
+            self.logger.info(
+                f"===>>> Prefilter: job {job_id} {decision} ({signals}), "
+                f"hybrid best_score={results.get('best_score') or 0.0:.4f}"
+            )
 
         score = self.evaluate_match_strength(results)
         self.logger.info(f"===>>> Hybrid score for job {job_id}: {score:.4f}")
-
-        self._record_processed(job_id, score, results.get("matches", []))
-
-        if self.should_skip_posting(title, company):
+        return score, False
+
+    def record_prefilter(self, low_match: bool):
+        with self._prefilter_lock:
+            self.prefilter_counts["low_match" if low_match else "passed"] += 1
+
+    def log_prefilter_counts(self):
+        """Log and reset the prefilter decisions counted since the last call."""
+        with self._prefilter_lock:
+            counts = dict(self.prefilter_counts)
+            self.prefilter_counts = {"passed": 0, "low_match": 0}
+        if counts["passed"] or counts["low_match"]:
             self.logger.info(
-                f"--XX-- Skipping job {job_id} ({title} @ {company}) per skip list"
+                f"--OK-- Prefilter: {counts['passed']} passed, {counts['low_match']} low-match"
             )
-            self._record_skip(job_id, score, title, company)
-            return
 
-        if score >= self.MATCH_THRESHOLD and not self.has_been_queued(job_id):
+    def record_match_failure(self, job_id: int):
+        attempts = self.state.get("retry_jobs", {}).get(str(job_id), {}).get("attempts", 0) + 1
+        if attempts >= self.MAX_MATCH_ATTEMPTS:
+            self.logger.error(f"--XX-- Giving up on job {job_id} after {attempts} failed matches")
+            self._state_delete("retry_jobs", job_id)
+        else:
+            self._state_put("retry_jobs", job_id, {"attempts": attempts})
+
+    # ----------------------------------------------------------
+    # Precomputed artifact neighbors
+    # ----------------------------------------------------------
+    def refresh_neighbors(self):
+        """Update job_artifact_neighbors for this shard's jobs (new artifacts, new embeddings)."""
+        from backend.db.repo import SessionLocal
+
+        db = SessionLocal()
+        try:
+            counts = self._neighbors.update_neighbors(db, shard=(self.shard_index, self.shard_count))
+        except Exception as e:
+            db.rollback()
+            self.logger.error(f"--XX-- Neighbor update failed: {type(e).__name__}: {e}")
+            return
+        finally:
+            db.close()
+        if counts["built"] or counts["merged"]:
             self.logger.info(
-                f"--OK-- Strong match detected (score={score:.4f}) for job {job_id}"
+                f"--OK-- Artifact neighbors: {counts['built']} jobs computed, {counts['merged']} updated"
             )
 
-            self.resume_queue.push({
-                "job_id": job_id,
-                "title": title,
-                "score": score,
-            })
-            self._record_queue_entry(job_id, score, title, company)
+    # ----------------------------------------------------------
+    # Re-scoring after artifact changes
+    # ----------------------------------------------------------
+    def _rescore_single_job(self, job: Dict[str, Any]) -> Tuple[bool, bool]:
+        """
+        Re-match one job; queue it only if it became strong (one that
+        already was has been queued before). Returns (ok, queued).
+        """
+        score, low_match = self.score_job(job)
+        if score is None:
+            return False, False
+        if low_match or job["strength"] >= self.MATCH_THRESHOLD or score < self.MATCH_THRESHOLD:
+            return True, False
+        if self.should_skip_posting(job["title"], job["company"]):
+            return True, False
+
+        self.logger.info(f"--OK-- Job {job['id']} became a strong match (score={score:.4f})")
+        self.resume_queue.push(
+            {"job_id": job["id"], "title": job["title"], "score": score},
+            priority=score,
+        )
+        return True, True
+
+    def rescore_new_artifacts(self, artifact_ids: Optional[List[int]] = None) -> int:
+        """
+        Re-match the jobs whose top-k artifact set changed with
+        `artifact_ids`, by default the artifacts added since the artifact
+        watermark. Returns how many were pushed to resume_queue.
+        """
+        from backend.db.repo import SessionLocal
+
+        db = SessionLocal()
+        try:
+            newest = self._neighbors.latest_artifact_id(db)
+            if artifact_ids is None:
+                seen = self.state.get("artifact_progress", {}).get("watermark")
+                if seen is None:
+                    # First run: the existing corpus is what jobs were matched against
+                    self._state_put("artifact_progress", "watermark", newest)
+                    return 0
+                if newest <= seen:
+                    return 0
+                artifact_ids = self._rescoring.artifacts_after(db, seen)
+            jobs = [
+                job
+                for job in self._rescoring.affected_jobs(db, artifact_ids, top_k=self.MATCH_TOP_K)
+                if self.owns_job(job["id"])
+            ]
+        finally:
+            db.close()
+
+        self.logger.info(
+            f"===>>> {len(artifact_ids)} new/changed artifacts change the top {self.MATCH_TOP_K} "
+            f"of {len(jobs)} jobs; re-matching them"
+        )
+        queued = 0
+        # Canonical jobs first: near-duplicates copy their fresh matches
+        waves = (
+            [job for job in jobs if job["canonical_job_id"] is None],
+            [job for job in jobs if job["canonical_job_id"] is not None],
+        )
+        for wave in waves:
+            if not wave:
+                continue
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self._rescore_single_job, job): job["id"] for job in wave}
+                for future in as_completed(futures):
+                    try:
+                        ok, was_queued = future.result()
+                    except Exception as exc:
+                        self.logger.error(f"--XX-- Re-match of job {futures[future]} crashed: {exc}")
+                        ok, was_queued = False, False
+                    queued += int(was_queued)
+                    if ok:
+                        self.record_items()
+                    else:
+                        self.record_failures()
+
+        with self._watermark_lock:
+            if newest > self.state.get("artifact_progress", {}).get("watermark", 0):
+                self._state_put("artifact_progress", "watermark", newest)
+        self.logger.info(f"--OK-- Re-scoring complete ({queued} newly strong, queued for resumes).")
+        return queued
 
     # ----------------------------------------------------------
     # Main Step
     # ----------------------------------------------------------
-    def step(self):
+    def step(self) -> int:
+        """Match new jobs; returns how many were pushed to resume_queue."""
 
         self.logger.info("===>>> JobMatcher: polling backend for new jobs...")
 
+        if self._neighbors is not None:
+            self.refresh_neighbors()
+        rescored = self.rescore_new_artifacts() if self._rescoring is not None else 0
+
         jobs = self.fetch_jobs()
         if jobs is None:
             self.logger.error("--XX-- Backend returned no jobs")
-            return
-
-        # Clean stale processed jobs
-        existing_ids = {j.get("id") for j in jobs if j.get("id") is not None}
-        existing_id_strs = {str(i) for i in existing_ids}
-        stored_ids = set(self.state["processed_jobs"].keys())
+            return rescored
 
-        for stale in stored_ids - existing_id_strs:
-            del self.state["processed_jobs"][stale]
-        queued_ids = set(self.state["queued_jobs"].keys())
-        for stale in queued_ids - existing_id_strs:
-            del self.state["queued_jobs"][stale]
+        watermark = self.watermark()
+        retry_ids = set(self.state.get("retry_jobs", {}).keys())
 
         candidates: List[Dict[str, Any]] = []
+        newest_id = watermark
 
         for job in jobs:
             job_id = job.get("id")
-            if job_id is None:
+            if job_id is None or not self.owns_job(job_id):
                 continue
 
-            desc = job.get("description", "") or ""
-
-            # Already processed?
-            if self.is_processed(job_id):
+            # Already handled?
+            if job_id <= watermark and str(job_id) not in retry_ids:
                 continue
+            newest_id = max(newest_id, job_id)
+
+            desc = job.get("description", "") or ""
 
             # Skip garbage posts
             if len(desc) < self.MIN_DESC_LEN:
                 self.logger.info(f"--XX-- Skipping job {job_id} (description too short)")
-                self._mark_processed_short_desc(job_id)
+                self._state_delete("retry_jobs", job_id)
                 continue
 
             candidates.append(job)
 
         if not candidates:
+            self.advance_watermark(newest_id)
             self.logger.info("--OK-- No new jobs to process.")
-            return
+            return rescored
 
         self.logger.info(
             f"-->> Dispatching {len(candidates)} jobs across {self.max_workers} workers."
         )
 
+        queued = 0
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = [
-                executor.submit(self._process_single_job, job)
+            futures = {
+                executor.submit(self._process_single_job, job): job.get("id")
                 for job in candidates
-            ]
+            }
             for future in as_completed(futures):
+                job_id = futures[future]
                 try:
-                    future.result()
+                    ok, was_queued = future.result()
                 except Exception as exc:
                     self.logger.error(f"--XX-- Worker crashed: {exc}")
-
-        self.logger.info("--OK-- JobMatcher step complete.")
+                    ok, was_queued = False, False
+                queued += int(was_queued)
+                if ok:
+                    self.record_items()
+                    self._state_delete("retry_jobs", job_id)
+                else:
+                    self.record_failures()
+                    self.record_match_failure(job_id)
+
+        # Failed jobs are tracked in retry_jobs, so the watermark can move past them
+        self.advance_watermark(newest_id)
+        self.log_prefilter_counts()
+
+        self.logger.info(f"--OK-- JobMatcher step complete ({queued} queued for resumes).")
+        return queued + rescored
 
 
 # ----------------------------------------------------------
@@ -1,8 +1,12 @@
 # backend/agents/orchestrator.py
-import time
-import threading
-import traceback
+import asyncio
+import logging
 import os
+import signal
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
 from dotenv import load_dotenv
 
 from backend.agents.base import AgentConfig
@@ -11,19 +15,32 @@ from backend.agents.job_matcher import JobMatcherAgent
 from backend.agents.resume_agent import ResumeAgent
 from backend.agents.cover_letter_agent import CoverLetterAgent
 from backend.agents.github_ingestion_agent import GitHubIngestionAgent
-from backend.queue.simple_queue import SimpleQueue
-
-# Global queues shared across agents
-resume_queue = SimpleQueue("resume_queue.json")
-cover_queue = SimpleQueue("cover_letter_queue.json")
 
 
 class Orchestrator:
     """
-    Runs all agents on independent schedules using multi-threading.
-    Applies dependency logic so agents run only when prerequisites are met.
+    Event-driven asyncio scheduler for all agents.
+
+      - each agent has one scheduling coroutine, so at most one step() of
+        an agent is in flight at a time (no overlapping runs on the same
+        instance and state)
+      - an agent runs when its interval elapses or when an upstream agent
+        reports new work (fetcher -> matcher -> resume -> cover letter);
+        triggers arriving mid-run coalesce into a single follow-up run
+      - queue-driven agents (resume, cover letter) also wake as soon as
+        their queue has work, including items pushed by other processes:
+        their wait_for_work() blocks in a separate thread pool
+      - blocking step() calls run in a bounded thread pool
+        (ALFRED_ORCHESTRATOR_WORKERS)
+      - SIGINT/SIGTERM or stop() let in-flight steps finish, then flush
+        every agent's state before exiting
     """
 
+    DEFAULT_MAX_WORKERS = 3
+    # Longest single wait_for_work() call, so triggers and shutdown are
+    # not held up by a blocked queue wait
+    QUEUE_WAIT_SECONDS = 2.0
+
     def __init__(self):
         load_dotenv()
 
@@ -52,7 +69,6 @@ class Orchestrator:
                     github_token=github_token,
                 ),
                 "interval": 60 * 60 * 24,  # 24 hours
-                "last_run": 0,
             },
 
             "job_fetcher": {
@@ -64,7 +80,7 @@ class Orchestrator:
                     )
                 ),
                 "interval": 60 * 60,  # 1 hour
-                "last_run": 0,
+                "triggers": ["job_matcher"],  # when new jobs were inserted
             },
 
             "job_matcher": {
@@ -76,7 +92,7 @@ class Orchestrator:
                     )
                 ),
                 "interval": 60 * 5,  # 5 minutes
-                "last_run": 0,
+                "triggers": ["resume_agent"],  # when strong matches were queued
             },
 
             "resume_agent": {
@@ -84,11 +100,12 @@ class Orchestrator:
                     AgentConfig(
                         backend_url=backend_url,
                         state_path="state_resume_agent.json",
-                        sleep_interval=5,
+                        sleep_interval=60,
                     )
                 ),
-                "interval": 60 * 5,
-                "last_run": 0,
+                "interval": 60,
+                "queue_driven": True,  # wakes when resume_queue has items
+                "triggers": ["cover_letter_agent"],  # when resumes were generated
             },
 
             "cover_letter_agent": {
@@ -96,53 +113,148 @@ class Orchestrator:
                     AgentConfig(
                         backend_url=backend_url,
                         state_path="state_cover_letter_agent.json",
-                        sleep_interval=5,
+                        sleep_interval=60,
                     )
                 ),
-                "interval": 60 * 5,
-                "last_run": 0,
+                "interval": 60,
+                "queue_driven": True,  # wakes when cover_letter_queue has items
             },
         }
 
+        self.max_workers = max(
+            1,
+            int(os.getenv("ALFRED_ORCHESTRATOR_WORKERS", self.DEFAULT_MAX_WORKERS)),
+        )
+
+        self.logger = logging.getLogger("Orchestrator")
+        if not self.logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(
+                "%(asctime)s [%(name)s] %(levelname)s: %(message)s"
+            ))
+            self.logger.addHandler(handler)
+        self.logger.setLevel(logging.INFO)
+
+        self._loop = None
+        self._executor = None
+        self._waiters = None
+        self._stopping = None
+        self._wake: Dict[str, asyncio.Event] = {}
+
     # ------------------------------------------------------------------
-    def run_agent_once(self, name: str, agent_obj):
+    def run_agent_once(self, name: str, agent_obj) -> Any:
+        """Run one step (blocking, in an executor thread) and flush its state."""
+        result = None
         try:
-            # print(f"===>>> Running {name}.step()")
-            agent_obj.step()
-                # print(f"--OK-- {name} completed")
-        except Exception as e:
-                # print(f"--XX-- Agent {name} crashed: {e}")
+            result = agent_obj.run_step()
+        except Exception:
+            self.logger.error(f"--XX-- Agent {name} crashed")
             traceback.print_exc()
+        agent_obj.flush_state()
+        return result
+
+    def trigger(self, name: str):
+        """Ask an agent to run as soon as it is idle (thread-safe)."""
+        if self._loop is not None and name in self._wake:
+            self._loop.call_soon_threadsafe(self._wake[name].set)
+
+    def stop(self):
+        """Request a clean shutdown (thread-safe)."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._request_stop)
 
     # ------------------------------------------------------------------
-    def start(self):
-        # print("===>>> Alfred Orchestrator started")
+    def _request_stop(self):
+        if self._stopping.is_set():
+            return
+        self.logger.info("Shutdown requested; waiting for running agents to finish...")
+        self._stopping.set()
+        for event in self._wake.values():
+            event.set()
 
-        while True:
-            now = time.time()
+    async def _wait_for_queue(self, name: str, cfg: Dict[str, Any], waker: asyncio.Future):
+        """
+        Block on the agent's queue (wait_for_work) in short slices until it
+        has items, the interval elapses or `waker` (trigger/shutdown) fires.
+        """
+        agent = cfg["instance"]
+        deadline = self._loop.time() + cfg["interval"]
+        while not waker.done():
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                return
+            poll = self._loop.run_in_executor(
+                self._waiters, agent.wait_for_work, min(remaining, self.QUEUE_WAIT_SECONDS)
+            )
+            await asyncio.wait({waker, poll}, return_when=asyncio.FIRST_COMPLETED)
+            if not poll.done():
+                return  # woken by a trigger; the slice ends on its own
+            if poll.exception() is not None:
+                self.logger.error(f"--XX-- Queue wait for {name} failed: {poll.exception()}")
+                await asyncio.wait({waker}, timeout=max(0.0, deadline - self._loop.time()))
+                return
+            if poll.result():
+                return
 
-            for name, cfg in self.agents.items():
-                interval = cfg["interval"]
-                last_run = cfg["last_run"]
+    async def _agent_loop(self, name: str, cfg: Dict[str, Any]):
+        wake = self._wake[name]
+        while not self._stopping.is_set():
+            result = await self._loop.run_in_executor(
+                self._executor, self.run_agent_once, name, cfg["instance"]
+            )
+            if result:
+                for downstream in cfg.get("triggers", ()):
+                    self._wake[downstream].set()
 
-                # Conditional logic for downstream agents
-                if name == "resume_agent" and resume_queue.size() == 0:
-                    continue
+            # Sleep until the next interval, an upstream trigger, queued
+            # work (queue-driven agents) or shutdown. A trigger received
+            # while running is still set, so the agent runs again right
+            # away (once, however many triggers arrived).
+            waker = asyncio.ensure_future(wake.wait())
+            try:
+                if cfg.get("queue_driven"):
+                    await self._wait_for_queue(name, cfg, waker)
+                else:
+                    await asyncio.wait({waker}, timeout=cfg["interval"])
+            finally:
+                waker.cancel()
+            wake.clear()
 
-                if name == "cover_letter_agent" and cover_queue.size() == 0:
-                    continue
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._wake = {name: asyncio.Event() for name in self.agents}
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="agent"
+        )
+        # Queue waits get their own threads so they never hold a step worker
+        self._waiters = ThreadPoolExecutor(
+            max_workers=max(1, sum(1 for cfg in self.agents.values() if cfg.get("queue_driven"))),
+            thread_name_prefix="queue-wait",
+        )
 
-                # Time to run?
-                if now - last_run >= interval:
-                    thread = threading.Thread(
-                        target=self.run_agent_once,
-                        args=(name, cfg["instance"]),
-                        daemon=True,
-                    )
-                    thread.start()
-                    cfg["last_run"] = now
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(sig, self._request_stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # e.g. Windows, or not on the main thread
+
+        self.logger.info(
+            f"Orchestrator started: {len(self.agents)} agents, {self.max_workers} workers"
+        )
+        try:
+            await asyncio.gather(
+                *(self._agent_loop(name, cfg) for name, cfg in self.agents.items())
+            )
+        finally:
+            self._executor.shutdown(wait=True)
+            self._waiters.shutdown(wait=True)
+            for cfg in self.agents.values():
+                cfg["instance"].flush_state()
+            self.logger.info("Orchestrator stopped; agent state flushed.")
 
-            time.sleep(5)
+    def start(self):
+        asyncio.run(self.run())
 
 
 if __name__ == "__main__":
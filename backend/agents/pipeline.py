@@ -0,0 +1,421 @@
+# backend/agents/pipeline.py
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from backend.agents.base import AgentConfig
+from backend.agents.job_fetcher import JobFetcherAgent
+from backend.agents.job_matcher import JobMatcherAgent
+from backend.agents.resume_agent import ResumeAgent
+from backend.agents.cover_letter_agent import CoverLetterAgent
+from backend.db.models import Job
+from backend.db.repo import SessionLocal
+from backend.utils.embedding import embed_job
+
+load_dotenv()
+
+# Jobs buffered between two stages; a full channel blocks the stage feeding it
+DEFAULT_CHANNEL_SIZE = int(os.getenv("ALFRED_PIPELINE_CHANNEL_SIZE", "8"))
+
+# Concurrent jobs per stage (each runs the agents' blocking code in a thread)
+STAGE_WORKERS = {
+    "embed": 2,
+    "match": 4,
+    "resume": 2,
+    "cover_letter": 2,
+}
+
+# Outcome of a job that went through every stage
+COMPLETED = "completed"
+
+
+@dataclass
+class JobTicket:
+    """A job moving through the pipeline, with its timings."""
+
+    job_id: int
+    title: str
+    company: str
+    description: str
+    fetched_at: float  # time.monotonic() when the fetch stage emitted it
+    score: float = 0.0
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+
+    def as_job(self) -> Dict[str, Any]:
+        """Shape of a /jobs/ record, as the agents expect."""
+        return {
+            "id": self.job_id,
+            "title": self.title,
+            "company": self.company,
+            "description": self.description,
+        }
+
+
+class PipelineMetrics:
+    """
+    End-to-end latency per job: from the fetch stage emitting it to the
+    job leaving the pipeline (completed, filtered out or failed).
+    Logged per job, summarized per cycle, optionally appended as JSON lines.
+    """
+
+    def __init__(self, logger: logging.Logger, path: Optional[str] = None):
+        self.logger = logger
+        self.path = path
+        self.latencies: Dict[str, List[float]] = {}
+
+    def record(self, ticket: JobTicket, outcome: str):
+        latency = time.monotonic() - ticket.fetched_at
+        self.latencies.setdefault(outcome, []).append(latency)
+        stages = ", ".join(f"{k}={v:.1f}s" for k, v in ticket.stage_seconds.items())
+        self.logger.info(
+            f"--OK-- job {ticket.job_id} {outcome} in {latency:.1f}s end-to-end ({stages})"
+        )
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps({
+                    "job_id": ticket.job_id,
+                    "outcome": outcome,
+                    "latency_seconds": round(latency, 3),
+                    "stage_seconds": {k: round(v, 3) for k, v in ticket.stage_seconds.items()},
+                    "recorded_at": time.time(),
+                }) + "\n")
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for outcome, values in self.latencies.items():
+            ordered = sorted(values)
+            out[outcome] = {
+                "count": len(ordered),
+                "p50": statistics.median(ordered),
+                "p95": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+                "max": ordered[-1],
+            }
+        return out
+
+    def reset(self):
+        self.latencies = {}
+
+
+class Pipeline:
+    """
+    Streaming mode for the agents: fetch -> embed -> match -> resume ->
+    cover letter, connected by bounded asyncio queues.
+
+    Each new job flows to the next stage as soon as the previous one is
+    done with it, instead of waiting for the next agent's timer. Channels
+    are bounded, so the slowest stage sets the pace: when its inbox is
+    full, upstream stages block on put() instead of piling up work.
+
+    Stages reuse the agents' own logic and state (same state files as the
+    orchestrator). A job that fails to generate falls back to the durable
+    resume/cover letter queue, where the regular retry handling applies.
+
+    Jobs finish matching out of order (several match workers), so the
+    matcher's watermark only moves up to the newest job with every earlier
+    job of the cycle done; a crash mid-cycle leaves the unfinished ones
+    above it for JobMatcherAgent to pick up.
+    """
+
+    def __init__(
+        self,
+        fetcher: JobFetcherAgent,
+        matcher: JobMatcherAgent,
+        resume_agent: ResumeAgent,
+        cover_letter_agent: CoverLetterAgent,
+        channel_size: int = DEFAULT_CHANNEL_SIZE,
+        metrics_path: Optional[str] = None,
+    ):
+        self.fetcher = fetcher
+        self.matcher = matcher
+        self.resume_agent = resume_agent
+        self.cover_letter_agent = cover_letter_agent
+        self.channel_size = channel_size
+
+        self.logger = logging.getLogger("Pipeline")
+        if not self.logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(
+                "%(asctime)s [%(name)s] %(levelname)s: %(message)s"
+            ))
+            self.logger.addHandler(handler)
+        self.logger.setLevel(logging.INFO)
+
+        self.metrics = PipelineMetrics(self.logger, metrics_path)
+
+        # Jobs emitted this cycle whose match stage hasn't finished / has
+        # (guarded by _match_lock)
+        self._match_lock = threading.Lock()
+        self._unmatched: set = set()
+        self._matched: set = set()
+
+    # ------------------------------------------------------------------
+    # Stage handlers (blocking; run in worker threads).
+    # Return None to pass the job on, or an outcome to drop it here.
+    # ------------------------------------------------------------------
+    def embed(self, ticket: JobTicket) -> Optional[str]:
+        """Store the job's embedding so matching reuses it."""
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.id == ticket.job_id).first()
+            if job is not None:
+                embed_job(db, job)
+        except Exception as e:
+            # Not fatal: matching embeds the job itself
+            self.logger.error(f"--XX-- Embedding failed for job {ticket.job_id}: {e}")
+        finally:
+            db.close()
+        return None
+
+    def match(self, ticket: JobTicket) -> Optional[str]:
+        try:
+            return self._match(ticket)
+        except Exception:
+            self.matcher.record_match_failure(ticket.job_id)
+            raise
+        finally:
+            self._match_done(ticket.job_id)
+
+    def _match(self, ticket: JobTicket) -> Optional[str]:
+        m = self.matcher
+        job = ticket.as_job()
+
+        if len(ticket.description) < m.MIN_DESC_LEN:
+            return "short_description"
+
+        score, low_match = m.score_job(job)
+        if score is None:
+            # Tracked in retry_jobs, so the watermark can move past it
+            m.record_match_failure(ticket.job_id)
+            return "match_failed"
+
+        if low_match:
+            return "low_match"
+        if m.should_skip_posting(ticket.title, ticket.company):
+            return "skip_list"
+        if score < m.MATCH_THRESHOLD:
+            return "below_threshold"
+
+        ticket.score = score
+        return None
+
+    def resume(self, ticket: JobTicket) -> Optional[str]:
+        item = {"job_id": ticket.job_id, "title": ticket.title, "score": ticket.score}
+        try:
+            self.resume_agent.process_item(item, forward=False)
+        except Exception as e:
+            self.logger.error(f"--XX-- Resume failed for job {ticket.job_id}, queued for retry: {e}")
+            self.resume_agent.resume_queue.push(item, priority=ticket.score)
+            return "resume_queued"
+        return None
+
+    def cover_letter(self, ticket: JobTicket) -> Optional[str]:
+        item = {
+            "job_id": ticket.job_id,
+            "title": ticket.title,
+            "company": ticket.company,
+            "score": ticket.score,
+        }
+        try:
+            self.cover_letter_agent.process_match(item)
+        except Exception as e:
+            self.logger.error(f"--XX-- Cover letter failed for job {ticket.job_id}, queued for retry: {e}")
+            self.cover_letter_agent.cover_letter_queue.push(item, priority=ticket.score)
+            return "cover_letter_queued"
+        return COMPLETED
+
+    # ------------------------------------------------------------------
+    # Matcher watermark
+    # ------------------------------------------------------------------
+    def _match_pending(self, job_id: int):
+        with self._match_lock:
+            self._unmatched.add(job_id)
+
+    def _match_done(self, job_id: int):
+        """Advance the watermark to the newest matched job with no unmatched job before it."""
+        with self._match_lock:
+            self._unmatched.discard(job_id)
+            self._matched.add(job_id)
+            oldest_unmatched = min(self._unmatched, default=None)
+            target = max(
+                (j for j in self._matched if oldest_unmatched is None or j < oldest_unmatched),
+                default=None,
+            )
+        if target is not None:
+            self.matcher.advance_watermark(target)
+
+    def _release_unmatched(self):
+        """End of cycle: jobs that never reached the match stage go to retry_jobs."""
+        with self._match_lock:
+            leftover = sorted(self._unmatched)
+        for job_id in leftover:
+            self.logger.error(f"--XX-- Job {job_id} left the pipeline unmatched; queued for matcher retry")
+            self.matcher.record_match_failure(job_id)
+            self._match_done(job_id)
+
+    # ------------------------------------------------------------------
+    # Async plumbing
+    # ------------------------------------------------------------------
+    async def _stage_worker(
+        self,
+        name: str,
+        handler: Callable[[JobTicket], Optional[str]],
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+    ):
+        while True:
+            ticket = await inbox.get()
+            try:
+                started = time.monotonic()
+                try:
+                    outcome = await asyncio.to_thread(handler, ticket)
+                except Exception as e:
+                    self.logger.error(f"--XX-- Stage {name} crashed on job {ticket.job_id}: {e}")
+                    outcome = f"{name}_crashed"
+                ticket.stage_seconds[name] = time.monotonic() - started
+
+                if outcome is None and outbox is not None:
+                    # Blocks while the next stage is saturated (backpressure)
+                    await outbox.put(ticket)
+                else:
+                    self.metrics.record(ticket, outcome or COMPLETED)
+            finally:
+                inbox.task_done()
+
+    async def _produce(self, inbox: asyncio.Queue) -> int:
+        """Fetch stage: insert the cycle's new jobs in one bulk call and emit the stored ones."""
+        # Pages and descriptions are fetched concurrently on one pooled client
+        async with self.fetcher.http_client() as client:
+            fresh = await self.fetcher.collect_new_jobs_async(client)
+
+        emitted = 0
+        for stored in await asyncio.to_thread(self.fetcher.insert_jobs, fresh):
+            if stored.get("id") is None:
+                continue
+            ticket = JobTicket(
+                job_id=stored["id"],
+                title=stored.get("title") or "",
+                company=stored.get("company") or "",
+                description=stored.get("description") or "",
+                fetched_at=time.monotonic(),
+            )
+            self._match_pending(ticket.job_id)
+            await inbox.put(ticket)
+            emitted += 1
+        return emitted
+
+    async def run_once(self) -> Dict[str, Dict[str, float]]:
+        """Run one fetch cycle through every stage; returns the latency summary."""
+        stages = [
+            ("embed", self.embed),
+            ("match", self.match),
+            ("resume", self.resume),
+            ("cover_letter", self.cover_letter),
+        ]
+        channels = [asyncio.Queue(maxsize=self.channel_size) for _ in stages]
+        workers: List[List[asyncio.Task]] = []
+        for i, (name, handler) in enumerate(stages):
+            outbox = channels[i + 1] if i + 1 < len(stages) else None
+            workers.append([
+                asyncio.create_task(self._stage_worker(name, handler, channels[i], outbox))
+                for _ in range(STAGE_WORKERS[name])
+            ])
+
+        self.metrics.reset()
+        with self._match_lock:
+            self._unmatched = set()
+            self._matched = set()
+        try:
+            emitted = await self._produce(channels[0])
+            # Drain stage by stage: once a stage's inbox is empty and its
+            # workers are idle, nothing more can reach the next one.
+            for channel in channels:
+                await channel.join()
+        finally:
+            for tasks in workers:
+                for task in tasks:
+                    task.cancel()
+            await asyncio.gather(*(t for tasks in workers for t in tasks), return_exceptions=True)
+            self._release_unmatched()
+            for agent in (self.fetcher, self.matcher, self.resume_agent, self.cover_letter_agent):
+                agent.flush_state()
+
+        summary = self.metrics.summary()
+        outcomes = {k: int(v["count"]) for k, v in summary.items()}
+        self.logger.info(f"--OK-- Pipeline cycle: {emitted} new jobs, outcomes={outcomes}")
+        self.matcher.log_prefilter_counts()
+        for outcome, stats in summary.items():
+            self.logger.info(
+                f"     {outcome}: p50={stats['p50']:.1f}s p95={stats['p95']:.1f}s max={stats['max']:.1f}s"
+            )
+        return summary
+
+    async def run(self, interval: float, once: bool = False):
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        while not stopping.is_set():
+            cycle = asyncio.create_task(self.run_once())
+            stop_wait = asyncio.create_task(stopping.wait())
+            # A stop request lets the current cycle finish (state is flushed)
+            await asyncio.wait({cycle, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+            await cycle
+            stop_wait.cancel()
+            if once:
+                break
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+def build_pipeline(metrics_path: Optional[str] = None) -> Pipeline:
+    """Pipeline over the same agents/state files the orchestrator uses."""
+    backend_url = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
+
+    def config(state_path: str) -> AgentConfig:
+        return AgentConfig(backend_url=backend_url, state_path=state_path)
+
+    return Pipeline(
+        fetcher=JobFetcherAgent(config("state_job_fetcher.json")),
+        matcher=JobMatcherAgent(config("state_job_matcher.json")),
+        resume_agent=ResumeAgent(config("state_resume_agent.json")),
+        cover_letter_agent=CoverLetterAgent(config("state_cover_letter_agent.json")),
+        metrics_path=metrics_path,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run fetch -> embed -> match -> resume -> cover letter as a streaming pipeline."
+    )
+    parser.add_argument("--once", action="store_true", help="Run a single fetch cycle and exit.")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=60 * 60,
+        help="Seconds between fetch cycles (default 3600).",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        default=os.getenv("ALFRED_PIPELINE_METRICS_PATH"),
+        help="Append per-job latency records (JSON lines) to this file.",
+    )
+    args = parser.parse_args()
+
+    pipeline = build_pipeline(args.metrics_file)
+    asyncio.run(pipeline.run(args.interval, once=args.once))
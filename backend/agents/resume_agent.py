@@ -5,10 +5,12 @@ from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 from .base import BaseAgent, AgentConfig
-from backend.queue.simple_queue import SimpleQueue
+from backend.queue.base import PermanentError
+from backend.queue.factory import get_queue
 from backend.utils.pdf_writer import write_pdf
 from backend.db.repo import SessionLocal
 from backend.db.models import ApplicationPackage, GeneratedArtifact
+from backend.utils.near_duplicate import canonical_artifact
 
 
 # -------------------------------------------------------------------
@@ -33,31 +35,38 @@ class ResumeAgent(BaseAgent):
     -----------------------------
     Responsibilities:
 
-      1. Pull a job request from resume_queue.json
+      1. Lease a batch of job requests from the "resume_queue" queue
+         (failures are retried with backoff, then dead-lettered)
       2. Fetch job details from backend
       3. Generate resume text via /jobs/generate_resume
       4. Save resume to PDF
       5. Store result in:
            - ApplicationPackage
            - GeneratedArtifact (artifact_type='resume')
-      6. Push job forward into cover_letter_queue.json
+      6. Push job forward into the "cover_letter_queue" queue
       7. Mark job as completed in internal state
 
+    A near-duplicate job (jobs.canonical_job_id) of the same company reuses
+    the resume already generated for its canonical job instead of
+    generating a new one (the resume is tailored to the company); the
+    reused text is stored as the duplicate's own GeneratedArtifact.
+
     This agent does NOT decide how resumes are written.
     The logic lives inside /jobs/generate_resume.
     """
 
+    DEFAULT_BATCH_SIZE = 5
+
     def __init__(self, config: AgentConfig):
         super().__init__("ResumeAgent", config)
 
-        # Local state: avoid reprocessing already-completed jobs
-        self.state.setdefault("completed_resumes", {})
+        self.batch_size = max(1, int(os.getenv("RESUME_AGENT_BATCH_SIZE", self.DEFAULT_BATCH_SIZE)))
 
         # Queue: incoming strong matches
-        self.resume_queue = SimpleQueue("resume_queue.json")
+        self.resume_queue = get_queue("resume_queue")
 
         # Queue: downstream for cover letters
-        self.cover_letter_queue = SimpleQueue("cover_letter_queue.json")
+        self.cover_letter_queue = get_queue("cover_letter_queue")
 
     # -------------------------------------------------------------------
     # Backend Helpers
@@ -65,19 +74,30 @@ class ResumeAgent(BaseAgent):
     def fetch_job(self, job_id: int) -> Optional[Dict[str, Any]]:
         return self.api_get(f"/jobs/{job_id}")
 
+    def reusable_resume(self, job_id: int, company: str) -> Optional[GeneratedArtifact]:
+        """The canonical job's resume, if job_id is a near-duplicate from the same company."""
+        db = SessionLocal()
+        try:
+            return canonical_artifact(db, job_id, "resume", company=company or "")
+        finally:
+            db.close()
+
     def generate_resume(
         self,
         title: str,
         company: str,
         description: str,
         extra_config: Optional[Dict[str, Any]] = None,
+        job_id: Optional[int] = None,
     ) -> Optional[str]:
 
+        # job_id lets the endpoint use the job's precomputed artifact neighbors
         payload = {
             "title": title,
             "company": company,
             "description": description,
             "top_k": 5,
+            "job_id": job_id,
         }
 
         if extra_config:
@@ -92,32 +112,46 @@ class ResumeAgent(BaseAgent):
     # -------------------------------------------------------------------
     # Main Step
     # -------------------------------------------------------------------
-    def step(self):
+    def step(self) -> int:
+        """Drain resume_queue; returns how many resumes were completed."""
 
-        self.logger.info("===>>> ResumeAgent: polling resume_queue.json...")
+        self.logger.info("===>>> ResumeAgent: polling resume_queue...")
 
-        job_item = self.resume_queue.pop()
+        # Failed items are retried with backoff, then dead-lettered
+        processed = self.drain_queue(self.resume_queue, self.process_item, self.batch_size)
 
-        if not job_item:
+        if processed:
+            self.logger.info(f"--OK-- ResumeAgent: drained {processed} queue items")
+        else:
             self.logger.info("ResumeAgent: queue empty.")
-            return
+        return processed
+
+    def wait_for_work(self, timeout: float) -> bool:
+        """Sleep only while resume_queue is empty."""
+        return self.resume_queue.wait_for_items(timeout)
 
+    def process_item(self, job_item: Dict[str, Any], forward: bool = True):
+        """
+        Generate, store and forward the resume for one queue message.
+        Raises on failure so the queue item is retried.
+
+        forward=False skips the push to cover_letter_queue, for callers
+        that hand the job to the cover letter step themselves (pipeline).
+        """
         job_id = job_item.get("job_id")
         score = job_item.get("score", 0)
 
         if job_id is None:
-            self.logger.error("--XX-- Malformed queue message: missing job_id")
-            return
+            raise PermanentError("Malformed queue message: missing job_id")
 
-        if str(job_id) in self.state["completed_resumes"]:
+        if str(job_id) in self.state.get("completed_resumes", {}):
             self.logger.info(f"--OK-- Resume already generated for job {job_id}")
             return
 
         # Fetch job details
         job = self.fetch_job(job_id)
         if not job:
-            self.logger.error(f"--XX-- Unable to fetch job {job_id}")
-            return
+            raise RuntimeError(f"Unable to fetch job {job_id}")
 
         title = job.get("title", "")
         company = job.get("company", "")
@@ -126,10 +160,16 @@ class ResumeAgent(BaseAgent):
         # -------------------------------------------------------------------
         # Generate Resume
         # -------------------------------------------------------------------
-        resume_text = self.generate_resume(title, company, description)
-        if resume_text is None:
-            self.logger.error(f"--XX-- Resume generation failed for job {job_id}")
-            return
+        reused = self.reusable_resume(job_id, company)
+        if reused is not None:
+            resume_text = reused.content
+            self.logger.info(
+                f"--OK-- Job {job_id} is a near-duplicate: reusing resume of job {reused.job_id}"
+            )
+        else:
+            resume_text = self.generate_resume(title, company, description, job_id=job_id)
+            if resume_text is None:
+                raise RuntimeError(f"Resume generation failed for job {job_id}")
 
         # Write PDF
         filename_prefix = f"{job_id}_{safe_filename(company)}_{safe_filename(title)}"
@@ -138,8 +178,7 @@ class ResumeAgent(BaseAgent):
         try:
             write_pdf(pdf_path, resume_text)
         except Exception as e:
-            self.logger.error(f"--XX-- Failed writing PDF for job {job_id}: {e}")
-            return
+            raise RuntimeError(f"Failed writing PDF for job {job_id}: {e}") from e
 
         self.logger.info(f"--OK-- PDF saved → {pdf_path}")
 
@@ -156,11 +195,15 @@ class ResumeAgent(BaseAgent):
                 score=str(score),
                 resume_path=pdf_path,
                 cover_letter_path=None,
-                package_metadata={"agent": "ResumeAgent"},
+                package_metadata={
+                    "agent": "ResumeAgent",
+                    "reused_from_job_id": reused.job_id if reused is not None else None,
+                },
             )
             db.add(pkg)
 
-            # Save full text into GeneratedArtifact
+            # Save full text into GeneratedArtifact (reused text too, so
+            # the judge and artifact listings see this job's resume)
             ga = GeneratedArtifact(
                 job_id=job_id,
                 job_title=title,
@@ -180,32 +223,34 @@ class ResumeAgent(BaseAgent):
 
         except Exception as e:
             db.rollback()
-            self.logger.error(f"--XX-- DB error for job {job_id}: {e}")
-            return
+            raise RuntimeError(f"DB error for job {job_id}: {e}") from e
         finally:
             db.close()
 
         # -------------------------------------------------------------------
         # Push job to next queue: cover letters
         # -------------------------------------------------------------------
-        self.cover_letter_queue.push({
-            "job_id": job_id,
-            "score": score,
-            "title": title,
-            "company": company,
-        })
+        if forward:
+            self.cover_letter_queue.push(
+                {
+                    "job_id": job_id,
+                    "score": score,
+                    "title": title,
+                    "company": company,
+                },
+                priority=float(score or 0.0),
+            )
 
         # -------------------------------------------------------------------
         # Mark complete
         # -------------------------------------------------------------------
-        self.state["completed_resumes"][str(job_id)] = {
+        self._state_put("completed_resumes", job_id, {
             "job_id": job_id,
             "title": title,
             "company": company,
             "score": score,
             "resume_pdf": pdf_path,
-        }
-        self._save_state()
+        })
 
         self.logger.info(f"--OK-- ResumeAgent: DONE job {job_id}")
 
@@ -0,0 +1,265 @@
+# backend/agents/state_store.py
+import atexit
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# "json" (default): one state file rewritten atomically on flush
+# "sqlite": one row per entry, only changed entries are written
+STATE_BACKEND = os.getenv("ALFRED_STATE_BACKEND", "json").lower()
+
+# Writes are batched and flushed at most this often (0 = write immediately)
+STATE_FLUSH_SECONDS = float(os.getenv("ALFRED_STATE_FLUSH_SECONDS", "2.0"))
+
+# Section used by the SQLite store for top-level values that aren't dicts
+_ROOT_SECTION = ""
+
+# Pending-change marker for deleted entries
+_DELETED = object()
+
+
+class StateStore(ABC):
+    """
+    Persistent agent state: a dict of sections (e.g. "processed_jobs"),
+    each usually a dict of entries keyed by job id.
+
+    Agents read `data` directly and write through put()/delete()/drop(),
+    which only record the change; writes are flushed in the background at
+    most every `flush_interval` seconds, and on flush()/exit. `data` must
+    not be edited in place: such edits are never persisted.
+    """
+
+    def __init__(self, flush_interval: float = STATE_FLUSH_SECONDS):
+        self.flush_interval = flush_interval
+        self.data: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending: Dict[Tuple[str, str], Any] = {}
+        self._timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+
+    # --------------------------
+    # Backend hooks
+    # --------------------------
+    @abstractmethod
+    def _read_all(self) -> Dict[str, Any]:
+        pass
+
+    @abstractmethod
+    def _snapshot(self, changes: Dict[Tuple[str, str], Any], full: bool) -> Any:
+        """Capture what to write while holding the lock (cheap, no I/O)."""
+        pass
+
+    @abstractmethod
+    def _write(self, snapshot: Any) -> None:
+        """Persist a snapshot. Runs outside the data lock."""
+        pass
+
+    # --------------------------
+    # Public API
+    # --------------------------
+    def load(self) -> Dict[str, Any]:
+        with self._lock:
+            self.data = self._read_all()
+            return self.data
+
+    def put(self, section: str, key: str, value: Any) -> None:
+        with self._lock:
+            self.data.setdefault(section, {})[key] = value
+            self._pending[(section, key)] = value
+        self._schedule()
+
+    def delete(self, section: str, key: str) -> None:
+        with self._lock:
+            self.data.get(section, {}).pop(key, None)
+            self._pending[(section, key)] = _DELETED
+        self._schedule()
+
+    def drop(self, section: str) -> None:
+        """Remove a whole section."""
+        with self._lock:
+            value = self.data.pop(section, None)
+            if isinstance(value, dict):
+                for key in value:
+                    self._pending[(section, str(key))] = _DELETED
+            elif value is not None:
+                self._pending[(_ROOT_SECTION, section)] = _DELETED
+        self._schedule()
+
+    def flush(self) -> None:
+        """Write pending changes now."""
+        # The write lock keeps snapshots hitting disk in the order taken
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._pending:
+                    return
+                snapshot = self._snapshot(self._pending, full=False)
+                self._pending = {}
+            self._write(snapshot)
+
+    # --------------------------
+    # Internal helpers
+    # --------------------------
+    def _schedule(self) -> None:
+        # Called without the data lock held: flush() takes the write lock first
+        if self.flush_interval <= 0:
+            self.flush()
+            return
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+
+class JsonStateStore(StateStore):
+    """
+    Whole state in one JSON file, as before, but written compactly to a
+    temp file and renamed into place (a crash never leaves a torn file),
+    and at most once per flush interval instead of once per change.
+    """
+
+    def __init__(self, path: str, flush_interval: float = STATE_FLUSH_SECONDS):
+        super().__init__(flush_interval)
+        self.path = path
+
+    def _read_all(self) -> Dict[str, Any]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _snapshot(self, changes, full):
+        # Serialized under the lock so workers can't mutate mid-dump
+        return json.dumps(self.data, separators=(",", ":"))
+
+    def _write(self, snapshot: str) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(snapshot)
+        os.replace(tmp_path, self.path)
+
+
+class SQLiteStateStore(StateStore):
+    """
+    One row per (section, key) in a SQLite file, so a flush writes only the
+    entries that changed since the last one. Top-level values that aren't
+    dicts (e.g. lists) are stored whole.
+
+    On first use, an existing JSON state file is imported.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        legacy_json_path: Optional[str] = None,
+        flush_interval: float = STATE_FLUSH_SECONDS,
+    ):
+        super().__init__(flush_interval)
+        self.path = path
+        self.legacy_json_path = legacy_json_path
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS agent_state (
+                    section TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    PRIMARY KEY (section, key)
+                )
+                """
+            )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _read_all(self) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT section, key, value FROM agent_state").fetchall()
+        finally:
+            conn.close()
+
+        if not rows and self.legacy_json_path:
+            legacy = JsonStateStore(self.legacy_json_path)._read_all()
+            if legacy:
+                self.data = legacy
+                self._write(self._snapshot({}, full=True))
+                return legacy
+
+        data: Dict[str, Any] = {}
+        for section, key, value in rows:
+            if section == _ROOT_SECTION:
+                data[key] = json.loads(value)
+            else:
+                data.setdefault(section, {})[key] = json.loads(value)
+        return data
+
+    def _snapshot(self, changes, full) -> Tuple[bool, List[Tuple[str, str, Optional[str]]]]:
+        if full:
+            rows = []
+            for section, value in self.data.items():
+                if isinstance(value, dict):
+                    rows.extend((section, str(k), json.dumps(v)) for k, v in value.items())
+                else:
+                    rows.append((_ROOT_SECTION, section, json.dumps(value)))
+            return True, rows
+
+        rows = [
+            (section, str(key), None if value is _DELETED else json.dumps(value))
+            for (section, key), value in changes.items()
+        ]
+        return False, rows
+
+    def _write(self, snapshot) -> None:
+        full, rows = snapshot
+        conn = self._connect()
+        try:
+            with conn:
+                if full:
+                    conn.execute("DELETE FROM agent_state")
+                    conn.executemany("INSERT INTO agent_state VALUES (?, ?, ?)", rows)
+                    return
+                conn.executemany(
+                    "DELETE FROM agent_state WHERE section = ? AND key = ?",
+                    [(s, k) for s, k, v in rows if v is None],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO agent_state VALUES (?, ?, ?)",
+                    [row for row in rows if row[2] is not None],
+                )
+        finally:
+            conn.close()
+
+
+def open_state_store(state_path: str, backend: Optional[str] = None) -> StateStore:
+    """
+    Store for an agent's `state_path` (e.g. "matcher_state.json").
+    The SQLite backend keeps its data next to it, in "matcher_state.db".
+    """
+    backend = (backend or STATE_BACKEND).lower()
+    if backend == "json":
+        return JsonStateStore(state_path)
+    if backend == "sqlite":
+        return SQLiteStateStore(os.path.splitext(state_path)[0] + ".db", legacy_json_path=state_path)
+    raise ValueError(f"Unknown ALFRED_STATE_BACKEND: {backend}")
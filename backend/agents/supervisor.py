@@ -0,0 +1,443 @@
+# backend/agents/supervisor.py
+import argparse
+import json
+import logging
+import logging.handlers
+import multiprocessing as mp
+import os
+import signal
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Seconds between child heartbeats, and how stale one may get before the
+# child is considered dead and killed. A thread beats while the process
+# runs Python at all, however long the current call takes.
+HEARTBEAT_SECONDS = 5.0
+HEARTBEAT_TIMEOUT = float(os.getenv("ALFRED_SUPERVISOR_HEARTBEAT_TIMEOUT", "60"))
+
+# Progress only moves between steps and between items/HTTP calls within
+# one; a child whose progress is this stale is considered stuck (e.g. on
+# a lock or a socket) and killed. Must exceed the slowest single call
+# (OpenAI, PDF rendering, backend POSTs: 180s). 0 disables the check.
+STALL_TIMEOUT = float(os.getenv("ALFRED_SUPERVISOR_STALL_TIMEOUT", "1800"))
+
+# Restart backoff for crashing children: doubles from MIN to MAX, and
+# resets once a child stayed up for STABLE_SECONDS
+RESTART_MIN_DELAY = 1.0
+RESTART_MAX_DELAY = 60.0
+STABLE_SECONDS = 60.0
+
+# How long a child may take to finish its current step on shutdown
+STOP_GRACE_SECONDS = float(os.getenv("ALFRED_SUPERVISOR_STOP_GRACE", "60"))
+
+# Children check for shutdown at least this often while idle
+STOP_CHECK_SECONDS = 2.0
+
+STATUS_PATH = os.getenv("ALFRED_SUPERVISOR_STATUS_PATH", "supervisor_status.json")
+
+LOG_FORMAT = "%(asctime)s [%(processName)s] [%(name)s] %(levelname)s: %(message)s"
+
+# Agents the supervisor can run: base state path, seconds between steps,
+# whether several replicas may run at once, and whether replicas split
+# the work into shards with a state of their own (else they share one)
+AGENTS: Dict[str, Dict[str, Any]] = {
+    "github_ingestion": {"state_path": "state_github_ingestion.json", "interval": 60 * 60 * 24},
+    "job_fetcher": {"state_path": "state_job_fetcher.json", "interval": 60 * 60},
+    "job_matcher": {
+        "state_path": "state_job_matcher.json",
+        "interval": 60 * 5,
+        "replicable": True,
+        "sharded": True,
+    },
+    "resume_agent": {"state_path": "state_resume_agent.json", "interval": 60, "replicable": True},
+    "cover_letter_agent": {"state_path": "state_cover_letter_agent.json", "interval": 60, "replicable": True},
+}
+
+
+def replica_state_path(state_path: str, replica: int, replicas: int) -> str:
+    """Each shard keeps its own state: state_job_matcher.1of3.json."""
+    if replicas <= 1:
+        return state_path
+    root, ext = os.path.splitext(state_path)
+    return f"{root}.{replica + 1}of{replicas}{ext}"
+
+
+def build_agent(name: str, replica: int = 0, replicas: int = 1):
+    """Construct agent `name` for one replica (runs inside the child process)."""
+    from backend.agents.base import AgentConfig
+
+    backend_url = os.getenv("API_BASE_URL", "http://127.0.0.1:8000")
+    base_path = AGENTS[name]["state_path"]
+    sharded = AGENTS[name].get("sharded", False)
+    config = AgentConfig(
+        backend_url=backend_url,
+        state_path=replica_state_path(base_path, replica, replicas) if sharded else base_path,
+        sleep_interval=AGENTS[name]["interval"],
+    )
+
+    if name == "github_ingestion":
+        from backend.agents.github_ingestion_agent import GitHubIngestionAgent
+
+        github_username = os.getenv("GITHUB_USERNAME")
+        github_token = os.getenv("GITHUB_TOKEN")
+        if not github_username:
+            raise ValueError("--XX-- Missing GITHUB_USERNAME in .env")
+        if not github_token:
+            raise ValueError("--XX-- Missing GITHUB_TOKEN in .env")
+        return GitHubIngestionAgent(
+            config, github_username=github_username, github_token=github_token
+        )
+    if name == "job_fetcher":
+        from backend.agents.job_fetcher import JobFetcherAgent
+
+        return JobFetcherAgent(config)
+    if name == "job_matcher":
+        from backend.agents.job_matcher import JobMatcherAgent
+
+        # Replicas split the job ids between them
+        return JobMatcherAgent(
+            config,
+            shard=(replica, replicas),
+            seed_state_path=base_path if replicas > 1 else None,
+        )
+    if name == "resume_agent":
+        from backend.agents.resume_agent import ResumeAgent
+
+        return ResumeAgent(config)
+    if name == "cover_letter_agent":
+        from backend.agents.cover_letter_agent import CoverLetterAgent
+
+        return CoverLetterAgent(config)
+    raise ValueError(f"Unknown agent: {name}")
+
+
+def _worker_main(name, replica, replicas, log_queue, heartbeat, progress, stop_flag):
+    """
+    Child process entry point: run one agent replica until stop_flag is set.
+
+    Logs go to the supervisor through log_queue. A background thread
+    stamps `heartbeat` every HEARTBEAT_SECONDS while the process is alive,
+    and copies the step's last progress (RunStats.last_activity) into
+    `progress`, which the loop also stamps around each step and while
+    idle. A slow call keeps the heartbeat going; only a step that makes
+    no progress for STALL_TIMEOUT looks stuck.
+    """
+    # The supervisor handles Ctrl+C and tells children to stop via stop_flag;
+    # a SIGTERM sent to this child alone stops only this child
+    terminated = threading.Event()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: terminated.set())
+
+    def stopping() -> bool:
+        return bool(stop_flag.value) or terminated.is_set()
+
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+    logger = logging.getLogger("Supervisor")
+
+    def beat():
+        while not stopping():
+            heartbeat.value = time.time()
+            if agent is not None:
+                progress.value = max(progress.value, agent.run_stats.last_activity)
+            terminated.wait(HEARTBEAT_SECONDS)
+
+    agent = None
+    threading.Thread(target=beat, name="heartbeat", daemon=True).start()
+    progress.value = time.time()
+    agent = build_agent(name, replica, replicas)
+    interval = AGENTS[name]["interval"]
+
+    while not stopping():
+        progress.value = time.time()
+        try:
+            agent.run_step()
+        except Exception:
+            logger.error(f"--XX-- Agent {name} step failed:\n{traceback.format_exc()}")
+        agent.flush_state()
+
+        # Sleep until the interval elapses, queued work arrives or shutdown
+        deadline = time.monotonic() + interval
+        while not stopping():
+            progress.value = time.time()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if agent.wait_for_work(min(remaining, STOP_CHECK_SECONDS)):
+                break
+
+    agent.flush_state()
+
+
+class _Worker:
+    """Supervisor-side handle for one agent replica."""
+
+    def __init__(self, name: str, replica: int, replicas: int):
+        self.name = name
+        self.replica = replica
+        self.replicas = replicas
+        self.label = name if replicas == 1 else f"{name}-{replica + 1}"
+        self.process: Optional[mp.process.BaseProcess] = None
+        self.heartbeat = None
+        self.progress = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.restart_delay = RESTART_MIN_DELAY
+        self.restart_at: Optional[float] = None
+        self.last_exit: Optional[int] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+
+class Supervisor:
+    """
+    Multi-process agent runner.
+
+    Each agent (or each of N replicas of the matcher, resume and cover
+    letter agents) runs in its own process, so CPU-bound work (PDF
+    rendering, HTML extraction, skill regexes, state serialization) uses
+    every core instead of sharing one GIL.
+
+      - work is passed through the shared queue backend (SQLite WAL or
+        Postgres; leases keep replicas from taking the same item) and the
+        database
+      - matcher replicas split the job ids between them (job_id % N) and
+        each keeps the state of its shard; other replicas share one state
+        store, so replicas need ALFRED_STATE_BACKEND=sqlite (a JSON state
+        file is rewritten whole by whoever flushes last)
+      - children send heartbeats and report progress; one that dies, stops
+        beating or makes no progress for STALL_TIMEOUT (e.g. a step hung
+        on I/O) is restarted with exponential backoff
+      - all child logs are merged into this process's stream, tagged
+        with the replica name
+      - a status snapshot is written to ALFRED_SUPERVISOR_STATUS_PATH
+      - SIGINT/SIGTERM let children finish their current step and flush
+        state, then stops them
+    """
+
+    MONITOR_SECONDS = 1.0
+    STATUS_SECONDS = 10.0
+
+    def __init__(self, replicas: Optional[Dict[str, int]] = None, agents: Optional[List[str]] = None):
+        from backend.queue.factory import QUEUE_BACKEND
+
+        if QUEUE_BACKEND == "json":
+            raise ValueError(
+                "--XX-- The supervisor needs a multi-process queue backend; "
+                "set ALFRED_QUEUE_BACKEND=sqlite or postgres"
+            )
+
+        from backend.agents.state_store import STATE_BACKEND
+
+        replicas = replicas or {}
+        self.workers: List[_Worker] = []
+        for name in agents or list(AGENTS):
+            if name not in AGENTS:
+                raise ValueError(f"Unknown agent: {name}")
+            count = max(1, int(replicas.get(name, 1)))
+            if count > 1 and not AGENTS[name].get("replicable"):
+                raise ValueError(f"--XX-- Agent {name} can only run as one process")
+            if count > 1 and STATE_BACKEND == "json":
+                raise ValueError(
+                    f"--XX-- {count} replicas of {name} need a shared state backend; "
+                    "set ALFRED_STATE_BACKEND=sqlite"
+                )
+            self.workers.extend(_Worker(name, i, count) for i in range(count))
+
+        # Spawn (not fork): children must not inherit DB pools, locks or threads
+        self._ctx = mp.get_context("spawn")
+        # Lock-free shared flag: a child killed mid-call can't leave it
+        # locked, as it could an mp.Event
+        self._stop_flag = self._ctx.Value("b", 0, lock=False)
+        self._stopping = False
+
+        self.logger = logging.getLogger("Supervisor")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self._console = logging.StreamHandler()
+        self._console.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.logger.handlers = [self._console]
+
+    # ------------------------------------------------------------------
+    def _start(self, worker: _Worker):
+        # A fresh log queue per child: one killed while writing to a shared
+        # queue could leave its lock held and block every other child
+        if worker.listener is not None:
+            worker.listener.enqueue_sentinel()
+        log_queue = self._ctx.Queue()
+        worker.listener = logging.handlers.QueueListener(log_queue, self._console)
+        worker.listener.start()
+
+        worker.heartbeat = self._ctx.Value("d", time.time(), lock=False)
+        worker.progress = self._ctx.Value("d", time.time(), lock=False)
+        worker.process = self._ctx.Process(
+            target=_worker_main,
+            name=worker.label,
+            args=(
+                worker.name,
+                worker.replica,
+                worker.replicas,
+                log_queue,
+                worker.heartbeat,
+                worker.progress,
+                self._stop_flag,
+            ),
+            daemon=False,
+        )
+        worker.process.start()
+        worker.started_at = time.time()
+        worker.restart_at = None
+        self.logger.info(f"--OK-- Started {worker.label} (pid {worker.process.pid})")
+
+    def _check(self, worker: _Worker):
+        """Restart a worker that exited or stopped sending heartbeats."""
+        now = time.time()
+
+        if worker.restart_at is not None:
+            if now >= worker.restart_at:
+                worker.restarts += 1
+                self._start(worker)
+            return
+
+        proc = worker.process
+        if proc.is_alive():
+            stale = now - worker.heartbeat.value
+            stalled = now - worker.progress.value
+            if stale > HEARTBEAT_TIMEOUT:
+                self.logger.error(f"--XX-- {worker.label} missed heartbeats for {stale:.0f}s; killing it")
+            elif STALL_TIMEOUT and stalled > STALL_TIMEOUT:
+                self.logger.error(f"--XX-- {worker.label} made no progress for {stalled:.0f}s; killing it")
+            else:
+                return
+            proc.kill()
+            proc.join(5)
+
+        worker.last_exit = proc.exitcode
+        if now - worker.started_at >= STABLE_SECONDS:
+            worker.restart_delay = RESTART_MIN_DELAY
+        self.logger.error(
+            f"--XX-- {worker.label} exited (code {proc.exitcode}); "
+            f"restarting in {worker.restart_delay:.0f}s"
+        )
+        worker.restart_at = now + worker.restart_delay
+        worker.restart_delay = min(worker.restart_delay * 2, RESTART_MAX_DELAY)
+
+    def status(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        rows = []
+        for w in self.workers:
+            alive = w.process is not None and w.process.is_alive()
+            rows.append({
+                "name": w.label,
+                "agent": w.name,
+                "pid": w.process.pid if w.process else None,
+                "alive": alive,
+                "heartbeat_age": round(now - w.heartbeat.value, 1) if w.heartbeat else None,
+                "progress_age": round(now - w.progress.value, 1) if w.progress else None,
+                "uptime": round(now - w.started_at, 1) if alive else 0.0,
+                "restarts": w.restarts,
+                "last_exit": w.last_exit,
+            })
+        return rows
+
+    def _write_status(self):
+        if not STATUS_PATH:
+            return
+        tmp_path = f"{STATUS_PATH}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"updated_at": time.time(), "workers": self.status()}, f, indent=2)
+            os.replace(tmp_path, STATUS_PATH)
+        except OSError as e:
+            self.logger.error(f"--XX-- Could not write {STATUS_PATH}: {e}")
+
+    def stop(self, *_):
+        """Request a clean shutdown (signal-safe)."""
+        self._stopping = True
+
+    # ------------------------------------------------------------------
+    def run(self):
+        previous = {
+            sig: signal.signal(sig, self.stop) for sig in (signal.SIGINT, signal.SIGTERM)
+        }
+        self.logger.info(f"Supervisor starting {len(self.workers)} agent processes")
+        try:
+            for worker in self.workers:
+                self._start(worker)
+
+            last_status = 0.0
+            while not self._stopping:
+                for worker in self.workers:
+                    self._check(worker)
+                if time.time() - last_status >= self.STATUS_SECONDS:
+                    self._write_status()
+                    last_status = time.time()
+                time.sleep(self.MONITOR_SECONDS)
+        finally:
+            self._shutdown()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def _shutdown(self):
+        self.logger.info("Shutdown requested; waiting for agents to finish their step...")
+        self._stop_flag.value = 1
+        deadline = time.monotonic() + STOP_GRACE_SECONDS
+        for worker in self.workers:
+            proc = worker.process
+            if proc is None:
+                continue
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                self.logger.error(f"--XX-- {worker.label} did not stop in time; terminating")
+                proc.terminate()
+                proc.join(5)
+        self._write_status()
+        self.logger.info("Supervisor stopped.")
+        for worker in self.workers:
+            if worker.listener is not None:
+                worker.listener.stop()
+
+
+def _replica_counts(args) -> Dict[str, int]:
+    return {
+        "job_matcher": args.matcher_replicas,
+        "resume_agent": args.resume_replicas,
+        "cover_letter_agent": args.cover_letter_replicas,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run each agent in its own process.")
+    parser.add_argument(
+        "--agents",
+        nargs="+",
+        choices=list(AGENTS),
+        help="Agents to run (default: all).",
+    )
+    parser.add_argument(
+        "--matcher-replicas",
+        type=int,
+        default=int(os.getenv("ALFRED_MATCHER_REPLICAS", "1")),
+        help="Matcher processes; each takes a shard of the job ids.",
+    )
+    parser.add_argument(
+        "--resume-replicas",
+        type=int,
+        default=int(os.getenv("ALFRED_RESUME_REPLICAS", "1")),
+        help="Resume agent processes sharing resume_queue.",
+    )
+    parser.add_argument(
+        "--cover-letter-replicas",
+        type=int,
+        default=int(os.getenv("ALFRED_COVER_LETTER_REPLICAS", "1")),
+        help="Cover letter agent processes sharing cover_letter_queue.",
+    )
+    args = parser.parse_args()
+
+    Supervisor(replicas=_replica_counts(args), agents=args.agents).run()
@@ -0,0 +1,75 @@
+# backend/agents/telemetry.py
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Set to 0 to stop writing agent_runs rows (e.g. agents run without a database)
+TELEMETRY_ENABLED = os.getenv("ALFRED_AGENT_TELEMETRY", "1").lower() not in ("0", "false", "no")
+
+logger = logging.getLogger("AgentTelemetry")
+
+
+class RunStats:
+    """
+    Counters for one agent step. Thread-safe, since some agents fan work
+    out to worker threads within a step.
+
+    last_activity is the time.time() of the last update, i.e. the last
+    sign that the step is making progress.
+    """
+
+    def __init__(self):
+        self.items = 0
+        self.failures = 0
+        self.api_calls = 0
+        self.bytes_fetched = 0
+        self.last_activity = time.time()
+        self._lock = threading.Lock()
+
+    def add(self, items: int = 0, failures: int = 0, api_calls: int = 0, bytes_fetched: int = 0):
+        with self._lock:
+            self.items += items
+            self.failures += failures
+            self.api_calls += api_calls
+            self.bytes_fetched += bytes_fetched
+            self.last_activity = time.time()
+
+
+def record_agent_run(
+    agent: str,
+    started_at: datetime,
+    finished_at: datetime,
+    duration_ms: float,
+    stats: RunStats,
+    error: Optional[str] = None,
+) -> None:
+    """Insert an agent_runs row. Never raises: telemetry must not break the agent."""
+    if not TELEMETRY_ENABLED:
+        return
+    try:
+        # Imported lazily: needs DATABASE_URL
+        from backend.db.models import AgentRun
+        from backend.db.repo import SessionLocal
+
+        with SessionLocal() as db:
+            db.add(AgentRun(
+                agent=agent,
+                started_at=started_at,
+                finished_at=finished_at,
+                duration_ms=duration_ms,
+                items_processed=stats.items,
+                failures=stats.failures,
+                api_calls=stats.api_calls,
+                bytes_fetched=stats.bytes_fetched,
+                error=error,
+            ))
+            db.commit()
+    except Exception as e:
+        logger.error(f"--XX-- Could not record {agent} run: {e}")
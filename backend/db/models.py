@@ -11,6 +11,11 @@ from sqlalchemy import (
     UniqueConstraint,
     ForeignKey,
     Float,
+    Index,
+    BigInteger,
+    LargeBinary,
+    Sequence,
+    SmallInteger,
 )
 from sqlalchemy.orm import declarative_base, relationship
 from pgvector.sqlalchemy import Vector
@@ -35,7 +40,23 @@ class Job(Base):
     source_url = Column(Text, unique=True, nullable=False)
     created_at = Column(DateTime(timezone=True), default=now_eastern)
     match_score = Column(Float, nullable=True)
+    # How match_score was set: "hybrid" (full match) or "prefilter"
+    # (low-match estimate, no LLM calls; see backend/utils/matching.py)
+    match_stage = Column(String(16), nullable=True)
+    # Highest artifact embedding_version the job's job_artifact_neighbors
+    # rows were computed against (NULL: not computed yet)
+    neighbors_artifact_id = Column(Integer, nullable=True)
     description_embedding = Column(Vector(1536), nullable=True)
+    # SHA-256 of title|company|source description (JobSource.fingerprint);
+    # NULL for jobs inserted before fingerprints were stored
+    job_fingerprint = Column(String(64), nullable=True, unique=True, index=True)
+    # Near-duplicate detection (backend/utils/near_duplicate.py): MinHash
+    # signature of the description, and the job this one is a repost of
+    # (NULL if it is itself canonical or was never compared)
+    description_minhash = Column(LargeBinary, nullable=True)
+    canonical_job_id = Column(
+        Integer, ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True, index=True
+    )
 
     __table_args__ = (
         UniqueConstraint("source_url", name="uq_job_source_url"),
@@ -61,6 +82,10 @@ class Job(Base):
         return f"<Job(title={self.title}, company={self.company}, location={self.location})>"
 
 
+# Numbers artifact embeddings as they are written (see Artifact.embedding_version)
+artifact_embedding_version_seq = Sequence("artifact_embedding_version_seq", metadata=Base.metadata)
+
+
 class Artifact(Base):
     __tablename__ = "artifacts"
 
@@ -69,6 +94,15 @@ class Artifact(Base):
     type = Column(String(50), default="text")  # text, pdf, image, code
     content = Column(Text, nullable=False)
     embedding = Column(Vector(1536))  # 1536-dim for OpenAI text embeddings
+    # Taken from artifact_embedding_version_seq on insert and again whenever
+    # the embedding changes (trigger in repo._migrate), so job neighbors can
+    # tell new and edited embeddings from the ones they were computed with
+    embedding_version = Column(
+        Integer,
+        server_default=artifact_embedding_version_seq.next_value(),
+        nullable=True,
+        index=True,
+    )
     source = Column(String(255))
     artifact_metadata = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), default=now_eastern)
@@ -139,3 +173,119 @@ class PromptExperiment(Base):
 
     job = relationship("Job", back_populates="prompt_experiments")
     generated_artifact = relationship("GeneratedArtifact", back_populates="prompt_experiments")
+
+
+class JobMatch(Base):
+    """
+    One artifact's match against a job, as scored by /jobs/match.
+    Rows for a job are replaced as a whole each time it is re-matched.
+    """
+
+    __tablename__ = "job_matches"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False)
+    artifact_id = Column(Integer, ForeignKey("artifacts.id", ondelete="CASCADE"), nullable=False)
+    rank = Column(Integer, nullable=False)  # 0 = best combined_score
+    similarity = Column(Float, nullable=False)
+    skill_overlap = Column(Float, nullable=False)
+    combined_score = Column(Float, nullable=False)
+    matched_at = Column(DateTime(timezone=True), nullable=False, default=now_eastern)
+
+    __table_args__ = (
+        UniqueConstraint("job_id", "artifact_id", name="uq_job_match_job_artifact"),
+        Index("ix_job_matches_job_rank", "job_id", "rank"),
+    )
+
+
+class JobMinhashBand(Base):
+    """LSH index over jobs.description_minhash: one row per (band, bucket) of a job."""
+
+    __tablename__ = "job_minhash_bands"
+
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+
+
+class JobArtifactNeighbor(Base):
+    """
+    Precomputed nearest artifacts of a job by cosine similarity of the
+    stored embeddings, best first (see backend/utils/neighbors.py).
+    """
+
+    __tablename__ = "job_artifact_neighbors"
+
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(SmallInteger, primary_key=True)
+    artifact_id = Column(
+        Integer, ForeignKey("artifacts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    similarity = Column(Float, nullable=False)
+
+
+class QueueItem(Base):
+    """Work item for the Postgres-backed agent queues (see backend/queue/postgres_queue.py)."""
+
+    __tablename__ = "work_queue"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    queue = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)
+    priority = Column(Float, nullable=False, default=0.0)
+    attempts = Column(Integer, nullable=False, default=0)
+    enqueued_at = Column(DateTime(timezone=True), nullable=False, default=now_eastern)
+    available_at = Column(DateTime(timezone=True), nullable=False, default=now_eastern)
+    leased_until = Column(DateTime(timezone=True), nullable=True)
+    lease_token = Column(String(64), nullable=True)
+    # priority - aging * enqueue hours (see backend.queue.base.aged_rank)
+    rank_key = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_work_queue_dequeue", "queue", "priority", "id"),
+        Index("ix_work_queue_rank", "queue", rank_key.desc(), "id"),
+    )
+
+
+class DeadLetter(Base):
+    """Work item that failed too many times (see BaseQueue.retry)."""
+
+    __tablename__ = "work_queue_dead"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    queue = Column(String(100), nullable=False, index=True)
+    payload = Column(JSON, nullable=False)
+    priority = Column(Float, nullable=False, default=0.0)
+    attempts = Column(Integer, nullable=False)
+    last_error = Column(Text, nullable=True)
+    failed_at = Column(DateTime(timezone=True), nullable=False, default=now_eastern)
+
+
+class QueueImport(Base):
+    """Legacy <name>.json queue file already imported (see PostgresQueue.import_items)."""
+
+    __tablename__ = "work_queue_imports"
+
+    source = Column(Text, primary_key=True)
+    imported_at = Column(DateTime(timezone=True), nullable=False, default=now_eastern)
+
+
+class AgentRun(Base):
+    """One BaseAgent.step() run (see BaseAgent.run_step)."""
+
+    __tablename__ = "agent_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    agent = Column(String(100), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=False)
+    duration_ms = Column(Float, nullable=False)
+    items_processed = Column(Integer, nullable=False, default=0)
+    failures = Column(Integer, nullable=False, default=0)
+    api_calls = Column(Integer, nullable=False, default=0)
+    bytes_fetched = Column(BigInteger, nullable=False, default=0)
+    error = Column(Text, nullable=True)  # set when step() raised
+
+    __table_args__ = (
+        Index("ix_agent_runs_agent_started", "agent", "started_at"),
+    )
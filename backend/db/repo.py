@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import os
@@ -14,6 +14,101 @@ SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 def init_db():
     """Create all database tables"""
     Base.metadata.create_all(bind=engine)
+    _migrate()
+
+
+def _migrate():
+    """Add columns introduced after a table was first created (create_all skips existing tables)."""
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS job_fingerprint VARCHAR(64)"))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_jobs_job_fingerprint ON jobs (job_fingerprint)"
+        ))
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS description_minhash BYTEA"))
+        conn.execute(text(
+            "ALTER TABLE jobs ADD COLUMN IF NOT EXISTS canonical_job_id INTEGER "
+            "REFERENCES jobs (id) ON DELETE SET NULL"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_jobs_canonical_job_id ON jobs (canonical_job_id)"
+        ))
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS match_stage VARCHAR(16)"))
+        conn.execute(text("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS neighbors_artifact_id INTEGER"))
+        _backfill_job_fingerprints(conn)
+        _migrate_embedding_versions(conn)
+
+
+def _backfill_job_fingerprints(conn, batch_size: int = 1000):
+    """
+    Fill job_fingerprint for rows inserted before the column existed, so
+    the fetcher's dedupe also knows them. A row whose fingerprint is
+    already taken (a duplicate posting) stays NULL.
+    """
+    from backend.sources.base import job_fingerprint
+
+    taken = {row[0] for row in conn.execute(text(
+        "SELECT job_fingerprint FROM jobs WHERE job_fingerprint IS NOT NULL"
+    ))}
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            text("SELECT id, title, company, description FROM jobs "
+                 "WHERE job_fingerprint IS NULL AND id > :last_id ORDER BY id LIMIT :n"),
+            {"last_id": last_id, "n": batch_size},
+        ).fetchall()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        updates = []
+        for row in rows:
+            fp = job_fingerprint(row.title or "", row.company or "", row.description or "")
+            if fp not in taken:
+                taken.add(fp)
+                updates.append({"id": row.id, "fp": fp})
+        if updates:
+            conn.execute(text("UPDATE jobs SET job_fingerprint = :fp WHERE id = :id"), updates)
+
+
+def _migrate_embedding_versions(conn):
+    """
+    Number artifact embeddings (artifacts.embedding_version). Existing
+    artifacts get their id, which is what job neighbors were computed up
+    to; a trigger gives an artifact a new version when its embedding is
+    updated in place.
+    """
+    conn.execute(text("CREATE SEQUENCE IF NOT EXISTS artifact_embedding_version_seq"))
+    conn.execute(text("ALTER TABLE artifacts ADD COLUMN IF NOT EXISTS embedding_version INTEGER"))
+    conn.execute(text("UPDATE artifacts SET embedding_version = id WHERE embedding_version IS NULL"))
+    # Above every version (or artifact id) a job's neighbors were computed up to
+    conn.execute(text(
+        "SELECT setval('artifact_embedding_version_seq', GREATEST("
+        "(SELECT COALESCE(MAX(GREATEST(id, embedding_version)), 0) FROM artifacts), "
+        "(SELECT COALESCE(MAX(neighbors_artifact_id), 0) FROM jobs), "
+        "(SELECT last_value FROM artifact_embedding_version_seq), 1))"
+    ))
+    conn.execute(text(
+        "ALTER TABLE artifacts ALTER COLUMN embedding_version "
+        "SET DEFAULT nextval('artifact_embedding_version_seq')"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_artifacts_embedding_version ON artifacts (embedding_version)"
+    ))
+    conn.execute(text("""
+        CREATE OR REPLACE FUNCTION bump_artifact_embedding_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.embedding_version := nextval('artifact_embedding_version_seq');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """))
+    conn.execute(text("DROP TRIGGER IF EXISTS artifacts_embedding_version ON artifacts"))
+    conn.execute(text(
+        "CREATE TRIGGER artifacts_embedding_version BEFORE UPDATE OF embedding ON artifacts "
+        "FOR EACH ROW WHEN (OLD.embedding IS DISTINCT FROM NEW.embedding) "
+        "EXECUTE FUNCTION bump_artifact_embedding_version()"
+    ))
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Optional
 from datetime import datetime
 
@@ -13,20 +13,46 @@ class JobBase(BaseModel):
     location: Optional[str] = None
     description: Optional[str] = None
     source_url: str
+    job_fingerprint: Optional[str] = None
 
 # ------------------------------------------------------
 # Schema for creating a job (incoming POST)
 # ------------------------------------------------------
 class JobCreate(JobBase):
-    pass
+    # Scraped postings are cleaned to fit the jobs columns: NUL bytes
+    # (rejected by Postgres text) are dropped and String(255) fields cut
+    @field_validator("title", "company", "location", "description", "source_url", "job_fingerprint")
+    @classmethod
+    def strip_nul(cls, value):
+        return value.replace("\x00", "") if isinstance(value, str) else value
+
+    @field_validator("title", "company", "location")
+    @classmethod
+    def fit_column(cls, value):
+        return value[:255] if isinstance(value, str) else value
+
+# ------------------------------------------------------
+# Bulk insert (job fetcher)
+# ------------------------------------------------------
+class JobBulkCreate(BaseModel):
+    jobs: list[JobCreate]
+
+# ------------------------------------------------------
+# Bulk fingerprint lookup (fetcher dedupe)
+# ------------------------------------------------------
+class FingerprintLookup(BaseModel):
+    fingerprints: list[str]
+    source_urls: list[str] = []
 
 # ------------------------------------------------------
 # Schema for reading a job (outgoing response)
 # ------------------------------------------------------
 class JobRead(JobBase):
     id: int
+    canonical_job_id: int | None = None
     created_at: datetime | None = None
     match_score: float | None = None
+    match_stage: str | None = None
 
     model_config = {
         "from_attributes": True
@@ -6,7 +6,7 @@ from backend.db.models import Artifact
 from dotenv import load_dotenv
 from docx import Document
 from PyPDF2 import PdfReader
-from bs4 import BeautifulSoup
+from backend.utils.html_extract import extract_text
 
 # ------------------------------------------------------
 # Environment setup
@@ -59,8 +59,7 @@ def extract_text_from_pdf(file_path):
 def extract_text_from_html(file_path):
     with open(file_path, "r", encoding="utf-8") as f:
         html_content = f.read()
-    soup = BeautifulSoup(html_content, "html.parser")
-    return clean_text_for_db(soup.get_text(separator="\n", strip=True))
+    return clean_text_for_db(extract_text(html_content))
 
 def extract_text_from_image(file_path):
     with open(file_path, "rb") as f:
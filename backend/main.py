@@ -1,10 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import create_engine, text,TIMESTAMP
 from dotenv import load_dotenv
 
 from backend.db.repo import init_db
-from backend.routes import jobs, search, artifacts, github_generate, debug_ui, profile, persona_resumes
+from backend.routes import jobs, search, artifacts, github_generate, debug_ui, profile, persona_resumes, queues, agents
 import os
 
 # Load environment variables
@@ -12,10 +14,13 @@ load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Responses smaller than this are sent uncompressed (not worth the CPU)
+COMPRESSION_MIN_SIZE = int(os.getenv("API_COMPRESSION_MIN_SIZE", "1024"))
+
 # Initialize DB engine
 engine = create_engine(DATABASE_URL, echo=False, future=True)
 
-app = FastAPI(title="Alfred Backend")
+app = FastAPI(title="Alfred Backend", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,6 +29,21 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+
+# Brotli when available (falls back to gzip for clients that don't send "br"),
+# otherwise plain gzip.
+try:
+    from brotli_asgi import BrotliMiddleware
+
+    app.add_middleware(
+        BrotliMiddleware,
+        quality=4,
+        minimum_size=COMPRESSION_MIN_SIZE,
+        gzip_fallback=True,
+    )
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESSION_MIN_SIZE)
+
 @app.on_event("startup")
 def on_startup():
     init_db()
@@ -35,6 +55,8 @@ app.include_router(github_generate.router)
 app.include_router(profile.router)
 app.include_router(debug_ui.router)
 app.include_router(persona_resumes.router)
+app.include_router(queues.router)
+app.include_router(agents.router)
 @app.get("/health")
 def health_check():
     """Verify API and database connectivity"""
@@ -0,0 +1,185 @@
+# backend/queue/base.py
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+
+class Lease(NamedTuple):
+    """
+    An item handed to a consumer by queue.lease().
+
+    The consumer must ack() it once the work is done, or nack() it to make
+    it available again. If neither happens before the visibility timeout
+    expires (e.g. the worker died), the item is re-delivered.
+    """
+
+    id: Any
+    item: Any
+    token: Optional[str] = None
+    attempts: int = 1
+
+
+# Default visibility timeout for leased items, in seconds.
+# Resume/cover-letter generation can take a few minutes end to end.
+DEFAULT_VISIBILITY_TIMEOUT = 15 * 60
+
+# Queue ordering modes (ALFRED_QUEUE_ORDERING)
+ORDERING_FIFO = "fifo"
+ORDERING_PRIORITY = "priority"
+
+# In priority mode an item's effective priority grows by this much per hour
+# spent waiting, so low-score items still run eventually. With 0.05 a 0.61
+# match overtakes a freshly queued 0.92 match after ~6 hours.
+DEFAULT_AGING_PER_HOUR = 0.05
+
+
+def aged_rank(priority: float, enqueued_at: float, aging_per_hour: float) -> float:
+    """
+    Static sort key for priority-with-aging order: priority - aging *
+    enqueue time (hours). Every waiting item gains the same aging bonus,
+    so ordering by this key DESC equals ordering by priority + aging *
+    hours waited, and the backends can serve it from an index instead of
+    sorting every ready item on each lease.
+    """
+    return float(priority) - float(aging_per_hour) * enqueued_at / 3600.0
+
+# Failed items are retried with exponential backoff (30s, 1m, 2m, ... capped
+# at 1h) and moved to the dead-letter store after this many attempts.
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 30.0
+RETRY_MAX_DELAY = 60 * 60.0
+
+# How often blocking waits re-check for work that becomes due without a
+# notification (delayed nacks, expired leases).
+WAIT_RECHECK_SECONDS = 5.0
+
+
+class PermanentError(Exception):
+    """
+    Raised by a consumer for an item that can never succeed (e.g. a
+    malformed message). The item skips retries and is dead-lettered.
+    """
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before the next delivery of an item that failed `attempts` times."""
+    delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** max(0, attempts - 1))
+    # +/-20% jitter so items that failed together don't retry together
+    return delay * random.uniform(0.8, 1.2)
+
+
+class BaseQueue(ABC):
+    """
+    Interface shared by the JSON, SQLite and Postgres queues.
+
+    Backends implement the primitives; blocking helpers are built on
+    wait_for_items() so consumers sleep only while the queue is empty.
+
+    Items that keep failing end up in a per-queue dead-letter store with
+    their last error, where they can be listed and requeued.
+    """
+
+    # Overridden per instance by the factory (ALFRED_QUEUE_MAX_ATTEMPTS)
+    max_attempts = DEFAULT_MAX_ATTEMPTS
+
+    @abstractmethod
+    def push(self, item: Any, priority: float = 0.0):
+        """Add an item. In priority mode higher priority is consumed first."""
+        pass
+
+    @abstractmethod
+    def pop(self) -> Optional[Any]:
+        pass
+
+    @abstractmethod
+    def pop_many(self, n: int) -> List[Any]:
+        """Retrieve and remove up to n items in one operation."""
+        pass
+
+    @abstractmethod
+    def lease(self, n: int = 1, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT) -> List[Lease]:
+        pass
+
+    @abstractmethod
+    def ack(self, lease: Lease) -> bool:
+        pass
+
+    @abstractmethod
+    def nack(self, lease: Lease, delay: float = 0.0) -> bool:
+        pass
+
+    @abstractmethod
+    def dead_letter(self, lease: Lease, error: str) -> bool:
+        """Move a leased item to the dead-letter store, recording `error`."""
+        pass
+
+    @abstractmethod
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Dead items, newest first, as dicts with
+        id, item, attempts, last_error and failed_at (ISO 8601).
+        """
+        pass
+
+    @abstractmethod
+    def requeue_dead_letters(self, ids: Optional[Sequence[Any]] = None) -> int:
+        """Move dead items (all when ids is None) back onto the queue with a fresh attempt count."""
+        pass
+
+    @abstractmethod
+    def purge_dead_letters(self, ids: Optional[Sequence[Any]] = None) -> int:
+        """Delete dead items (all when ids is None)."""
+        pass
+
+    @abstractmethod
+    def wait_for_items(self, timeout: float) -> bool:
+        """
+        Block until the queue has something to consume or `timeout`
+        seconds pass. Returns True if items are (probably) available.
+        """
+        pass
+
+    def retry(self, lease: Lease, error: str) -> bool:
+        """
+        Record a failed attempt: re-deliver after an exponential backoff, or
+        dead-letter the item once it has used up max_attempts.
+        Returns True if the item will be retried.
+        """
+        if lease.attempts >= self.max_attempts:
+            self.dead_letter(lease, error)
+            return False
+        self.nack(lease, delay=retry_delay(lease.attempts))
+        return True
+
+    def wait_pop(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """Pop the next item, blocking up to `timeout` seconds (None = forever)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            item = self.pop()
+            if item is not None:
+                return item
+            if deadline is None:
+                self.wait_for_items(WAIT_RECHECK_SECONDS)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self.wait_for_items(remaining)
+
+    def wait_lease(
+        self,
+        n: int,
+        timeout: float,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+    ) -> List[Lease]:
+        """Lease up to n items, blocking up to `timeout` seconds for the first one."""
+        deadline = time.monotonic() + timeout
+        while True:
+            leases = self.lease(n, visibility_timeout=visibility_timeout)
+            if leases:
+                return leases
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            self.wait_for_items(remaining)
@@ -0,0 +1,105 @@
+# backend/queue/factory.py
+import hashlib
+import json
+import os
+import threading
+from typing import Dict
+
+from dotenv import load_dotenv
+
+from backend.queue.base import DEFAULT_AGING_PER_HOUR, DEFAULT_MAX_ATTEMPTS, ORDERING_PRIORITY
+from backend.queue.simple_queue import SimpleQueue
+from backend.queue.sqlite_queue import SQLiteQueue
+
+load_dotenv()
+
+# "sqlite" (default), "postgres" (shared work_queue table in DATABASE_URL,
+# for workers on several machines) or "json" (legacy SimpleQueue files)
+QUEUE_BACKEND = os.getenv("ALFRED_QUEUE_BACKEND", "sqlite").lower()
+QUEUE_DB_PATH = os.getenv("ALFRED_QUEUE_DB", "alfred_queues.db")
+
+# "priority" (default): highest score first, with aging; "fifo": arrival order
+QUEUE_ORDERING = os.getenv("ALFRED_QUEUE_ORDERING", ORDERING_PRIORITY).lower()
+QUEUE_AGING_PER_HOUR = float(os.getenv("ALFRED_QUEUE_AGING_PER_HOUR", DEFAULT_AGING_PER_HOUR))
+
+# Failed items are retried up to this many times, then dead-lettered
+QUEUE_MAX_ATTEMPTS = int(os.getenv("ALFRED_QUEUE_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS))
+
+# Queues the agent pipeline uses (exposed by /queues and the dead-letter CLI)
+KNOWN_QUEUES = ("resume_queue", "cover_letter_queue")
+
+_queues: Dict[str, object] = {}
+_lock = threading.Lock()
+
+
+def _import_legacy_json(queue, json_path: str) -> None:
+    """
+    Move items left in an old <name>.json SimpleQueue file into `queue`,
+    then rename the file to <name>.json.imported.
+
+    Every process runs this on its first get_queue(), so the import is
+    recorded in the queue's database under the file's path and content
+    hash, in the same transaction as the pushed items: whichever process
+    gets there first imports, the others (and a restart after a crash
+    before the rename) only rename. An empty file is left untouched.
+    """
+    try:
+        with open(json_path, "rb") as f:
+            raw = f.read()
+        items = json.loads(raw)["queue"]
+    except (OSError, ValueError, KeyError):
+        return
+    if not items:
+        return
+
+    source = f"{os.path.abspath(json_path)}:{hashlib.sha256(raw).hexdigest()}"
+    pairs = [
+        (item, float((item.get("score") if isinstance(item, dict) else None) or 0.0))
+        for item in items
+    ]
+    queue.import_items(source, pairs)
+    try:
+        os.replace(json_path, json_path + ".imported")
+    except FileNotFoundError:
+        pass  # renamed by another process
+
+
+def get_queue(name: str):
+    """
+    Return the shared queue instance for `name` (e.g. "resume_queue").
+
+    Backend is chosen by ALFRED_QUEUE_BACKEND so agents can switch
+    without code changes.
+    """
+    with _lock:
+        if name in _queues:
+            return _queues[name]
+
+        json_path = f"{name}.json"
+        if QUEUE_BACKEND == "json":
+            queue = SimpleQueue(json_path)
+        elif QUEUE_BACKEND == "sqlite":
+            queue = SQLiteQueue(
+                QUEUE_DB_PATH,
+                name=name,
+                ordering=QUEUE_ORDERING,
+                aging_per_hour=QUEUE_AGING_PER_HOUR,
+            )
+            _import_legacy_json(queue, json_path)
+        elif QUEUE_BACKEND == "postgres":
+            # Imported lazily: needs DATABASE_URL at import time
+            from backend.queue.postgres_queue import PostgresQueue
+
+            queue = PostgresQueue(
+                name,
+                ordering=QUEUE_ORDERING,
+                aging_per_hour=QUEUE_AGING_PER_HOUR,
+            )
+            _import_legacy_json(queue, json_path)
+        else:
+            raise ValueError(f"Unknown ALFRED_QUEUE_BACKEND: {QUEUE_BACKEND}")
+
+        queue.max_attempts = max(1, QUEUE_MAX_ATTEMPTS)
+
+        _queues[name] = queue
+        return queue
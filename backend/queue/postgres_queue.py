@@ -0,0 +1,336 @@
+# backend/queue/postgres_queue.py
+import select
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, text
+
+from backend.db.models import DeadLetter, QueueImport, QueueItem
+from backend.db.repo import engine
+from backend.queue.base import (
+    BaseQueue,
+    Lease,
+    DEFAULT_AGING_PER_HOUR,
+    DEFAULT_VISIBILITY_TIMEOUT,
+    ORDERING_PRIORITY,
+    WAIT_RECHECK_SECONDS,
+    aged_rank,
+)
+
+# LISTEN/NOTIFY channel; the payload is the queue name
+NOTIFY_CHANNEL = "work_queue"
+
+
+class PostgresQueue(BaseQueue):
+    """
+    Work queue stored in the `work_queue` table.
+
+    Built for several workers on different machines sharing one database:
+      - lease(n) claims rows with SELECT ... FOR UPDATE SKIP LOCKED, so
+        concurrent consumers never block on or double-claim the same item
+      - a leased item is hidden until its visibility timeout expires; if the
+        worker dies before ack(), the item is delivered again
+      - in "priority" mode items are served by priority plus an aging bonus
+        for time spent waiting, FIFO among equals, read in order from the
+        rank_key index (see aged_rank); "fifo" mode ignores priority
+      - push() sends NOTIFY so wait_for_items() wakes consumers immediately
+      - items that fail too often move to `work_queue_dead`
+
+    Also implements the SimpleQueue API (push/pop/peek/size/clear) so
+    existing callers can switch with ALFRED_QUEUE_BACKEND=postgres.
+    """
+
+    # Rows a consumer may take right now: due and not under a live lease
+    _AVAILABLE = (
+        "queue = :queue AND available_at <= now() "
+        "AND (leased_until IS NULL OR leased_until < now())"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        ordering: str = ORDERING_PRIORITY,
+        aging_per_hour: float = DEFAULT_AGING_PER_HOUR,
+    ):
+        self.name = name
+        self.aging_per_hour = float(aging_per_hour)
+        self._rank = "rank_key" if ordering == ORDERING_PRIORITY else "0.0"
+        QueueItem.__table__.create(bind=engine, checkfirst=True)
+        DeadLetter.__table__.create(bind=engine, checkfirst=True)
+        QueueImport.__table__.create(bind=engine, checkfirst=True)
+        with engine.begin() as conn:
+            # Tables created before rank_key existed
+            conn.execute(text("ALTER TABLE work_queue ADD COLUMN IF NOT EXISTS rank_key DOUBLE PRECISION"))
+            conn.execute(
+                text("UPDATE work_queue SET rank_key = priority - :aging * EXTRACT(EPOCH FROM enqueued_at) / 3600.0 "
+                     "WHERE rank_key IS NULL"),
+                {"aging": self.aging_per_hour},
+            )
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_work_queue_rank ON work_queue (queue, rank_key DESC, id)"
+            ))
+
+    def _row(self, item: Any, priority: float, now: float) -> Dict[str, Any]:
+        """work_queue values for a new item."""
+        return {
+            "queue": self.name,
+            "payload": item,
+            "priority": float(priority),
+            "rank_key": aged_rank(priority, now, self.aging_per_hour),
+            "attempts": 0,
+        }
+
+    # --------------------------
+    # Leasing API
+    # --------------------------
+    def push(self, item: Any, priority: float = 0.0):
+        """Add item to the queue. In priority mode higher priority is leased first."""
+        with engine.begin() as conn:
+            conn.execute(QueueItem.__table__.insert().values(**self._row(item, priority, time.time())))
+            self._notify(conn)
+
+    def import_items(self, source: str, items: Sequence[Tuple[Any, float]]) -> bool:
+        """
+        Push (item, priority) pairs and record `source` as imported, in one
+        transaction. False (nothing pushed) if `source` was imported before;
+        a concurrent import of the same source waits on its primary key.
+        """
+        with engine.begin() as conn:
+            claimed = conn.execute(
+                text("INSERT INTO work_queue_imports (source, imported_at) VALUES (:source, now()) "
+                     "ON CONFLICT (source) DO NOTHING"),
+                {"source": source},
+            ).rowcount
+            if not claimed:
+                return False
+            if items:
+                now = time.time()
+                conn.execute(QueueItem.__table__.insert(), [self._row(item, priority, now) for item, priority in items])
+                self._notify(conn)
+        return True
+
+    def lease(self, n: int = 1, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT) -> List[Lease]:
+        """Claim up to n items for visibility_timeout seconds."""
+        token = uuid.uuid4().hex
+        sql = text(f"""
+            WITH picked AS (
+                SELECT id, {self._rank} AS rank FROM work_queue
+                WHERE {self._AVAILABLE}
+                ORDER BY rank DESC, id
+                LIMIT :n
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE work_queue w
+            SET leased_until = now() + make_interval(secs => :timeout),
+                lease_token = :token,
+                attempts = w.attempts + 1
+            FROM picked
+            WHERE w.id = picked.id
+            RETURNING w.id, w.payload, w.attempts, picked.rank;
+        """)
+        with engine.begin() as conn:
+            rows = conn.execute(
+                sql,
+                {"queue": self.name, "timeout": float(visibility_timeout), "token": token, "n": n},
+            ).fetchall()
+
+        rows = sorted(rows, key=lambda r: (-r.rank, r.id))
+        return [Lease(id=r.id, item=r.payload, token=token, attempts=r.attempts) for r in rows]
+
+    def ack(self, lease: Lease) -> bool:
+        """Delete a finished item. False if the lease had already expired and been re-leased."""
+        with engine.begin() as conn:
+            result = conn.execute(
+                text("DELETE FROM work_queue WHERE id = :id AND lease_token = :token"),
+                {"id": lease.id, "token": lease.token},
+            )
+        return result.rowcount == 1
+
+    def nack(self, lease: Lease, delay: float = 0.0) -> bool:
+        """Release an item so it can be leased again after `delay` seconds."""
+        with engine.begin() as conn:
+            result = conn.execute(
+                text("""
+                    UPDATE work_queue
+                    SET leased_until = NULL,
+                        lease_token = NULL,
+                        available_at = now() + make_interval(secs => :delay)
+                    WHERE id = :id AND lease_token = :token
+                """),
+                {"id": lease.id, "token": lease.token, "delay": float(delay)},
+            )
+            if result.rowcount == 1 and delay <= 0:
+                self._notify(conn)
+        return result.rowcount == 1
+
+    def dead_letter(self, lease: Lease, error: str) -> bool:
+        """Move a leased item to work_queue_dead. False if the lease is no longer held."""
+        with engine.begin() as conn:
+            result = conn.execute(
+                text("""
+                    WITH dead AS (
+                        DELETE FROM work_queue
+                        WHERE id = :id AND lease_token = :token
+                        RETURNING queue, payload, priority
+                    )
+                    INSERT INTO work_queue_dead (queue, payload, priority, attempts, last_error, failed_at)
+                    SELECT queue, payload, priority, :attempts, :error, now() FROM dead
+                """),
+                {"id": lease.id, "token": lease.token, "attempts": lease.attempts, "error": str(error)},
+            )
+        return result.rowcount == 1
+
+    def dead_letters(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with engine.connect() as conn:
+            rows = conn.execute(
+                text("""
+                    SELECT id, payload, attempts, last_error, failed_at FROM work_queue_dead
+                    WHERE queue = :queue ORDER BY id DESC LIMIT :limit
+                """),
+                {"queue": self.name, "limit": limit},
+            ).fetchall()
+        return [
+            {
+                "id": r.id,
+                "item": r.payload,
+                "attempts": r.attempts,
+                "last_error": r.last_error,
+                "failed_at": r.failed_at.isoformat(),
+            }
+            for r in rows
+        ]
+
+    def requeue_dead_letters(self, ids: Optional[Sequence[int]] = None) -> int:
+        sql, params = self._dead_filter(
+            """
+            WITH revived AS (
+                DELETE FROM work_queue_dead WHERE queue = :queue {ids}
+                RETURNING id, queue, payload, priority
+            )
+            INSERT INTO work_queue (queue, payload, priority, rank_key, attempts, enqueued_at, available_at)
+            SELECT queue, payload, priority, priority - :aging * EXTRACT(EPOCH FROM now()) / 3600.0,
+                   0, now(), now()
+            FROM revived ORDER BY id
+            """,
+            ids,
+        )
+        params["aging"] = self.aging_per_hour
+        with engine.begin() as conn:
+            result = conn.execute(sql, params)
+            if result.rowcount:
+                self._notify(conn)
+        return result.rowcount
+
+    def purge_dead_letters(self, ids: Optional[Sequence[int]] = None) -> int:
+        sql, params = self._dead_filter(
+            "DELETE FROM work_queue_dead WHERE queue = :queue {ids}", ids
+        )
+        with engine.begin() as conn:
+            return conn.execute(sql, params).rowcount
+
+    def wait_for_items(self, timeout: float) -> bool:
+        """Block on LISTEN until a push/nack notifies this queue, or timeout."""
+        deadline = time.monotonic() + timeout
+        raw = engine.raw_connection()
+        try:
+            dbapi_conn = raw.driver_connection
+            dbapi_conn.autocommit = True
+            cur = dbapi_conn.cursor()
+            cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            try:
+                while True:
+                    # Checked after LISTEN so a push in between isn't missed
+                    if self._has_available(cur):
+                        return True
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    # Wake at least every few seconds for delayed/expired items
+                    readable, _, _ = select.select(
+                        [dbapi_conn], [], [], min(remaining, WAIT_RECHECK_SECONDS)
+                    )
+                    if readable:
+                        dbapi_conn.poll()
+                        dbapi_conn.notifies.clear()
+            finally:
+                cur.execute(f"UNLISTEN {NOTIFY_CHANNEL}")
+                dbapi_conn.autocommit = False
+        finally:
+            raw.close()
+
+    # --------------------------
+    # Internal helpers
+    # --------------------------
+    def _notify(self, conn):
+        conn.execute(text("SELECT pg_notify(:channel, :queue)"), {"channel": NOTIFY_CHANNEL, "queue": self.name})
+
+    def _dead_filter(self, template: str, ids: Optional[Sequence[int]]):
+        """Fill the {ids} slot of a dead-letter statement (None = every item)."""
+        params: Dict[str, Any] = {"queue": self.name}
+        if ids is None:
+            return text(template.format(ids="")), params
+        params["ids"] = [int(i) for i in ids]
+        sql = text(template.format(ids="AND id IN :ids")).bindparams(bindparam("ids", expanding=True))
+        return sql, params
+
+    def _has_available(self, cur) -> bool:
+        cur.execute(
+            "SELECT EXISTS (SELECT 1 FROM work_queue WHERE "
+            "queue = %(queue)s AND available_at <= now() "
+            "AND (leased_until IS NULL OR leased_until < now()))",
+            {"queue": self.name},
+        )
+        return cur.fetchone()[0]
+
+    # --------------------------
+    # SimpleQueue-compatible API
+    # --------------------------
+    def pop(self) -> Optional[Any]:
+        """Retrieve and remove the next item. Returns None if empty."""
+        items = self.pop_many(1)
+        return items[0] if items else None
+
+    def pop_many(self, n: int) -> List[Any]:
+        """Retrieve and remove up to n items in one statement."""
+        sql = text(f"""
+            WITH picked AS (
+                SELECT id, {self._rank} AS rank FROM work_queue
+                WHERE {self._AVAILABLE}
+                ORDER BY rank DESC, id
+                LIMIT :n
+                FOR UPDATE SKIP LOCKED
+            )
+            DELETE FROM work_queue w
+            USING picked
+            WHERE w.id = picked.id
+            RETURNING w.id, w.payload, picked.rank;
+        """)
+        with engine.begin() as conn:
+            rows = conn.execute(sql, {"queue": self.name, "n": n}).fetchall()
+        rows = sorted(rows, key=lambda r: (-r.rank, r.id))
+        return [r.payload for r in rows]
+
+    def peek(self) -> Optional[Any]:
+        """Look at next item without consuming."""
+        sql = text(f"""
+            SELECT payload, {self._rank} AS rank FROM work_queue
+            WHERE {self._AVAILABLE}
+            ORDER BY rank DESC, id
+            LIMIT 1;
+        """)
+        with engine.connect() as conn:
+            row = conn.execute(sql, {"queue": self.name}).fetchone()
+        return row.payload if row else None
+
+    def size(self) -> int:
+        """Number of items waiting to be leased (excludes in-flight leases)."""
+        with engine.connect() as conn:
+            return conn.execute(
+                text(f"SELECT COUNT(*) FROM work_queue WHERE {self._AVAILABLE}"),
+                {"queue": self.name},
+            ).scalar_one()
+
+    def clear(self):
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM work_queue WHERE queue = :queue"), {"queue": self.name})
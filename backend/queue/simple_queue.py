@@ -1,16 +1,38 @@
 import json
 import threading
 import os
+import time
+import uuid
+from datetime import datetime, timezone
 
-class SimpleQueue:
+from backend.queue.base import BaseQueue, Lease, DEFAULT_VISIBILITY_TIMEOUT, WAIT_RECHECK_SECONDS
+
+# How often wait_for_items() stats the queue file
+POLL_SECONDS = 0.25
+
+
+class SimpleQueue(BaseQueue):
     """
     A lightweight thread-safe JSON-backed FIFO queue.
     Perfect for agent-to-agent task passing.
+
+    Always FIFO: `priority` is accepted for API parity and ignored.
+
+    lease()/ack()/nack() are supported for API parity with the SQLite and
+    Postgres queues, but leases live in memory only: an item leased by a
+    process that dies is lost, as with pop(). Attempt counts are kept in
+    memory too, as are retry delays: a nacked item is skipped by this
+    process's lease() until its delay has passed. Dead letters go to
+    `<name>.dead.json` next to the queue file.
     """
 
     def __init__(self, path: str):
         self.path = path
         self.lock = threading.Lock()
+        self._leased = {}
+        self._attempts = {}
+        self._not_before = {}
+        self.dead_path = os.path.splitext(path)[0] + ".dead.json"
 
         if not os.path.exists(path):
             with open(path, "w") as f:
@@ -27,10 +49,27 @@ class SimpleQueue:
         with open(self.path, "w") as f:
             json.dump({"queue": q}, f, indent=2)
 
+    @staticmethod
+    def _key(item):
+        return json.dumps(item, sort_keys=True)
+
+    def _ready(self, item, now):
+        return self._not_before.get(self._key(item), 0.0) <= now
+
+    def _read_dead(self):
+        if not os.path.exists(self.dead_path):
+            return []
+        with open(self.dead_path, "r") as f:
+            return json.load(f)["dead"]
+
+    def _write_dead(self, dead):
+        with open(self.dead_path, "w") as f:
+            json.dump({"dead": dead}, f, indent=2)
+
     # --------------------------
     # Public API
     # --------------------------
-    def push(self, item):
+    def push(self, item, priority=0.0):
         """Add item to the back of queue."""
         with self.lock:
             q = self._read()
@@ -47,6 +86,16 @@ class SimpleQueue:
             self._write(q)
             return item
 
+    def pop_many(self, n):
+        """Retrieve and remove up to n items with a single rewrite."""
+        with self.lock:
+            q = self._read()
+            if not q:
+                return []
+            taken, rest = q[:n], q[n:]
+            self._write(rest)
+            return taken
+
     def peek(self):
         """Look at next item without consuming."""
         with self.lock:
@@ -60,3 +109,115 @@ class SimpleQueue:
     def clear(self):
         with self.lock:
             self._write([])
+
+    def lease(self, n=1, visibility_timeout=DEFAULT_VISIBILITY_TIMEOUT):
+        """Take up to n items not waiting out a retry delay; they are re-pushed on nack()."""
+        with self.lock:
+            q = self._read()
+            now = time.time()
+            taken, rest = [], []
+            for item in q:
+                if len(taken) < n and self._ready(item, now):
+                    taken.append(item)
+                else:
+                    rest.append(item)
+            if taken:
+                self._write(rest)
+            leases = []
+            for item in taken:
+                key = self._key(item)
+                self._attempts[key] = self._attempts.get(key, 0) + 1
+                lease = Lease(id=uuid.uuid4().hex, item=item, attempts=self._attempts[key])
+                self._leased[lease.id] = item
+                leases.append(lease)
+            return leases
+
+    def ack(self, lease):
+        with self.lock:
+            item = self._leased.pop(lease.id, None)
+            if item is None:
+                return False
+            self._attempts.pop(self._key(item), None)
+            self._not_before.pop(self._key(item), None)
+            return True
+
+    def nack(self, lease, delay=0.0):
+        with self.lock:
+            item = self._leased.pop(lease.id, None)
+            if item is None:
+                return False
+            if delay > 0:
+                self._not_before[self._key(item)] = time.time() + delay
+            else:
+                self._not_before.pop(self._key(item), None)
+            q = self._read()
+            q.append(item)
+            self._write(q)
+            return True
+
+    def dead_letter(self, lease, error):
+        with self.lock:
+            item = self._leased.pop(lease.id, None)
+            if item is None:
+                return False
+            self._attempts.pop(self._key(item), None)
+            self._not_before.pop(self._key(item), None)
+            dead = self._read_dead()
+            dead.append({
+                "id": max((d["id"] for d in dead), default=0) + 1,
+                "item": item,
+                "attempts": lease.attempts,
+                "last_error": str(error),
+                "failed_at": datetime.now(timezone.utc).isoformat(),
+            })
+            self._write_dead(dead)
+            return True
+
+    def dead_letters(self, limit=100):
+        with self.lock:
+            return list(reversed(self._read_dead()))[:limit]
+
+    def requeue_dead_letters(self, ids=None):
+        with self.lock:
+            dead = self._read_dead()
+            wanted = None if ids is None else {int(i) for i in ids}
+            revived = [d for d in dead if wanted is None or d["id"] in wanted]
+            if not revived:
+                return 0
+            q = self._read()
+            q.extend(d["item"] for d in revived)
+            self._write(q)
+            self._write_dead([d for d in dead if d not in revived])
+            return len(revived)
+
+    def purge_dead_letters(self, ids=None):
+        with self.lock:
+            dead = self._read_dead()
+            wanted = None if ids is None else {int(i) for i in ids}
+            kept = [d for d in dead if wanted is not None and d["id"] not in wanted]
+            self._write_dead(kept)
+            return len(dead) - len(kept)
+
+    def _ready_count(self):
+        with self.lock:
+            now = time.time()
+            return sum(1 for item in self._read() if self._ready(item, now))
+
+    def wait_for_items(self, timeout):
+        """Block until the queue file has a leasable item (watched via its mtime)."""
+        deadline = time.monotonic() + timeout
+        last_mtime = None
+        last_check = 0.0
+        while True:
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            now = time.monotonic()
+            if mtime != last_mtime or now - last_check >= WAIT_RECHECK_SECONDS:
+                last_mtime, last_check = mtime, now
+                if self._ready_count() > 0:
+                    return True
+            if now >= deadline:
+                return False
+            time.sleep(min(POLL_SECONDS, deadline - now))
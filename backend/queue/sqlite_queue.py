@@ -0,0 +1,353 @@
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, List, Sequence, Tuple
+
+from backend.queue.base import (
+    BaseQueue,
+    Lease,
+    DEFAULT_AGING_PER_HOUR,
+    DEFAULT_VISIBILITY_TIMEOUT,
+    ORDERING_PRIORITY,
+    WAIT_RECHECK_SECONDS,
+    aged_rank,
+)
+
+# How often wait_for_items() checks the database for new commits
+POLL_SECONDS = 0.25
+
+
+class SQLiteQueue(BaseQueue):
+    """
+    Durable queue stored in a SQLite database in WAL mode.
+
+    Drop-in replacement for SimpleQueue:
+      - push/pop touch a single row (no full-file rewrite)
+      - safe across threads *and* processes (SQLite file locking)
+      - each operation is a transaction, so a crash mid-write never
+        leaves a half-written queue behind
+
+    Several named queues can share one database file.
+
+    Ordering is FIFO, or in "priority" mode by priority plus an aging
+    bonus for time spent waiting (see DEFAULT_AGING_PER_HOUR), read in
+    order from an index on the rank_key column (see aged_rank).
+
+    lease()/ack()/nack() give at-least-once delivery: a leased item that is
+    not acked before its visibility timeout is handed out again. Items that
+    fail too often move to the dead_letters table.
+    """
+
+    # Columns added after the first release of this table
+    _EXTRA_COLUMNS = {
+        "attempts": "INTEGER NOT NULL DEFAULT 0",
+        "leased_until": "REAL",
+        "lease_token": "TEXT",
+        "priority": "REAL NOT NULL DEFAULT 0",
+        "rank_key": "REAL",
+    }
+
+    _INSERT = "INSERT INTO queue_items (queue, payload, enqueued_at, priority, rank_key) VALUES (?, ?, ?, ?, ?)"
+
+    # Rows a consumer may take right now (not under a live lease)
+    _AVAILABLE = "queue = ? AND (leased_until IS NULL OR leased_until < ?)"
+
+    def __init__(
+        self,
+        path: str,
+        name: str = "default",
+        ordering: str = ORDERING_PRIORITY,
+        aging_per_hour: float = DEFAULT_AGING_PER_HOUR,
+    ):
+        self.path = path
+        self.name = name
+        self.aging_per_hour = float(aging_per_hour)
+        self._order = "rank_key DESC, id" if ordering == ORDERING_PRIORITY else "id"
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS queue_items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    queue TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    enqueued_at REAL NOT NULL
+                )
+                """
+            )
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(queue_items)")}
+            for column, ddl in self._EXTRA_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE queue_items ADD COLUMN {column} {ddl}")
+            # Rows queued before rank_key existed
+            conn.execute(
+                "UPDATE queue_items SET rank_key = priority - ? * enqueued_at / 3600.0 "
+                "WHERE rank_key IS NULL",
+                (self.aging_per_hour,),
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_queue_items_queue_id "
+                "ON queue_items (queue, id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_queue_items_queue_rank "
+                "ON queue_items (queue, rank_key DESC, id)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS legacy_imports (
+                    source TEXT PRIMARY KEY,
+                    imported_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS dead_letters (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    queue TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    priority REAL NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL,
+                    last_error TEXT,
+                    failed_at REAL NOT NULL
+                )
+                """
+            )
+
+    # --------------------------
+    # Internal helpers
+    # --------------------------
+    @staticmethod
+    def _id_filter(ids):
+        """SQL fragment and params restricting a statement to `ids` (None = all)."""
+        if ids is None:
+            return "", ()
+        ids = list(ids)
+        return f" AND id IN ({', '.join('?' * len(ids))})", tuple(ids)
+
+    def _row(self, item, priority, now):
+        """queue_items values for _INSERT."""
+        return (self.name, json.dumps(item), now, float(priority), aged_rank(priority, now, self.aging_per_hour))
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per operation keeps this safe to use from
+        # any thread and from forked processes.
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    # --------------------------
+    # Public API
+    # --------------------------
+    def push(self, item, priority=0.0):
+        """Add item to the queue."""
+        with self._connect() as conn:
+            conn.execute(self._INSERT, self._row(item, priority, time.time()))
+
+    def import_items(self, source: str, items: Sequence[Tuple[Any, float]]) -> bool:
+        """
+        Push (item, priority) pairs and record `source` as imported, in one
+        write transaction. False (nothing pushed) if `source` was imported
+        before, by this or any other process.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                seen = conn.execute("SELECT 1 FROM legacy_imports WHERE source = ?", (source,)).fetchone()
+                if seen is None:
+                    conn.executemany(self._INSERT, [self._row(item, priority, now) for item, priority in items])
+                    conn.execute("INSERT INTO legacy_imports (source, imported_at) VALUES (?, ?)", (source, now))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return seen is None
+
+    def pop(self):
+        """Retrieve and remove the next item. Returns None if empty."""
+        items = self.pop_many(1)
+        return items[0] if items else None
+
+    def pop_many(self, n):
+        """Retrieve and remove up to n items in one transaction."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    f"SELECT id, payload FROM queue_items WHERE {self._AVAILABLE} ORDER BY {self._order} LIMIT ?",
+                    (self.name, time.time(), n),
+                ).fetchall()
+                conn.executemany(
+                    "DELETE FROM queue_items WHERE id = ?", [(row[0],) for row in rows]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return [json.loads(row[1]) for row in rows]
+
+    def peek(self):
+        """Look at next item without consuming."""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT payload FROM queue_items WHERE {self._AVAILABLE} ORDER BY {self._order} LIMIT 1",
+                (self.name, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def size(self):
+        """Number of items waiting to be consumed (excludes in-flight leases)."""
+        with self._connect() as conn:
+            return conn.execute(
+                f"SELECT COUNT(*) FROM queue_items WHERE {self._AVAILABLE}",
+                (self.name, time.time()),
+            ).fetchone()[0]
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM queue_items WHERE queue = ?", (self.name,))
+
+    def lease(self, n: int = 1, visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT) -> List[Lease]:
+        """Claim up to n items for visibility_timeout seconds."""
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    f"SELECT id, payload, attempts FROM queue_items WHERE {self._AVAILABLE} "
+                    f"ORDER BY {self._order} LIMIT ?",
+                    (self.name, now, n),
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE queue_items SET leased_until = ?, lease_token = ?, "
+                    "attempts = attempts + 1 WHERE id = ?",
+                    [(now + visibility_timeout, token, row[0]) for row in rows],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return [
+            Lease(id=row[0], item=json.loads(row[1]), token=token, attempts=row[2] + 1)
+            for row in rows
+        ]
+
+    def ack(self, lease: Lease) -> bool:
+        """Delete a finished item. False if the lease had already expired and been re-leased."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM queue_items WHERE id = ? AND lease_token = ?",
+                (lease.id, lease.token),
+            )
+        return cur.rowcount == 1
+
+    def nack(self, lease: Lease, delay: float = 0.0) -> bool:
+        """Release an item so it can be leased again after `delay` seconds."""
+        # A future leased_until doubles as "not before" for delayed re-delivery
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE queue_items SET leased_until = ?, lease_token = NULL "
+                "WHERE id = ? AND lease_token = ?",
+                (time.time() + delay if delay > 0 else None, lease.id, lease.token),
+            )
+        return cur.rowcount == 1
+
+    def dead_letter(self, lease: Lease, error: str) -> bool:
+        """Move a leased item to dead_letters. False if the lease is no longer held."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT payload, priority FROM queue_items WHERE id = ? AND lease_token = ?",
+                    (lease.id, lease.token),
+                ).fetchone()
+                if row is not None:
+                    conn.execute("DELETE FROM queue_items WHERE id = ?", (lease.id,))
+                    conn.execute(
+                        "INSERT INTO dead_letters (queue, payload, priority, attempts, last_error, failed_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (self.name, row[0], row[1], lease.attempts, str(error), time.time()),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return row is not None
+
+    def dead_letters(self, limit=100):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, payload, attempts, last_error, failed_at FROM dead_letters "
+                "WHERE queue = ? ORDER BY id DESC LIMIT ?",
+                (self.name, limit),
+            ).fetchall()
+        return [
+            {
+                "id": row[0],
+                "item": json.loads(row[1]),
+                "attempts": row[2],
+                "last_error": row[3],
+                "failed_at": datetime.fromtimestamp(row[4], tz=timezone.utc).isoformat(),
+            }
+            for row in rows
+        ]
+
+    def requeue_dead_letters(self, ids=None):
+        where, params = self._id_filter(ids)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                cur = conn.execute(
+                    "INSERT INTO queue_items (queue, payload, enqueued_at, priority, rank_key) "
+                    "SELECT queue, payload, ?, priority, priority - ? FROM dead_letters "
+                    f"WHERE queue = ?{where} ORDER BY id",
+                    (now, self.aging_per_hour * now / 3600.0, self.name) + params,
+                )
+                conn.execute(f"DELETE FROM dead_letters WHERE queue = ?{where}", (self.name,) + params)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return cur.rowcount
+
+    def purge_dead_letters(self, ids=None):
+        where, params = self._id_filter(ids)
+        with self._connect() as conn:
+            cur = conn.execute(f"DELETE FROM dead_letters WHERE queue = ?{where}", (self.name,) + params)
+        return cur.rowcount
+
+    def wait_for_items(self, timeout):
+        """
+        Block until items are available. Polls PRAGMA data_version, which
+        changes when another connection commits and costs no table reads.
+        """
+        deadline = time.monotonic() + timeout
+        with self._connect() as conn:
+            last_version = None
+            last_check = 0.0
+            while True:
+                version = conn.execute("PRAGMA data_version").fetchone()[0]
+                now = time.monotonic()
+                if version != last_version or now - last_check >= WAIT_RECHECK_SECONDS:
+                    last_version, last_check = version, now
+                    row = conn.execute(
+                        f"SELECT 1 FROM queue_items WHERE {self._AVAILABLE} LIMIT 1",
+                        (self.name, time.time()),
+                    ).fetchone()
+                    if row is not None:
+                        return True
+                if now >= deadline:
+                    return False
+                time.sleep(min(POLL_SECONDS, deadline - now))
@@ -0,0 +1,138 @@
+# backend/routes/agents.py
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.db.models import AgentRun
+from backend.db.repo import get_db
+
+router = APIRouter(prefix="/agents", tags=["Agents"])
+
+
+def _duration_stats():
+    return (
+        func.percentile_cont(0.5).within_group(AgentRun.duration_ms).label("p50_ms"),
+        func.percentile_cont(0.95).within_group(AgentRun.duration_ms).label("p95_ms"),
+    )
+
+
+def _per_minute(items, duration_ms) -> Optional[float]:
+    """Items handled per minute of step run time."""
+    if not duration_ms:
+        return None
+    return round(items * 60000.0 / duration_ms, 3)
+
+
+def _ms(value) -> Optional[float]:
+    return None if value is None else round(float(value), 1)
+
+
+@router.get("/runs")
+def agent_runs(
+    agent: Optional[str] = None,
+    hours: int = Query(default=24 * 7, ge=1, le=24 * 90),
+    bucket: Literal["hour", "day"] = "hour",
+    limit: int = Query(default=20, ge=0, le=500),
+    db: Session = Depends(get_db),
+):
+    """
+    Step run history from agent_runs over the last `hours`:
+      - summary: per agent run count, p50/p95/max duration, items,
+        failures, API calls, bytes fetched and throughput
+      - trend: the same per `bucket` (hour/day), oldest first
+      - runs: the `limit` most recent runs
+    """
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    where = [AgentRun.started_at >= since]
+    if agent:
+        where.append(AgentRun.agent == agent)
+
+    summary_rows = db.execute(
+        select(
+            AgentRun.agent,
+            func.count().label("runs"),
+            func.count(AgentRun.error).label("errored_runs"),
+            func.sum(AgentRun.items_processed).label("items"),
+            func.sum(AgentRun.failures).label("failures"),
+            func.sum(AgentRun.api_calls).label("api_calls"),
+            func.sum(AgentRun.bytes_fetched).label("bytes_fetched"),
+            func.sum(AgentRun.duration_ms).label("total_ms"),
+            func.max(AgentRun.duration_ms).label("max_ms"),
+            *_duration_stats(),
+        )
+        .where(*where)
+        .group_by(AgentRun.agent)
+        .order_by(AgentRun.agent)
+    ).all()
+
+    period = func.date_trunc(bucket, AgentRun.started_at).label("bucket")
+    trend_rows = db.execute(
+        select(
+            AgentRun.agent,
+            period,
+            func.count().label("runs"),
+            func.sum(AgentRun.items_processed).label("items"),
+            func.sum(AgentRun.failures).label("failures"),
+            func.sum(AgentRun.duration_ms).label("total_ms"),
+            *_duration_stats(),
+        )
+        .where(*where)
+        .group_by(AgentRun.agent, period)
+        .order_by(period, AgentRun.agent)
+    ).all()
+
+    recent = db.execute(
+        select(AgentRun).where(*where).order_by(AgentRun.started_at.desc()).limit(limit)
+    ).scalars().all()
+
+    return {
+        "since": since.isoformat(),
+        "summary": [
+            {
+                "agent": r.agent,
+                "runs": r.runs,
+                "errored_runs": r.errored_runs,
+                "p50_ms": _ms(r.p50_ms),
+                "p95_ms": _ms(r.p95_ms),
+                "max_ms": _ms(r.max_ms),
+                "items": int(r.items or 0),
+                "failures": int(r.failures or 0),
+                "items_per_run": round((r.items or 0) / r.runs, 2),
+                "items_per_minute": _per_minute(r.items or 0, r.total_ms),
+                "api_calls": int(r.api_calls or 0),
+                "bytes_fetched": int(r.bytes_fetched or 0),
+            }
+            for r in summary_rows
+        ],
+        "trend": [
+            {
+                "agent": r.agent,
+                "bucket": r.bucket.isoformat(),
+                "runs": r.runs,
+                "items": int(r.items or 0),
+                "failures": int(r.failures or 0),
+                "p50_ms": _ms(r.p50_ms),
+                "p95_ms": _ms(r.p95_ms),
+                "items_per_minute": _per_minute(r.items or 0, r.total_ms),
+            }
+            for r in trend_rows
+        ],
+        "runs": [
+            {
+                "id": run.id,
+                "agent": run.agent,
+                "started_at": run.started_at.isoformat(),
+                "finished_at": run.finished_at.isoformat(),
+                "duration_ms": _ms(run.duration_ms),
+                "items_processed": run.items_processed,
+                "failures": run.failures,
+                "api_calls": run.api_calls,
+                "bytes_fetched": run.bytes_fetched,
+                "error": run.error,
+            }
+            for run in recent
+        ],
+    }
@@ -1,7 +1,7 @@
 # backend/routes/jobs.py
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy import text
 
 import os
@@ -13,10 +13,10 @@ from openai import OpenAI
 
 from backend.db.models import Job, GeneratedArtifact
 from backend.db.repo import SessionLocal
-from backend.db.schemas import JobCreate, JobRead
+from backend.db.schemas import FingerprintLookup, JobBulkCreate, JobCreate, JobRead
 
+from backend.utils import matching, near_duplicate, neighbors
 from backend.utils.text_cleaner import clean_text
-from backend.utils.embedding import embed_text, search_similar_artifacts
 from backend.utils.skills_extractor_llm import extract_skills_llm
 from backend.profile.utils import load_profile
 from backend.agents.base import AgentConfig
@@ -83,23 +83,117 @@ class JobCreateResponse(BaseModel):
     duplicate: bool = False
 
 
-@router.post("/", response_model=JobCreateResponse)
-def create_job(job: JobCreate, db: Session = Depends(get_db)):
+class JobBulkCreateResult(BaseModel):
+    job: JobRead | None = None
+    duplicate: bool = False
+    # Set when this job could not be stored; the rest of the batch still is
+    error: str | None = None
+
+
+class JobBulkCreateResponse(BaseModel):
+    results: List[JobBulkCreateResult]
+
 
-    db_job = Job(**job.dict())
+# Postgres unique_violation
+UNIQUE_VIOLATION = "23505"
 
+
+def _duplicate_of(db: Session, job: JobCreate, error: IntegrityError) -> Job | None:
+    """The stored job `job` collided with on source_url or job_fingerprint, if that's what `error` is."""
+    orig = error.orig
+    if getattr(orig, "pgcode", None) != UNIQUE_VIOLATION:
+        return None
+    constraint = getattr(getattr(orig, "diag", None), "constraint_name", None) or ""
+    if "source_url" in constraint:
+        return db.query(Job).filter(Job.source_url == job.source_url).first()
+    if "fingerprint" in constraint and job.job_fingerprint:
+        return db.query(Job).filter(Job.job_fingerprint == job.job_fingerprint).first()
+    return None
+
+
+def _insert_job(db: Session, job: JobCreate) -> tuple[Job | None, bool]:
+    """
+    Insert one job inside a savepoint, linking near-duplicates of stored
+    jobs via canonical_job_id. Returns (job, duplicate); on a duplicate
+    (same source_url or job_fingerprint as a stored job) the stored job.
+    The caller commits.
+
+    Any other database error, including other constraint violations,
+    rolls back only this job's savepoint and is re-raised, so the session
+    stays usable for the rest of a batch.
+    """
+    db_job = Job(**job.model_dump())
     try:
-        db.add(db_job)
-        db.commit()
-        db.refresh(db_job)
-        return {"job": db_job, "duplicate": False}
+        with db.begin_nested():
+            db.add(db_job)
+            db.flush()
+            near_duplicate.index_job(db, db_job)
+        return db_job, False
+    except IntegrityError as e:
+        existing = _duplicate_of(db, job, e)
+        if existing is None:
+            raise
+        return existing, True
+
 
-    except IntegrityError:
+@router.post("/", response_model=JobCreateResponse)
+def create_job(job: JobCreate, db: Session = Depends(get_db)):
+    """
+    Store a job. Near-duplicates of a stored job (same role reposted with
+    slightly different wording) are linked to it via canonical_job_id, so
+    matching and generation can reuse its results.
+    """
+    try:
+        stored, duplicate = _insert_job(db, job)
+    except IntegrityError as e:
         db.rollback()
-        existing = db.query(Job).filter(Job.source_url == job.source_url).first()
-        if not existing:
-            raise HTTPException(status_code=409, detail="Job with this source URL already exists but could not be retrieved.")
-        return {"job": existing, "duplicate": True}
+        raise HTTPException(status_code=422, detail=str(e.orig).strip()) from e
+    db.commit()
+    return {"job": stored, "duplicate": duplicate}
+
+
+@router.post("/bulk", response_model=JobBulkCreateResponse)
+def create_jobs(req: JobBulkCreate, db: Session = Depends(get_db)):
+    """
+    Store many jobs in one transaction (the job fetcher's insert stage).
+    Results are in request order, each as returned by POST /jobs/.
+    A job repeated within the batch is a duplicate of its first copy.
+    A job the database rejects (e.g. invalid data) gets an `error` and
+    is left out; the others are still stored.
+    """
+    results = []
+    for job in req.jobs:
+        try:
+            stored, duplicate = _insert_job(db, job)
+        except SQLAlchemyError as e:
+            detail = str(getattr(e, "orig", None) or e).strip()
+            results.append({"error": f"{type(e).__name__}: {detail}"})
+            continue
+        results.append({"job": stored, "duplicate": duplicate})
+    db.commit()
+    return {"results": results}
+
+
+# --------------------------------------------------------------------
+# Dedupe: which fingerprints are already stored
+# --------------------------------------------------------------------
+@router.post("/fingerprints/lookup")
+def lookup_fingerprints(req: FingerprintLookup, db: Session = Depends(get_db)) -> Dict[str, List[str]]:
+    """
+    Return the subset of `fingerprints` (and of `source_urls`, as
+    `known_urls`) that already belong to a job (one indexed query each).
+    """
+    known: List[str] = []
+    known_urls: List[str] = []
+    wanted = list(set(req.fingerprints))
+    if wanted:
+        rows = db.query(Job.job_fingerprint).filter(Job.job_fingerprint.in_(wanted)).all()
+        known = [row[0] for row in rows]
+    wanted_urls = list(set(req.source_urls))
+    if wanted_urls:
+        rows = db.query(Job.source_url).filter(Job.source_url.in_(wanted_urls)).all()
+        known_urls = [row[0] for row in rows]
+    return {"known": known, "known_urls": known_urls}
 
 
 # --------------------------------------------------------------------
@@ -129,6 +223,32 @@ def get_job(job_id: int, db: Session = Depends(get_db)):
     return job
 
 
+# --------------------------------------------------------------------
+# Stored Matches (written by /jobs/match)
+# --------------------------------------------------------------------
+@router.get("/{job_id}/matches")
+def get_job_matches(job_id: int, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    """
+    Last /jobs/match result for a job, read from job_matches.
+    Same match shape as /jobs/match; `matches` is empty if never matched
+    or if the prefilter marked the job low-match (match_stage "prefilter").
+    """
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    matches, matched_at = matching.stored_matches(db, job_id)
+    return {
+        "job_id": job_id,
+        "job_title": job.title,
+        "company": job.company,
+        "matches": matches,
+        "best_score": job.match_score,
+        "match_stage": job.match_stage,
+        "matched_at": matched_at,
+    }
+
+
 # --------------------------------------------------------------------
 # Job Match Request Model
 # --------------------------------------------------------------------
@@ -138,37 +258,38 @@ class JobMatchRequest(BaseModel):
     description: str
     top_k: int = 4
     job_id: int | None = None
+    prefilter: bool = True
 
 
-# --------------------------------------------------------------------
-# Helper: Convert skill dict → skill set safely
-# --------------------------------------------------------------------
-def _skills_to_set(sk: Dict[str, List[str]]) -> set:
-    """
-    Job/artifact skills are dicts like:
-      {
-        "languages": [...],
-        ...,
-        "all": [...]
-      }
-    We'll primarily rely on "all", but fall back to union of categories.
-    """
-    if not sk:
-        return set()
+ARTIFACT_SEARCH_SQL = text("""
+    SELECT name, content,
+           1 - (embedding <=> CAST(:embedding AS vector)) AS similarity
+    FROM artifacts
+    ORDER BY similarity DESC
+    LIMIT :top_k;
+""")
 
-    all_list = sk.get("all", [])
-    if all_list:
-        return {s.strip().lower() for s in all_list if str(s).strip()}
 
-    agg = set()
-    for k, vals in sk.items():
-        if k == "all":
-            continue
-        for v in vals or []:
-            v = str(v).strip().lower()
-            if v:
-                agg.add(v)
-    return agg
+def _retrieve_artifacts(db: Session, request: JobMatchRequest, job_text: str) -> List[Any]:
+    """
+    Context artifacts for a generation request: the precomputed neighbors
+    of the stored job when request.job_id names it (unchanged), else the
+    artifacts nearest to a fresh embedding of job_text.
+    """
+    if request.job_id is not None:
+        job = db.query(Job).filter(Job.id == request.job_id).first()
+        if job is not None and (job.title, job.company or "", job.description) == (
+            request.title, request.company or "", request.description
+        ):
+            found = neighbors.lookup(db, job, request.top_k)
+            if found is not None:
+                return [art for art, _ in found]
+
+    embedding = client.embeddings.create(
+        model="text-embedding-3-small",
+        input=job_text
+    ).data[0].embedding
+    return db.execute(ARTIFACT_SEARCH_SQL, {"embedding": embedding, "top_k": request.top_k}).fetchall()
 
 
 def _persist_generated_artifact(
@@ -222,117 +343,18 @@ def _persist_generated_artifact(
 # --------------------------------------------------------------------
 @router.post("/match")
 def match_job(req: JobMatchRequest) -> Dict[str, Any]:
-    """
-    Hybrid job matcher:
-      - Semantic similarity (pgvector)
-      - LLM-extracted skill overlap (GPT-4o-mini)
-      - Combined hybrid score = 0.6*semantic + 0.4*skill
-    """
-
-    if not req.description.strip():
-        raise HTTPException(status_code=400, detail="Job description is required")
-
-    full_text = f"{req.title}\n{req.company or ''}\n{req.description}"
-
-    # 1. Encode job posting into vector
-    query_vec = embed_text(full_text)
-
-    # 2. Retrieve relevant artifacts
-    db = SessionLocal()
+    """Hybrid job match; see backend.utils.matching.match_job (also called in-process by JobMatcherAgent)."""
     try:
-        matches_raw = search_similar_artifacts(db, query_vec, top_k=req.top_k)
-    finally:
-        db.close()
-
-    # 3. Extract job skills via LLM
-    job_sk = extract_skills_llm(full_text)
-    job_set = _skills_to_set(job_sk)
-
-    # print("\n================ DEBUG: LLM EXTRACTED JOB SKILLS ================\n")
-    # print(json.dumps(job_sk, indent=2))
-    # print("=================================================================\n")
-
-    enriched_matches = []
-
-    for art, sim in matches_raw:
-        art_content = art.content or ""
-
-        # 4. Extract artifact skills via LLM
-        art_sk = extract_skills_llm(art_content)
-        art_set = _skills_to_set(art_sk)
-
-        # print("\n================ DEBUG: RAW LLM ARTIFACT SKILLS ================\n")
-        # print(json.dumps(art_sk, indent=2))
-        # print("=================================================================\n")
-
-        # 5. Compute skill overlap using precision on job skills
-        if job_set:
-            inter = job_set & art_set
-            sk_overlap = len(inter) / len(job_set)
-        else:
-            inter = set()
-            sk_overlap = 0.0
-
-        union = job_set | art_set  # for debug printing only
-
-
-        # 6. Hybrid score (semantic + bonus from skills)
-        semantic = float(sim)
-        skill = float(sk_overlap)
-        combined = semantic + 0.3 * skill
-        if combined > 1.0:
-            combined = 1.0
-
-        snippet = (
-            art_content[:400] + "..."
-            if len(art_content) > 400
-            else art_content
+        return matching.match_job(
+            req.title,
+            req.company,
+            req.description,
+            top_k=req.top_k,
+            job_id=req.job_id,
+            prefilter=req.prefilter,
         )
-
-        # Verbose skill debug
-        # print("\n================ SKILL DEBUG ================\n")
-        # print(f"Artifact: {art.name}")
-        # print(f"Similarity: {semantic:.4f}")
-        # print(f"Job Skills: {job_set}")
-        # print(f"Artifact Skills: {art_set}")
-        # print(f"Intersection: {inter}")
-        # print(f"Union: {union}")
-        # print(f"Skill Overlap Score: {sk_overlap:.4f}")
-        # print(f"Combined Score: {combined:.4f}")
-        # print("=============================================\n")
-
-        enriched_matches.append({
-            "artifact_id": art.id,
-            "name": art.name,
-            "similarity": semantic,
-            "skill_overlap": float(sk_overlap),
-            "combined_score": float(combined),
-            "snippet": snippet,
-            "source": art.source,
-        })
-
-    enriched_matches.sort(key=lambda m: m["combined_score"], reverse=True)
-
-    best_score = enriched_matches[0]["combined_score"] if enriched_matches else None
-
-    if req.job_id and best_score is not None:
-        session = SessionLocal()
-        try:
-            job = session.query(Job).filter(Job.id == req.job_id).first()
-            if job:
-                job.match_score = best_score
-                session.commit()
-        except Exception:
-            session.rollback()
-        finally:
-            session.close()
-
-    return {
-        "job_title": req.title,
-        "company": req.company,
-        "matches": enriched_matches,
-        "best_score": best_score,
-    }
+    except matching.MatchError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 
 # --------------------------------------------------------------------
@@ -347,27 +369,14 @@ def generate_resume(request: JobMatchRequest, db: Session = Depends(get_db)):
         description = clean_text(request.description)
         job_text = f"{title}\n{company}\n{description}"
 
-        # 1. Embed job description
-        embedding = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=job_text
-        ).data[0].embedding
-
-        # 2. Retrieve top-matching artifacts
-        sql = text("""
-            SELECT name, content,
-                   1 - (embedding <=> CAST(:embedding AS vector)) AS similarity
-            FROM artifacts
-            ORDER BY similarity DESC
-            LIMIT :top_k;
-        """)
+        # 1. Retrieve top-matching artifacts (the stored job's precomputed
+        #    neighbors, else pgvector on a fresh embedding)
+        rows = _retrieve_artifacts(db, request, job_text)
 
-        rows = db.execute(sql, {"embedding": embedding, "top_k": request.top_k}).fetchall()
-
-        # 3. Combine structured profile + artifact context
+        # 2. Combine structured profile + artifact context
         combined_context, contact_instructions = _build_context(rows)
 
-        # 4. Generate reasoning + structured resume with GPT-4o-mini
+        # 3. Generate reasoning + structured resume with GPT-4o-mini
         completion = client.chat.completions.create(
             model="gpt-4.1-mini",
             response_format={"type": "json_object"},
@@ -445,20 +454,7 @@ def generate_resume_job_focus(request: JobMatchRequest, db: Session = Depends(ge
         description = clean_text(request.description)
         job_text = f"{title}\n{company}\n{description}"
 
-        embedding = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=job_text
-        ).data[0].embedding
-
-        sql = text("""
-            SELECT name, content,
-                   1 - (embedding <=> CAST(:embedding AS vector)) AS similarity
-            FROM artifacts
-            ORDER BY similarity DESC
-            LIMIT :top_k;
-        """)
-
-        rows = db.execute(sql, {"embedding": embedding, "top_k": request.top_k}).fetchall()
+        rows = _retrieve_artifacts(db, request, job_text)
         combined_context, contact_instructions = _build_context(rows)
 
         job_skills = extract_skills_llm(job_text)
@@ -536,7 +532,7 @@ def fetch_jobs():
         sleep_interval=0,
     )
     agent = JobFetcherAgent(config)
-    agent.step()
+    agent.run_step()
     return {"status": "ok", "message": "Job fetcher completed one cycle."}
 
 
@@ -552,20 +548,7 @@ def generate_cover_letter(request: JobMatchRequest, db: Session = Depends(get_db
         description = clean_text(request.description)
         job_text = f"{title}\n{company}\n{description}"
 
-        embedding = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=job_text
-        ).data[0].embedding
-
-        sql = text("""
-            SELECT name, content,
-                   1 - (embedding <=> CAST(:embedding AS vector)) AS similarity
-            FROM artifacts
-            ORDER BY similarity DESC
-            LIMIT :top_k;
-        """)
-
-        rows = db.execute(sql, {"embedding": embedding, "top_k": request.top_k}).fetchall()
+        rows = _retrieve_artifacts(db, request, job_text)
         context = "\n\n---\n\n".join([row.content for row in rows])
 
         completion = client.chat.completions.create(
@@ -6,6 +6,7 @@ from typing import List
 
 from fastapi import APIRouter, HTTPException, Query
 
+from backend.utils.persona_catalog import PersonaCatalog
 
 router = APIRouter(prefix="/persona_resumes", tags=["Persona Resumes"])
 
@@ -19,6 +20,8 @@ PROMPT_RUNS_DIR = (
     / "prompt_runs"
 )
 
+catalog = PersonaCatalog(PROMPT_RUNS_DIR)
+
 
 def _load_json(path: Path) -> dict:
     try:
@@ -35,34 +38,13 @@ def list_persona_resumes(
     variant: str | None = Query(default=None, description="Optional persona variant filter (e.g. P0)"),
     limit: int | None = Query(default=None, ge=1, le=10000),
 ) -> List[dict]:
-    """Return summaries of generated persona resumes stored on disk."""
-    if not PROMPT_RUNS_DIR.exists():
-        return []
-
-    requested = variant.upper() if variant else None
-    entries: List[dict] = []
-
-    for persona_dir in sorted(PROMPT_RUNS_DIR.iterdir()):
-        if not persona_dir.is_dir():
-            continue
-        persona_name = persona_dir.name
-        if requested and persona_name.upper() != requested:
-            continue
-        for file_path in sorted(persona_dir.glob("job_*.json")):
-            data = _load_json(file_path)
-            reasoning = str(data.get("reasoning", "")).strip()
-            entries.append(
-                {
-                    "variant": persona_name,
-                    "job_id": int(data.get("job_id", 0)),
-                    "artifact_id": data.get("artifact_id"),
-                    "reasoning_preview": reasoning[:180] + ("..." if len(reasoning) > 180 else ""),
-                    "filename": file_path.name,
-                    "updated_at": file_path.stat().st_mtime,
-                }
-            )
-
-    entries.sort(key=lambda item: (item["variant"], item["job_id"]))
+    """Return summaries of generated persona resumes from the catalog index."""
+    try:
+        entries = catalog.entries(variant)
+    except json.JSONDecodeError as exc:
+        raise HTTPException(
+            status_code=500, detail=f"Corrupted JSON in persona resumes: {exc}"
+        ) from exc
     if limit:
         return entries[:limit]
     return entries
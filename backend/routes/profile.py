@@ -1,6 +1,6 @@
 import json
 import os
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
@@ -21,6 +21,10 @@ class ProfilePayload(BaseModel):
 class PreferencesPayload(BaseModel):
     target_title: str | None = None
     location: str | None = None
+    # Search every title in every location (the fetcher falls back to
+    # target_title / location when these are empty)
+    target_titles: List[str] | None = None
+    locations: List[str] | None = None
     results_per_page: int | None = None
     max_pages: int | None = None
 
@@ -30,6 +34,8 @@ def _ensure_preferences() -> Dict[str, Any]:
         default = {
             "target_title": "",
             "location": "",
+            "target_titles": [],
+            "locations": [],
             "results_per_page": 20,
             "max_pages": 3,
         }
@@ -40,6 +46,15 @@ def _ensure_preferences() -> Dict[str, Any]:
         return json.load(f)
 
 
+def _clean_list(values: List[str]) -> List[str]:
+    out: List[str] = []
+    for value in values:
+        value = value.strip()
+        if value and value not in out:
+            out.append(value)
+    return out
+
+
 @router.get("/")
 def get_profile():
     try:
@@ -72,6 +87,10 @@ def update_preferences(payload: PreferencesPayload):
         prefs["target_title"] = payload.target_title
     if payload.location is not None:
         prefs["location"] = payload.location
+    if payload.target_titles is not None:
+        prefs["target_titles"] = _clean_list(payload.target_titles)
+    if payload.locations is not None:
+        prefs["locations"] = _clean_list(payload.locations)
     if payload.results_per_page is not None:
         if payload.results_per_page <= 0:
             raise HTTPException(status_code=400, detail="results_per_page must be positive")
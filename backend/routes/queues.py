@@ -0,0 +1,43 @@
+# backend/routes/queues.py
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from backend.queue.factory import KNOWN_QUEUES, get_queue
+
+router = APIRouter(prefix="/queues", tags=["Queues"])
+
+
+class DeadLetterSelection(BaseModel):
+    ids: Optional[List[int]] = None  # None = every dead item in the queue
+
+
+def _queue(name: str):
+    if name not in KNOWN_QUEUES:
+        raise HTTPException(status_code=404, detail=f"Unknown queue '{name}'")
+    return get_queue(name)
+
+
+@router.get("/")
+def list_queues():
+    """Waiting item count for each agent queue."""
+    return [{"name": name, "size": get_queue(name).size()} for name in KNOWN_QUEUES]
+
+
+@router.get("/{name}/dead_letters")
+def list_dead_letters(name: str, limit: int = Query(default=100, ge=1, le=1000)):
+    """Items that exhausted their retries, newest first, with the last error."""
+    return _queue(name).dead_letters(limit)
+
+
+@router.post("/{name}/dead_letters/requeue")
+def requeue_dead_letters(name: str, selection: DeadLetterSelection):
+    """Put dead items back on the queue with a fresh attempt count."""
+    return {"requeued": _queue(name).requeue_dead_letters(selection.ids)}
+
+
+@router.post("/{name}/dead_letters/purge")
+def purge_dead_letters(name: str, selection: DeadLetterSelection):
+    """Permanently drop dead items."""
+    return {"purged": _queue(name).purge_dead_letters(selection.ids)}
@@ -0,0 +1 @@
+# Init file for backend/sources package
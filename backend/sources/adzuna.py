@@ -0,0 +1,60 @@
+# backend/sources/adzuna.py
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.utils.async_http import PoliteAsyncClient
+from .base import JobSource, SourceJob
+
+
+class AdzunaSource(JobSource):
+    """Adzuna job search API, newest postings first; descriptions are snippets, so hydrate."""
+
+    name = "adzuna"
+    paged = True
+    hydrate = True
+
+    BASE_URL = "https://api.adzuna.com/v1/api/jobs/us/search"
+
+    def __init__(self, results_per_page: int = 20):
+        self.results_per_page = results_per_page
+        self.app_id = os.getenv("ADZUNA_AI_ID")
+        self.api_key = os.getenv("ADZUNA_API_KEY")
+
+    def check(self) -> Optional[str]:
+        if not self.app_id or not self.api_key:
+            return "ADZUNA_API_KEY or ADZUNA_AI_ID missing"
+        return None
+
+    def searches(self, queries: List[str], locations: List[str]) -> List[Tuple[str, str]]:
+        return [(q, loc) for q in queries for loc in locations]
+
+    async def fetch_page(
+        self, client: PoliteAsyncClient, query: str, location: str, page: int
+    ) -> List[Dict[str, Any]]:
+        params = {
+            "app_id": self.app_id,
+            "app_key": self.api_key,
+            "what": query,
+            "where": location,
+            "results_per_page": self.results_per_page,
+            "sort_by": "date",
+            "content-type": "application/json",
+        }
+        resp = await client.get(f"{self.BASE_URL}/{page}", params=params, timeout=30)
+        resp.raise_for_status()
+        return resp.json().get("results", [])
+
+    def normalize(self, raw: Dict[str, Any], search: Tuple[str, str]) -> Optional[SourceJob]:
+        url = raw.get("redirect_url") or ""
+        if not url:
+            return None
+        return SourceJob(
+            source=self.name,
+            title=raw.get("title", "") or "",
+            company=(raw.get("company", {}) or {}).get("display_name", "") or "",
+            location=(raw.get("location", {}) or {}).get("display_name", "") or "",
+            description=raw.get("description", "") or "",
+            url=url,
+            posted_at=raw.get("created"),
+            search=search,
+        )
@@ -0,0 +1,70 @@
+# backend/sources/base.py
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from backend.utils.async_http import PoliteAsyncClient
+
+
+def job_fingerprint(title: str, company: str, description: str) -> str:
+    """sha256 of title|company|description, trimmed and lowercased (stored as jobs.job_fingerprint)."""
+    key = (title + "|" + company + "|" + description).strip().lower()
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+class SourceJob(NamedTuple):
+    """A posting from any source, normalized to the fields the backend stores."""
+
+    source: str                  # JobSource.name
+    title: str
+    company: str
+    location: str
+    description: str             # as listed by the source (hydrated later if the source wants)
+    url: str                     # stored as jobs.source_url
+    posted_at: Optional[str] = None   # ISO 8601, used as the search high-water mark
+    search: Tuple[str, str] = ("", "")  # (query, location) that found it
+    fingerprint: str = ""        # set by the fetcher from JobSource.fingerprint()
+
+
+class JobSource(ABC):
+    """
+    A place jobs come from (job board API, local files, ...).
+
+    JobFetcherAgent runs every configured source at once and owns the
+    rest: paging with early stop, dedupe across sources, description
+    hydration and the bulk insert. A source only says what to search,
+    how to fetch one page of a search and how to read its postings.
+    """
+
+    name = "base"
+    # fetch_page() takes page numbers beyond 1 (else one page per search)
+    paged = False
+    # Job urls are web pages worth downloading for the full description
+    hydrate = False
+
+    def check(self) -> Optional[str]:
+        """Why the source can't run (e.g. missing credentials), or None if it can."""
+        return None
+
+    def searches(self, queries: List[str], locations: List[str]) -> List[Tuple[str, str]]:
+        """(query, location) searches to run; sources without search run one."""
+        return [("", "")]
+
+    @abstractmethod
+    async def fetch_page(
+        self, client: PoliteAsyncClient, query: str, location: str, page: int
+    ) -> List[Dict[str, Any]]:
+        """Raw postings on one page of a search (empty past the last). Raises on failure."""
+        pass
+
+    @abstractmethod
+    def normalize(self, raw: Dict[str, Any], search: Tuple[str, str]) -> Optional[SourceJob]:
+        """Map a raw posting to a SourceJob; None to drop it (e.g. no url)."""
+        pass
+
+    def fingerprint(self, job: SourceJob) -> str:
+        """
+        Deterministic hash based on title + company + description as
+        listed. This survives url churn (e.g. Adzuna redirect_url).
+        """
+        return job_fingerprint(job.title, job.company, job.description)
@@ -0,0 +1,33 @@
+# backend/sources/factory.py
+import os
+from typing import List
+
+from backend.sources.adzuna import AdzunaSource
+from backend.sources.base import JobSource
+from backend.sources.fixtures import JsonFixtureSource, LocalFileSource
+
+# Comma-separated; "adzuna", "json:<file>" or "files:<directory>"
+DEFAULT_SOURCES = "adzuna"
+
+
+def get_sources(spec: str = "", results_per_page: int = 20) -> List[JobSource]:
+    """
+    Build the job sources named in `spec` (default JOB_FETCHER_SOURCES),
+    e.g. "adzuna,json:scripts/fixtures/job_sources.json".
+    """
+    spec = spec or os.getenv("JOB_FETCHER_SOURCES", DEFAULT_SOURCES)
+    sources: List[JobSource] = []
+    for entry in spec.split(","):
+        kind, _, arg = entry.strip().partition(":")
+        kind = kind.lower()
+        if not kind:
+            continue
+        if kind == "adzuna":
+            sources.append(AdzunaSource(results_per_page=results_per_page))
+        elif kind == "json" and arg:
+            sources.append(JsonFixtureSource(arg))
+        elif kind == "files" and arg:
+            sources.append(LocalFileSource(arg))
+        else:
+            raise ValueError(f"Unknown job source in JOB_FETCHER_SOURCES: {entry.strip()!r}")
+    return sources
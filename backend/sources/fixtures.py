@@ -0,0 +1,104 @@
+# backend/sources/fixtures.py
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from lxml import etree, html as lxml_html
+
+from backend.utils.async_http import PoliteAsyncClient
+from backend.utils.html_extract import extract_text
+from .base import JobSource, SourceJob
+
+
+class JsonFixtureSource(JobSource):
+    """
+    Postings from a JSON file, for offline runs and tests: a list (or
+    {"results": [...]}) of objects with title, company, location,
+    description, url and optionally posted_at. Read again every cycle.
+    """
+
+    name = "json"
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def check(self) -> Optional[str]:
+        if not self.path.is_file():
+            return f"Job fixture file not found: {self.path}"
+        return None
+
+    async def fetch_page(
+        self, client: PoliteAsyncClient, query: str, location: str, page: int
+    ) -> List[Dict[str, Any]]:
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            data = data.get("results", [])
+        return list(data)
+
+    def normalize(self, raw: Dict[str, Any], search: Tuple[str, str]) -> Optional[SourceJob]:
+        url = raw.get("url") or ""
+        if not url:
+            return None
+        return SourceJob(
+            source=self.name,
+            title=raw.get("title", "") or "",
+            company=raw.get("company", "") or "",
+            location=raw.get("location", "") or "",
+            description=raw.get("description", "") or "",
+            url=url,
+            posted_at=raw.get("posted_at"),
+            search=search,
+        )
+
+
+class LocalFileSource(JobSource):
+    """
+    Saved job pages (*.html) in a directory, e.g. scripts/fixtures/job_pages.
+    The title comes from the page's <h1> (or <title>), the company from a
+    "Title - Company | Site" <title>, the description from the page text
+    and posted_at from the file's modification time.
+    """
+
+    name = "files"
+    SECTION_CLASS = "adp-body"
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def check(self) -> Optional[str]:
+        if not self.directory.is_dir():
+            return f"Job page directory not found: {self.directory}"
+        return None
+
+    async def fetch_page(
+        self, client: PoliteAsyncClient, query: str, location: str, page: int
+    ) -> List[Dict[str, Any]]:
+        return [{"path": path} for path in sorted(self.directory.glob("*.htm*"))]
+
+    def normalize(self, raw: Dict[str, Any], search: Tuple[str, str]) -> Optional[SourceJob]:
+        path: Path = raw["path"]
+        page = path.read_text(encoding="utf-8", errors="ignore")
+        try:
+            root = lxml_html.document_fromstring(page.encode("utf-8"))
+        except (etree.ParserError, ValueError):
+            return None
+
+        page_title = (root.findtext(".//title") or "").strip()
+        h1 = root.find(".//h1")
+        title = h1.text_content().strip() if h1 is not None else page_title.split("|")[0].strip()
+        company = ""
+        if " - " in page_title:
+            company = page_title.split(" - ", 1)[1].split("|")[0].strip()
+
+        posted_at = datetime.fromtimestamp(path.stat().st_mtime, timezone.utc)
+        return SourceJob(
+            source=self.name,
+            title=title,
+            company=company,
+            location="",
+            description=extract_text(page, section_class=self.SECTION_CLASS),
+            url=path.resolve().as_uri(),
+            posted_at=posted_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            search=search,
+        )
@@ -31,7 +31,29 @@ def embed_text(text: str) -> List[float]:
 
 
 # ---------------------------------------------------------
-# 2. Search similar artifacts using pgvector
+# 2. Job embeddings, stored in jobs.description_embedding
+# ---------------------------------------------------------
+def job_embedding_text(title: str, company: str, description: str) -> str:
+    """Text embedded for a job (same as /jobs/match uses for its query)."""
+    return f"{title or ''}\n{company or ''}\n{description or ''}"
+
+
+def embed_job(db: Session, job: Any) -> List[float]:
+    """
+    Return the job's stored embedding, computing and saving it first if
+    missing, so each job description is embedded once.
+    """
+    if job.description_embedding is not None:
+        return [float(x) for x in job.description_embedding]
+
+    vector = embed_text(job_embedding_text(job.title, job.company, job.description))
+    job.description_embedding = vector
+    db.commit()
+    return vector
+
+
+# ---------------------------------------------------------
+# 3. Search similar artifacts using pgvector
 #    Returns list of (ArtifactModel, similarity_score)
 # ---------------------------------------------------------
 def search_similar_artifacts(
@@ -70,13 +92,11 @@ def search_similar_artifacts(
     if not rows:
         return []
 
-    # Load Artifact model (ORM) for each row
+    # Load the Artifact models (ORM) in one query
     from backend.db.models import Artifact
 
-    results = []
-    for r in rows:
-        art = db.query(Artifact).filter(Artifact.id == r.id).first()
-        if art:
-            results.append((art, float(r.similarity)))
-
-    return results
+    by_id = {
+        art.id: art
+        for art in db.query(Artifact).filter(Artifact.id.in_([r.id for r in rows])).all()
+    }
+    return [(by_id[r.id], float(r.similarity)) for r in rows if r.id in by_id]
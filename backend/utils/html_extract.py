@@ -0,0 +1,148 @@
+# backend/utils/html_extract.py
+import re
+from typing import Optional
+
+from lxml import etree, html as lxml_html
+
+# Bump when extraction output changes, so cached extractions are redone
+EXTRACTOR_VERSION = 2
+
+# Removed with their content: code, styling and page chrome
+DROP_TAGS = {
+    "head", "script", "style", "noscript", "template", "iframe", "svg", "canvas",
+    "nav", "header", "footer", "aside", "form", "button", "select",
+}
+
+# Elements that start a new paragraph
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "ul", "ol", "dl", "dd", "dt",
+    "table", "tr", "blockquote", "pre", "figure", "figcaption",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "address",
+}
+
+# Pull-parser feed size when streaming just one section of a page
+SECTION_CHUNK = 16 * 1024
+
+_INLINE_SPACE = re.compile(r"[^\S\n]+")
+_PARAGRAPH_GAP = re.compile(r"\n{3,}")
+
+
+def _has_class(el, section_class: str) -> bool:
+    """True if one of el's classes starts with section_class."""
+    return any(c.startswith(section_class) for c in (el.get("class") or "").split())
+
+
+def _find_section(root, section_class: str):
+    for el in root.iter():
+        if isinstance(el.tag, str) and _has_class(el, section_class):
+            return el
+    return None
+
+
+def _section_tag_start(html: str, section_class: str) -> int:
+    """Offset of the first tag whose class attribute mentions section_class, or -1."""
+    pos = html.find(section_class)
+    while pos >= 0:
+        tag_start = html.rfind("<", 0, pos)
+        # Inside a tag (not text, CSS or JS), after its class= attribute
+        if tag_start > html.rfind(">", 0, pos) and "class" in html[tag_start:pos]:
+            return tag_start
+        pos = html.find(section_class, pos + 1)
+    return -1
+
+
+def _stream_section(html: str, section_class: str):
+    """
+    Parse only the section: start at the tag carrying the class and stop
+    at its end event, so the scripts and chrome around it (most of a
+    live page's bytes) are never parsed. None if the section isn't found.
+    """
+    start = _section_tag_start(html, section_class)
+    if start < 0:
+        return None
+
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    section = None
+    for offset in range(start, len(html), SECTION_CHUNK):
+        parser.feed(html[offset:offset + SECTION_CHUNK])
+        for event, el in parser.read_events():
+            if event == "start" and section is None and _has_class(el, section_class):
+                section = el
+            elif event == "end" and el is section:
+                return section
+        if section is None:
+            # The marker was not a class attribute (e.g. inside a script)
+            return None
+    return section
+
+
+def extract_text(html: str, section_class: Optional[str] = None) -> str:
+    """
+    Readable text from an HTML page, using lxml's C parser (tolerant of
+    broken markup).
+
+      - if `section_class` is given and an element has a class starting
+        with it (e.g. "adp-body" on Adzuna), only that element is used;
+        it is streamed out of the page without parsing the rest
+      - <head>, script/style/noscript and nav/header/footer/aside/form boilerplate
+        are dropped, content included
+      - block elements become paragraph breaks ("\\n\\n"), <br> a line
+        break and list items "- " lines; other whitespace is collapsed
+    """
+    if not html or not html.strip():
+        return ""
+
+    root = _stream_section(html, section_class) if section_class else None
+    if root is not None:
+        return _to_text(root)
+
+    try:
+        try:
+            root = lxml_html.document_fromstring(html)
+        except ValueError:
+            # str input with an <?xml encoding=...?> declaration
+            root = lxml_html.document_fromstring(html.encode("utf-8"))
+    except (etree.ParserError, ValueError):
+        return ""
+
+    if section_class:
+        section = _find_section(root, section_class)
+        if section is not None:
+            root = section
+    return _to_text(root)
+
+
+def _to_text(root) -> str:
+    # Comments are skipped by iterwalk along with their tail text
+    etree.strip_tags(root, etree.Comment, etree.ProcessingInstruction)
+
+    parts = []
+    skip_depth = 0
+    for event, el in etree.iterwalk(root, events=("start", "end")):
+        tag = el.tag
+        if event == "start":
+            if skip_depth or tag in DROP_TAGS:
+                skip_depth += 1
+                continue
+            if tag in BLOCK_TAGS:
+                parts.append("\n\n")
+            elif tag == "li":
+                parts.append("\n- ")
+            elif tag == "br":
+                parts.append("\n")
+            elif tag in ("td", "th"):
+                parts.append(" ")
+            if el.text:
+                parts.append(el.text)
+        else:
+            if skip_depth:
+                skip_depth -= 1
+            elif tag in BLOCK_TAGS:
+                parts.append("\n\n")
+            # The tail follows the element, so it's kept even for dropped ones
+            if el is not root and el.tail and not skip_depth:
+                parts.append(el.tail)
+
+    text = _INLINE_SPACE.sub(" ", "".join(parts))
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return _PARAGRAPH_GAP.sub("\n\n", text).strip()
@@ -0,0 +1,127 @@
+# backend/utils/http_cache.py
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, NamedTuple, Optional
+
+
+class CachedPage(NamedTuple):
+    url: str
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float  # Unix time of the last download or revalidation
+    fresh: bool        # within the TTL: use without asking the server
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """
+    On-disk cache of processed page content keyed by URL, in a SQLite
+    file (WAL), so it survives restarts.
+
+      - entries younger than `ttl_seconds` are served without a request
+      - older ones are revalidated with a conditional GET (ETag /
+        Last-Modified); a 304 makes them fresh again via touch()
+      - evict() drops least-recently-used entries once the stored text
+        exceeds `max_bytes`
+
+    Stores whatever text the caller derives from the page (e.g. the
+    extracted job description), not the raw response.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS page_cache (
+                    url TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_page_cache_accessed ON page_cache (accessed_at)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Short-lived connection per operation: safe from any thread/process
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT text, etag, last_modified, fetched_at FROM page_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE page_cache SET accessed_at = ? WHERE url = ?", (now, url))
+        text, etag, last_modified, fetched_at = row
+        return CachedPage(
+            url, text, etag, last_modified, fetched_at,
+            fresh=now - fetched_at < self.ttl_seconds,
+        )
+
+    def put(self, url: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO page_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, text, etag, last_modified, now, now, len(text.encode("utf-8"))),
+            )
+
+    def touch(self, url: str):
+        """The server confirmed the entry is unchanged (304): restart its TTL."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE page_cache SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries beyond max_bytes. Returns rows removed."""
+        with self._connect() as conn:
+            return conn.execute(
+                """
+                DELETE FROM page_cache WHERE url IN (
+                    SELECT url FROM (
+                        SELECT url, SUM(size) OVER (
+                            ORDER BY accessed_at DESC, url
+                        ) AS kept
+                        FROM page_cache
+                    ) WHERE kept > ?
+                )
+                """,
+                (self.max_bytes,),
+            ).rowcount
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM page_cache")
@@ -0,0 +1,59 @@
+# backend/utils/legacy_matches.py
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from backend.db.models import Artifact, Job, JobMatch
+
+# Per-job maps kept by the matcher before job_matches and the watermark
+LEGACY_STATE_KEYS = ("processed_jobs", "queued_jobs", "skipped_jobs", "processed_signatures")
+
+
+def legacy_matches(state: Dict[str, Any]) -> Optional[Dict[int, List[Dict[str, Any]]]]:
+    """Per-job matches from an old matcher state's processed_jobs, or None if it has none."""
+    processed = state.get("processed_jobs")
+    if not isinstance(processed, dict):
+        return None
+
+    out: Dict[int, List[Dict[str, Any]]] = {}
+    for job_id_str, payload in processed.items():
+        try:
+            job_id = int(job_id_str)
+        except (TypeError, ValueError):
+            continue
+        out[job_id] = (payload or {}).get("matches") or []
+    return out
+
+
+def import_legacy_matches(session: Session, legacy: Dict[int, List[Dict[str, Any]]]) -> int:
+    """Insert job_matches rows for jobs that have none yet. Returns rows inserted."""
+    known_jobs = {row[0] for row in session.query(Job.id).filter(Job.id.in_(list(legacy)))}
+    matched_jobs = {
+        row[0] for row in session.query(JobMatch.job_id).filter(JobMatch.job_id.in_(list(legacy))).distinct()
+    }
+    known_artifacts = {row[0] for row in session.query(Artifact.id)}
+
+    rows = []
+    for job_id, matches in legacy.items():
+        if job_id not in known_jobs or job_id in matched_jobs:
+            continue
+        ordered = sorted(matches, key=lambda m: m.get("combined_score", 0.0), reverse=True)
+        seen = set()
+        for m in ordered:
+            artifact_id = m.get("artifact_id")
+            if artifact_id not in known_artifacts or artifact_id in seen:
+                continue
+            seen.add(artifact_id)
+            rows.append({
+                "job_id": job_id,
+                "artifact_id": artifact_id,
+                "rank": len(seen) - 1,
+                "similarity": float(m.get("similarity", 0.0)),
+                "skill_overlap": float(m.get("skill_overlap", 0.0)),
+                "combined_score": float(m.get("combined_score", m.get("similarity", 0.0))),
+            })
+
+    if rows:
+        session.execute(insert(JobMatch), rows)
+    return len(rows)
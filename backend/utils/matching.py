@@ -0,0 +1,335 @@
+# backend/utils/matching.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from backend.db.models import Artifact, Job, JobMatch
+from backend.db.repo import SessionLocal
+from backend.utils import neighbors
+from backend.utils.embedding import embed_job, embed_text, job_embedding_text, search_similar_artifacts
+from backend.utils.skills_extractor import extract_skills
+from backend.utils.skills_extractor_llm import extract_skills_llm
+
+# Artifact skill extractions kept in memory (one LLM call per artifact
+# version per process instead of one per artifact per matched job)
+SKILL_CACHE_SIZE = 2048
+
+# Hybrid score = semantic similarity + SKILL_WEIGHT * skill overlap, capped at 1.0
+SKILL_WEIGHT = 0.3
+
+# Prefilter: a stored job is first scored with the hybrid formula using
+# keyword skills (skills_extractor) instead of LLM ones. Below
+# PREFILTER_FLOOR it is marked low-match (jobs.match_stage = "prefilter")
+# without any LLM call. "shadow" only reports the estimate and always
+# runs the full match, to tune the floor; "off" disables it.
+PREFILTER_MODES = ("on", "shadow", "off")
+PREFILTER_MODE = os.getenv("JOB_MATCH_PREFILTER", "on").lower()
+PREFILTER_FLOOR = float(os.getenv("JOB_MATCH_PREFILTER_FLOOR", "0.35"))
+if PREFILTER_MODE not in PREFILTER_MODES:
+    raise ValueError(f"Unknown JOB_MATCH_PREFILTER: {PREFILTER_MODE}")
+
+
+class MatchError(ValueError):
+    """A match request that can't be scored as given (e.g. empty description)."""
+
+
+# ---------------------------------------------------------
+# Skills
+# ---------------------------------------------------------
+def skills_to_set(sk: Dict[str, List[str]]) -> set:
+    """
+    Job/artifact skills are dicts like:
+      {
+        "languages": [...],
+        ...,
+        "all": [...]
+      }
+    We'll primarily rely on "all", but fall back to union of categories.
+    """
+    if not sk:
+        return set()
+
+    all_list = sk.get("all", [])
+    if all_list:
+        return {s.strip().lower() for s in all_list if str(s).strip()}
+
+    agg = set()
+    for k, vals in sk.items():
+        if k == "all":
+            continue
+        for v in vals or []:
+            v = str(v).strip().lower()
+            if v:
+                agg.add(v)
+    return agg
+
+
+_skill_cache: "OrderedDict[str, set]" = OrderedDict()
+_skill_lock = threading.Lock()
+
+
+def _cached_skills(kind: str, content: str, extract) -> set:
+    """LRU-cached skill set of content, keyed by kind and content hash."""
+    key = kind + ":" + hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+    with _skill_lock:
+        if key in _skill_cache:
+            _skill_cache.move_to_end(key)
+            return _skill_cache[key]
+
+    skills = skills_to_set(extract(content or ""))
+    if skills:
+        with _skill_lock:
+            _skill_cache[key] = skills
+            while len(_skill_cache) > SKILL_CACHE_SIZE:
+                _skill_cache.popitem(last=False)
+    return skills
+
+
+def artifact_skills(content: str) -> set:
+    """
+    LLM skill set of an artifact's content, cached by content hash (LRU).
+    Empty results aren't cached: extract_skills_llm also returns them
+    when the LLM call fails.
+    """
+    return _cached_skills("llm", content, extract_skills_llm)
+
+
+def keyword_skills(content: str) -> set:
+    """Keyword skill set (skills_extractor, no LLM) of content, cached like artifact_skills."""
+    return _cached_skills("keyword", content, extract_skills)
+
+
+def snippet(content: Optional[str]) -> str:
+    content = content or ""
+    return content[:400] + "..." if len(content) > 400 else content
+
+
+# ---------------------------------------------------------
+# Stored matches (job_matches)
+# ---------------------------------------------------------
+def store_job_matches(
+    job_id: int,
+    matches: List[Dict[str, Any]],
+    best_score: Optional[float],
+    stage: str = "hybrid",
+) -> None:
+    """Replace the job's job_matches rows (one bulk insert), match_score and match_stage."""
+    rows = []
+    seen = set()
+    for m in matches:
+        if m["artifact_id"] in seen:
+            continue
+        seen.add(m["artifact_id"])
+        rows.append({
+            "job_id": job_id,
+            "artifact_id": m["artifact_id"],
+            "rank": len(rows),
+            "similarity": m["similarity"],
+            "skill_overlap": m["skill_overlap"],
+            "combined_score": m["combined_score"],
+        })
+
+    session = SessionLocal()
+    try:
+        job = session.query(Job).filter(Job.id == job_id).first()
+        if not job:
+            return
+        session.query(JobMatch).filter(JobMatch.job_id == job_id).delete(synchronize_session=False)
+        if rows:
+            session.execute(insert(JobMatch), rows)
+        if best_score is not None:
+            job.match_score = best_score
+        job.match_stage = stage
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def stored_matches(db: Session, job_id: int) -> Tuple[List[Dict[str, Any]], Any]:
+    """A job's job_matches rows in match_job() shape, best first, and when they were stored."""
+    rows = (
+        db.query(JobMatch, Artifact)
+        .join(Artifact, Artifact.id == JobMatch.artifact_id)
+        .filter(JobMatch.job_id == job_id)
+        .order_by(JobMatch.rank)
+        .all()
+    )
+    matches = [
+        {
+            "artifact_id": art.id,
+            "name": art.name,
+            "similarity": m.similarity,
+            "skill_overlap": m.skill_overlap,
+            "combined_score": m.combined_score,
+            "snippet": snippet(art.content),
+            "source": art.source,
+        }
+        for m, art in rows
+    ]
+    return matches, rows[0][0].matched_at if rows else None
+
+
+def canonical_matches(db: Session, canonical_id: int) -> Optional[Tuple[List[Dict[str, Any]], Optional[float]]]:
+    """Stored matches and best score of a canonical job, or None if it was never matched."""
+    matches, _ = stored_matches(db, canonical_id)
+    if not matches:
+        return None
+    best_score = db.query(Job.match_score).filter(Job.id == canonical_id).scalar()
+    if best_score is None:
+        best_score = matches[0]["combined_score"]
+    return matches, best_score
+
+
+# ---------------------------------------------------------
+# Prefilter (no LLM calls)
+# ---------------------------------------------------------
+def prefilter_estimate(job_text: str, matches_raw: List[Tuple[Any, float]]) -> Dict[str, Any]:
+    """
+    Estimated best hybrid score of a job from its retrieved artifacts
+    (best first, as returned by search_similar_artifacts), with keyword
+    skill overlap in place of the LLM one.
+    """
+    job_set = keyword_skills(job_text)
+    estimate, overlap = 0.0, 0.0
+    for art, sim in matches_raw:
+        art_overlap = len(job_set & keyword_skills(art.content or "")) / len(job_set) if job_set else 0.0
+        combined = min(1.0, float(sim) + SKILL_WEIGHT * art_overlap)
+        if combined > estimate:
+            estimate, overlap = combined, art_overlap
+
+    return {
+        "mode": PREFILTER_MODE,
+        "max_similarity": float(matches_raw[0][1]) if matches_raw else 0.0,
+        "keyword_overlap": overlap,
+        "estimate": estimate,
+        "floor": PREFILTER_FLOOR,
+        "low_match": estimate < PREFILTER_FLOOR,
+    }
+
+
+# ---------------------------------------------------------
+# Hybrid match
+# ---------------------------------------------------------
+def match_job(
+    title: str,
+    company: Optional[str],
+    description: str,
+    top_k: int = 4,
+    job_id: Optional[int] = None,
+    prefilter: bool = True,
+) -> Dict[str, Any]:
+    """
+    Hybrid job matcher, shared by POST /jobs/match and JobMatcherAgent:
+      - Semantic similarity (precomputed job neighbors, else pgvector)
+      - LLM-extracted skill overlap (GPT-4o-mini)
+      - Combined hybrid score = semantic + 0.3*skill, capped at 1.0
+      - With job_id: per-artifact scores are stored in job_matches
+        and the best score in jobs.match_score
+      - A near-duplicate job (canonical_job_id set) copies its canonical
+        job's stored matches instead of being scored again
+      - A stored job is prefiltered first (see PREFILTER_MODE) unless
+        prefilter=False; the estimate is returned under "prefilter", and
+        a low-match job gets no matches and its estimate as best_score
+
+    Raises MatchError for unusable input; database and OpenAI errors
+    propagate unchanged.
+    """
+    if not (description or "").strip():
+        raise MatchError("Job description is required")
+
+    full_text = job_embedding_text(title, company, description)
+
+    db = SessionLocal()
+    try:
+        # 1. Does the request describe the stored job? Then its stored
+        #    embedding and neighbors can be reused
+        job = db.query(Job).filter(Job.id == job_id).first() if job_id else None
+        is_stored_job = (
+            job is not None
+            and job_embedding_text(job.title, job.company, job.description) == full_text
+        )
+        if is_stored_job and job.canonical_job_id is not None:
+            reused = canonical_matches(db, job.canonical_job_id)
+            if reused is not None:
+                matches, best_score = reused
+                store_job_matches(job.id, matches, best_score)
+                return {
+                    "job_title": title,
+                    "company": company,
+                    "matches": matches,
+                    "best_score": best_score,
+                    "canonical_job_id": job.canonical_job_id,
+                }
+        # 2. Retrieve relevant artifacts: a stored job's precomputed
+        #    neighbors (see backend/utils/neighbors.py), else pgvector
+        matches_raw = neighbors.lookup(db, job, top_k) if is_stored_job else None
+        if matches_raw is None and is_stored_job:
+            matches_raw = neighbors.search_and_store(db, job, embed_job(db, job), top_k)
+        elif matches_raw is None:
+            matches_raw = search_similar_artifacts(db, embed_text(full_text), top_k=top_k)
+    finally:
+        db.close()
+
+    # 3. Prefilter on similarity and keyword skills, before any LLM call
+    check = None
+    if prefilter and is_stored_job and matches_raw and PREFILTER_MODE != "off":
+        check = prefilter_estimate(full_text, matches_raw)
+        if check["low_match"] and PREFILTER_MODE == "on":
+            store_job_matches(job_id, [], check["estimate"], stage="prefilter")
+            return {
+                "job_title": title,
+                "company": company,
+                "matches": [],
+                "best_score": check["estimate"],
+                "prefilter": check,
+            }
+
+    # 4. Extract job skills via LLM
+    job_set = skills_to_set(extract_skills_llm(full_text))
+
+    enriched_matches = []
+    for art, sim in matches_raw:
+        # 5. Artifact skills (cached per artifact content)
+        art_set = artifact_skills(art.content or "")
+
+        # 6. Skill overlap = precision on job skills
+        sk_overlap = len(job_set & art_set) / len(job_set) if job_set else 0.0
+
+        # 7. Hybrid score (semantic + bonus from skills)
+        semantic = float(sim)
+        combined = min(1.0, semantic + SKILL_WEIGHT * sk_overlap)
+
+        enriched_matches.append({
+            "artifact_id": art.id,
+            "name": art.name,
+            "similarity": semantic,
+            "skill_overlap": float(sk_overlap),
+            "combined_score": float(combined),
+            "snippet": snippet(art.content),
+            "source": art.source,
+        })
+
+    enriched_matches.sort(key=lambda m: m["combined_score"], reverse=True)
+
+    best_score = enriched_matches[0]["combined_score"] if enriched_matches else None
+
+    if job_id:
+        store_job_matches(job_id, enriched_matches, best_score)
+
+    result = {
+        "job_title": title,
+        "company": company,
+        "matches": enriched_matches,
+        "best_score": best_score,
+    }
+    if check is not None:
+        result["prefilter"] = check
+    return result
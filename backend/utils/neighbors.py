@@ -0,0 +1,251 @@
+# backend/utils/neighbors.py
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.db.models import Artifact, Job, JobArtifactNeighbor
+from backend.db.repo import SessionLocal
+from backend.utils.embedding import search_similar_artifacts
+
+# Nearest artifacts kept per job (job_artifact_neighbors); lookups asking
+# for more fall back to a pgvector query
+TOP_N = int(os.getenv("JOB_NEIGHBORS_TOP_N", "20"))
+# Similarities computed per NumPy product: JOB_CHUNK x ARTIFACT_CHUNK
+# (1024 x 4096 float32 = 16 MB)
+JOB_CHUNK = 1024
+ARTIFACT_CHUNK = 4096
+
+Batch = Tuple[np.ndarray, np.ndarray]  # artifact ids, unit-length embeddings
+
+
+def unit_rows(vectors: Iterable[Any]) -> np.ndarray:
+    """Stack embeddings into a float32 matrix of unit-length rows."""
+    matrix = np.asarray(list(vectors), dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def latest_artifact_id(db: Session) -> int:
+    return db.execute(select(func.max(Artifact.id))).scalar() or 0
+
+
+def latest_embedding_version(db: Session) -> int:
+    """Newest Artifact.embedding_version: neighbors computed up to it are current."""
+    return db.execute(select(func.max(Artifact.embedding_version))).scalar() or 0
+
+
+def _artifact_batches(db: Session, after_version: int = 0) -> Iterator[Batch]:
+    """Embedded artifacts with embedding_version > after_version (new or edited), ARTIFACT_CHUNK at a time."""
+    last_version = after_version
+    while True:
+        rows = db.execute(
+            select(Artifact.id, Artifact.embedding_version, Artifact.embedding)
+            .where(Artifact.embedding_version > last_version, Artifact.embedding.isnot(None))
+            .order_by(Artifact.embedding_version)
+            .limit(ARTIFACT_CHUNK)
+        ).all()
+        if not rows:
+            return
+        last_version = rows[-1].embedding_version
+        yield np.array([r.id for r in rows], dtype=np.int64), unit_rows(r.embedding for r in rows)
+
+
+def top_n(job_matrix: np.ndarray, batches: List[Batch], n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Top-n artifacts of each job row over the batches: (ids, similarities),
+    one row per job, best first. Only the running top n is kept between
+    batches, so memory stays at one job x artifact chunk.
+    """
+    rows = job_matrix.shape[0]
+    ids = np.empty((rows, 0), dtype=np.int64)
+    sims = np.empty((rows, 0), dtype=np.float32)
+    for batch_ids, batch_matrix in batches:
+        sims = np.hstack([sims, job_matrix @ batch_matrix.T])
+        ids = np.hstack([ids, np.broadcast_to(batch_ids, (rows, len(batch_ids)))])
+        if sims.shape[1] > n:
+            keep = np.argpartition(-sims, n - 1, axis=1)[:, :n]
+            sims = np.take_along_axis(sims, keep, axis=1)
+            ids = np.take_along_axis(ids, keep, axis=1)
+    order = np.argsort(-sims, axis=1, kind="stable")
+    return np.take_along_axis(ids, order, axis=1), np.take_along_axis(sims, order, axis=1)
+
+
+def _store(db: Session, neighbors: Dict[int, List[Tuple[int, float]]], version: int) -> None:
+    """Replace the jobs' neighbor rows and mark them computed up to embedding version; the caller commits."""
+    job_ids = list(neighbors)
+    db.execute(delete(JobArtifactNeighbor).where(JobArtifactNeighbor.job_id.in_(job_ids)))
+    rows = [
+        {"job_id": job_id, "rank": rank, "artifact_id": int(art_id), "similarity": float(sim)}
+        for job_id, pairs in neighbors.items()
+        for rank, (art_id, sim) in enumerate(pairs)
+    ]
+    if rows:
+        db.execute(insert(JobArtifactNeighbor), rows)
+    db.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids))
+        .values(neighbors_artifact_id=version)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _with_edited_neighbors(db: Session, rows) -> set:
+    """
+    Ids of the jobs among `rows` whose stored neighbors include an artifact
+    whose embedding was edited after they were computed. Their old
+    similarity is void and what ranked just below the list is unknown, so
+    they are recomputed over the whole corpus instead of merged.
+    """
+    computed_at = {r.id: r.neighbors_artifact_id for r in rows if r.neighbors_artifact_id is not None}
+    if not computed_at:
+        return set()
+    return {
+        job_id
+        for job_id, version in db.execute(
+            select(JobArtifactNeighbor.job_id, Artifact.embedding_version)
+            .join(Artifact, Artifact.id == JobArtifactNeighbor.artifact_id)
+            .where(JobArtifactNeighbor.job_id.in_(list(computed_at)))
+        )
+        if version > computed_at[job_id]
+    }
+
+
+def update_neighbors(
+    db: Session,
+    rebuild: bool = False,
+    shard: Tuple[int, int] = (0, 1),
+) -> Dict[str, int]:
+    """
+    Bring job_artifact_neighbors up to date for every embedded job,
+    JOB_CHUNK jobs at a time (committed per chunk):
+
+      - jobs never computed (or all, with rebuild) get their top TOP_N
+        over the whole corpus
+      - jobs computed before artifacts were added or had their embedding
+        edited (a newer embedding_version) only compare with those
+        artifacts and merge them into their stored neighbors, unless one
+        of their stored neighbors is such an edited artifact: those are
+        recomputed over the whole corpus
+
+    shard=(index, count) limits the update to job ids with
+    id % count == index, like the matcher replicas.
+    """
+    latest = latest_embedding_version(db)
+    corpus: Optional[List[Batch]] = None
+    counts = {"built": 0, "merged": 0}
+    index, count = shard
+
+    last_id = 0
+    while True:
+        query = (
+            select(Job.id, Job.neighbors_artifact_id, Job.description_embedding)
+            .where(Job.id > last_id, Job.description_embedding.isnot(None))
+            .order_by(Job.id)
+            .limit(JOB_CHUNK)
+        )
+        if count > 1:
+            query = query.where(Job.id % count == index)
+        if not rebuild:
+            query = query.where(
+                or_(Job.neighbors_artifact_id.is_(None), Job.neighbors_artifact_id < latest)
+            )
+        rows = db.execute(query).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        computed: Dict[int, List[Tuple[int, float]]] = {}
+        stale = set() if rebuild else _with_edited_neighbors(db, rows)
+        full = [r for r in rows if rebuild or r.neighbors_artifact_id is None or r.id in stale]
+        if full:
+            if corpus is None:
+                corpus = list(_artifact_batches(db))
+            ids, sims = top_n(unit_rows(r.description_embedding for r in full), corpus, TOP_N)
+            for r, job_ids, job_sims in zip(full, ids.tolist(), sims.tolist()):
+                computed[r.id] = list(zip(job_ids, job_sims))
+            counts["built"] += len(full)
+
+        partial = [r for r in rows if r.id not in computed]
+        if partial:
+            since = min(r.neighbors_artifact_id for r in partial)
+            ids, sims = top_n(
+                unit_rows(r.description_embedding for r in partial),
+                list(_artifact_batches(db, since)),
+                TOP_N,
+            )
+            stored: Dict[int, Dict[int, float]] = {}
+            for job_id, art_id, sim in db.execute(
+                select(
+                    JobArtifactNeighbor.job_id,
+                    JobArtifactNeighbor.artifact_id,
+                    JobArtifactNeighbor.similarity,
+                ).where(JobArtifactNeighbor.job_id.in_([r.id for r in partial]))
+            ):
+                stored.setdefault(job_id, {})[art_id] = sim
+            for r, job_ids, job_sims in zip(partial, ids.tolist(), sims.tolist()):
+                merged = stored.get(r.id, {})
+                merged.update(zip(job_ids, job_sims))
+                computed[r.id] = sorted(merged.items(), key=lambda pair: pair[1], reverse=True)[:TOP_N]
+            counts["merged"] += len(partial)
+
+        _store(db, computed, latest)
+        db.commit()
+
+    return counts
+
+
+def search_and_store(db: Session, job: Job, embedding: List[float], top_k: int) -> List[Tuple[Any, float]]:
+    """
+    pgvector search for a job without current neighbors; the top TOP_N
+    found are stored as its neighbors. Returns the top_k, shaped like
+    search_similar_artifacts.
+    """
+    latest = latest_embedding_version(db)
+    found = search_similar_artifacts(db, embedding, top_k=max(top_k, TOP_N))
+
+    # Own session: committing db would expire the artifacts returned
+    session = SessionLocal()
+    try:
+        _store(session, {job.id: [(art.id, sim) for art, sim in found]}, latest)
+        session.commit()
+    except IntegrityError:
+        # Stored concurrently by another matcher, or an artifact was deleted
+        session.rollback()
+    finally:
+        session.close()
+    return found[:top_k]
+
+
+def lookup(db: Session, job: Job, top_k: int) -> Optional[List[Tuple[Any, float]]]:
+    """
+    The job's top_k precomputed neighbors as (Artifact, similarity), best
+    first, like search_similar_artifacts. None if they can't be trusted:
+    never computed, artifacts added or edited since, top_k above TOP_N, or
+    too few left after artifacts were deleted.
+    """
+    if top_k > TOP_N or job.neighbors_artifact_id is None:
+        return None
+    if job.neighbors_artifact_id < latest_embedding_version(db):
+        return None
+
+    rows = (
+        db.query(JobArtifactNeighbor.similarity, Artifact)
+        .join(Artifact, Artifact.id == JobArtifactNeighbor.artifact_id)
+        .filter(JobArtifactNeighbor.job_id == job.id)
+        .order_by(JobArtifactNeighbor.rank)
+        .limit(top_k)
+        .all()
+    )
+    if len(rows) < top_k:
+        # Fine only if the neighbors cover the whole (small) corpus
+        embedded = db.execute(
+            select(func.count()).select_from(Artifact).where(Artifact.embedding.isnot(None))
+        ).scalar()
+        if len(rows) < embedded:
+            return None
+    return [(art, float(sim)) for sim, art in rows]
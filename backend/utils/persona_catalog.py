@@ -0,0 +1,158 @@
+# backend/utils/persona_catalog.py
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CATALOG_FILENAME = ".catalog.json"
+PREVIEW_CHARS = 180
+
+
+def reasoning_preview(reasoning: Any) -> str:
+    text = str(reasoning or "").strip()
+    return text[:PREVIEW_CHARS] + ("..." if len(text) > PREVIEW_CHARS else "")
+
+
+class PersonaCatalog:
+    """
+    Manifest of persona resume files under a prompt_runs directory.
+
+    Layout on disk:
+        prompt_runs/
+          .catalog.json          <- this manifest
+          P0/job_123.json
+          P1/job_123.json
+
+    The manifest stores one summary entry per file plus the mtime of each
+    variant directory. A listing only stats the manifest and the variant
+    directories; a directory is rescanned (and only its new/modified files
+    re-read) when its mtime differs from the recorded one.
+
+    Writers (run_prompt_variants) call record() after producing a file so
+    in-place overwrites, which don't bump the directory mtime, are reflected.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.manifest_path = self.root / CATALOG_FILENAME
+        self._lock = threading.Lock()
+        self._variants: Dict[str, Dict[str, Any]] = {}
+        self._manifest_mtime: Optional[float] = None
+
+    # --------------------------
+    # Public API
+    # --------------------------
+    def entries(self, variant: Optional[str] = None) -> List[dict]:
+        """Return summary entries sorted by (variant, job_id)."""
+        requested = variant.upper() if variant else None
+        with self._lock:
+            self._refresh()
+            out: List[dict] = []
+            for name, data in self._variants.items():
+                if requested and name.upper() != requested:
+                    continue
+                out.extend(dict(e) for e in data["files"].values())
+        out.sort(key=lambda item: (item["variant"], item["job_id"]))
+        return out
+
+    def record(self, variant: str, file_path: Path, payload: Dict[str, Any]) -> None:
+        """Upsert the entry for a file that was just written."""
+        file_path = Path(file_path)
+        with self._lock:
+            self._refresh()
+            data = self._variants.setdefault(variant, {"mtime": None, "files": {}})
+            data["files"][file_path.name] = self._build_entry(
+                variant, file_path, payload, file_path.stat().st_mtime
+            )
+            data["mtime"] = self._dir_mtime(file_path.parent)
+            self._save()
+
+    # --------------------------
+    # Internal helpers
+    # --------------------------
+    @staticmethod
+    def _build_entry(variant: str, file_path: Path, data: Dict[str, Any], mtime: float) -> dict:
+        return {
+            "variant": variant,
+            "job_id": int(data.get("job_id", 0)),
+            "artifact_id": data.get("artifact_id"),
+            "reasoning_preview": reasoning_preview(data.get("reasoning")),
+            "filename": file_path.name,
+            "updated_at": mtime,
+        }
+
+    @staticmethod
+    def _dir_mtime(path: Path) -> Optional[float]:
+        try:
+            return path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self) -> None:
+        if not self.root.exists():
+            self._variants = {}
+            return
+
+        manifest_mtime = self._dir_mtime(self.manifest_path)
+        if manifest_mtime is not None and manifest_mtime != self._manifest_mtime:
+            self._load()
+
+        changed = False
+        present = set()
+        for persona_dir in self.root.iterdir():
+            if not persona_dir.is_dir():
+                continue
+            present.add(persona_dir.name)
+            mtime = persona_dir.stat().st_mtime
+            known = self._variants.get(persona_dir.name)
+            if known is None or known["mtime"] != mtime:
+                self._rescan(persona_dir, mtime)
+                changed = True
+
+        for name in list(self._variants):
+            if name not in present:
+                del self._variants[name]
+                changed = True
+
+        if changed:
+            self._save()
+
+    def _rescan(self, persona_dir: Path, dir_mtime: float) -> None:
+        """Re-read only the files in a variant directory that are new or modified."""
+        variant = persona_dir.name
+        previous = self._variants.get(variant, {}).get("files", {})
+        files: Dict[str, dict] = {}
+
+        for file_path in persona_dir.glob("job_*.json"):
+            mtime = file_path.stat().st_mtime
+            cached = previous.get(file_path.name)
+            if cached and cached["updated_at"] == mtime:
+                files[file_path.name] = cached
+                continue
+            with file_path.open("r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            files[file_path.name] = self._build_entry(variant, file_path, data, mtime)
+
+        self._variants[variant] = {"mtime": dir_mtime, "files": files}
+
+    def _load(self) -> None:
+        try:
+            with self.manifest_path.open("r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            self._variants = data.get("variants", {})
+        except (OSError, ValueError):
+            # Unreadable manifest: rebuild from the directories
+            self._variants = {}
+        self._manifest_mtime = self._dir_mtime(self.manifest_path)
+
+    def _save(self) -> None:
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        try:
+            with tmp_path.open("w", encoding="utf-8") as fh:
+                json.dump({"variants": self._variants}, fh)
+            os.replace(tmp_path, self.manifest_path)
+            self._manifest_mtime = self._dir_mtime(self.manifest_path)
+        except OSError:
+            # Read-only checkout: keep serving from memory
+            pass
@@ -0,0 +1,156 @@
+# backend/utils/rescoring.py
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend.db.models import Artifact, Job, JobArtifactNeighbor, JobMatch
+from backend.utils.embedding import job_embedding_text, search_similar_artifacts
+from backend.utils import matching
+from backend.utils import neighbors
+from backend.utils.neighbors import unit_rows
+
+# Job embeddings compared per batch (2048 x 1536 float32 = 12 MB)
+JOB_CHUNK = 2048
+# Tolerance between pgvector's and numpy's cosine similarity
+EPSILON = 1e-6
+
+
+def artifacts_after(db: Session, artifact_id: int) -> List[int]:
+    """Ids of the artifacts added after artifact_id, oldest first."""
+    return list(
+        db.execute(select(Artifact.id).where(Artifact.id > artifact_id).order_by(Artifact.id)).scalars()
+    )
+
+
+def affected_jobs(db: Session, artifact_ids: List[int], top_k: int = 10) -> List[Dict[str, Any]]:
+    """
+    Matched jobs whose top_k artifact set changes with the given new or
+    changed artifacts, found in one vectorized pass over the stored job
+    embeddings (cosine similarity against every artifact at once):
+
+      - fully matched jobs: an artifact is more similar than the least
+        similar stored match, or fewer than top_k matches are stored
+      - jobs already matched against one of the artifacts (its content
+        may have changed)
+      - prefiltered jobs: an artifact enters the job's top_k (beats its
+        k-th stored neighbor), and the keyword estimate over the new top_k
+        (prefilter_estimate, no LLM call) now reaches the floor
+
+    Returns job dicts (id, title, company, description, canonical_job_id,
+    strength: mean stored combined_score), canonical jobs before their
+    near-duplicates, which should be re-matched after them to copy fresh
+    matches.
+    """
+    artifacts = db.execute(
+        select(Artifact.embedding).where(Artifact.id.in_(artifact_ids), Artifact.embedding.isnot(None))
+    ).scalars().all()
+    if not artifacts:
+        return []
+    artifact_matrix = unit_rows(artifacts).T
+
+    stored = {
+        job_id: (count, lowest, strength)
+        for job_id, count, lowest, strength in db.execute(
+            select(
+                JobMatch.job_id,
+                func.count(),
+                func.min(JobMatch.similarity),
+                func.avg(JobMatch.combined_score),
+            ).group_by(JobMatch.job_id)
+        )
+    }
+    rematch = set(
+        db.execute(select(JobMatch.job_id).where(JobMatch.artifact_id.in_(artifact_ids)).distinct()).scalars()
+    )
+    # Prefiltered jobs have no stored matches: their top_k is in job_artifact_neighbors
+    kth_neighbor = dict(
+        db.execute(
+            select(JobArtifactNeighbor.job_id, JobArtifactNeighbor.similarity)
+            .join(Job, Job.id == JobArtifactNeighbor.job_id)
+            .where(Job.match_stage == "prefilter", JobArtifactNeighbor.rank == top_k - 1)
+        ).all()
+    )
+
+    affected = []
+    prefiltered = []
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(Job.id, Job.canonical_job_id, Job.match_stage, Job.neighbors_artifact_id, Job.description_embedding)
+            .where(
+                Job.id > last_id,
+                Job.match_score.isnot(None),
+                Job.description_embedding.isnot(None),
+            )
+            .order_by(Job.id)
+            .limit(JOB_CHUNK)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        best = (unit_rows(r.description_embedding for r in rows) @ artifact_matrix).max(axis=1)
+        for row, similarity in zip(rows, best.tolist()):
+            count, lowest, strength = stored.get(row.id, (0, None, None))
+            entry = (row.canonical_job_id is not None, row.id, float(strength or 0.0))
+            if row.id in rematch:
+                affected.append(entry)
+            elif row.match_stage == "prefilter":
+                # No k-th neighbor: fewer than top_k stored, or never computed.
+                # Neighbors may already include the artifact, hence >=.
+                kth = kth_neighbor.get(row.id)
+                if kth is None or similarity >= kth - EPSILON:
+                    prefiltered.append(entry)
+            elif count < top_k or similarity > lowest + EPSILON:
+                affected.append(entry)
+
+    affected.extend(_lifted_to_floor(db, prefiltered, top_k))
+    if not affected:
+        return []
+    affected.sort()
+    strengths = {job_id: strength for _, job_id, strength in affected}
+    jobs = {
+        job.id: job
+        for job in db.query(Job).filter(Job.id.in_(strengths)).all()
+    }
+    return [
+        {
+            "id": job_id,
+            "title": jobs[job_id].title,
+            "company": jobs[job_id].company or "",
+            "description": jobs[job_id].description or "",
+            "canonical_job_id": jobs[job_id].canonical_job_id,
+            "strength": strengths[job_id],
+        }
+        for _, job_id, _ in affected
+        if job_id in jobs
+    ]
+
+
+def _lifted_to_floor(db: Session, candidates: List[Tuple[bool, int, float]], top_k: int) -> List[Tuple[bool, int, float]]:
+    """
+    The prefiltered candidates whose keyword estimate over their current
+    top_k artifacts reaches the prefilter floor: only those would get a
+    full match now. Neighbors are read when current, else pgvector.
+    """
+    if not candidates:
+        return []
+    if matching.PREFILTER_MODE != "on":
+        # Re-matching runs the full match whatever the estimate
+        return candidates
+    jobs = {job.id: job for job in db.query(Job).filter(Job.id.in_([c[1] for c in candidates])).all()}
+    lifted = []
+    for entry in candidates:
+        job = jobs.get(entry[1])
+        if job is None:
+            continue
+        retrieved = neighbors.lookup(db, job, top_k)
+        if retrieved is None:
+            retrieved = search_similar_artifacts(
+                db, [float(x) for x in job.description_embedding], top_k=top_k
+            )
+        check = matching.prefilter_estimate(job_embedding_text(job.title, job.company, job.description), retrieved)
+        if not check["low_match"]:
+            lifted.append(entry)
+    return lifted
@@ -17,6 +17,7 @@ if str(ROOT) not in sys.path:
 from backend.db.repo import SessionLocal  # noqa: E402
 from backend.db.models import GeneratedArtifact, Job, PromptExperiment  # noqa: E402
 from backend.routes.jobs import _build_context  # noqa: E402
+from backend.utils import neighbors  # noqa: E402
 from backend.utils.embedding import embed_text  # noqa: E402
 from sqlalchemy import text  # noqa: E402
 
@@ -59,6 +60,11 @@ def fetch_resume_artifacts(
 
 def build_context(session, job: Job, top_k: int) -> str:
     """Rehydrate the retrieval context for the supplied job."""
+    found = neighbors.lookup(session, job, top_k)
+    if found is not None:
+        context, _ = _build_context([art for art, _ in found])
+        return context[:8000]
+
     job_text = f"{job.title or ''}\n{job.company or ''}\n{job.description or ''}"
     embedding = job.description_embedding if job.description_embedding is not None else embed_text(job_text)
 
@@ -15,8 +15,10 @@ if str(ROOT) not in sys.path:
 from backend.db.repo import SessionLocal  # noqa: E402
 from backend.db.models import Job, GeneratedArtifact  # noqa: E402
 from backend.profile.utils import load_profile  # noqa: E402
+from backend.utils import neighbors  # noqa: E402
 from backend.utils.embedding import embed_text  # noqa: E402
 from backend.routes.jobs import _persist_generated_artifact  # noqa: E402
+from backend.utils.persona_catalog import PersonaCatalog  # noqa: E402
 from sqlalchemy import text  # noqa: E402
 
 PROMPT_FILES = {
@@ -161,18 +163,18 @@ def generate_for_variant(
     variant_dir = output_dir / variant
     variant_dir.mkdir(parents=True, exist_ok=True)
     out_file = variant_dir / f"job_{job.id}.json"
+    payload = {
+        "job_id": job.id,
+        "variant": variant,
+        "reasoning": reasoning,
+        "resume_markdown": resume_md,
+        "artifact_id": artifact_id,
+    }
     with out_file.open("w", encoding="utf-8") as fh:
-        json.dump(
-            {
-                "job_id": job.id,
-                "variant": variant,
-                "reasoning": reasoning,
-                "resume_markdown": resume_md,
-                "artifact_id": artifact_id,
-            },
-            fh,
-            indent=2,
-        )
+        json.dump(payload, fh, indent=2)
+
+    # Keep the /persona_resumes listing index in sync with the new file
+    PersonaCatalog(output_dir).record(variant, out_file, payload)
 
     return artifact_id or -1
 
@@ -224,8 +226,12 @@ def main():
 
     for job in jobs:
         job_text = f"{job.title or ''}\n{job.company or ''}\n{job.description or ''}"
-        embedding = embed_text(job_text)
-        rows = session.execute(SQL_ARTIFACT_QUERY, {"embedding": embedding, "top_k": args.top_k}).fetchall()
+        found = neighbors.lookup(session, job, args.top_k)
+        if found is not None:
+            rows = [art for art, _ in found]
+        else:
+            embedding = embed_text(job_text)
+            rows = session.execute(SQL_ARTIFACT_QUERY, {"embedding": embedding, "top_k": args.top_k}).fetchall()
         profile_text, kb_text, combined_context, contact_instructions = build_context_components(rows, profile)
         already_done = existing_variants(session, job.id)
 
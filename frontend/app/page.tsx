@@ -321,6 +321,20 @@ export default function ControlPanelPage() {
     setActionLoading(true);
     setConsoleMessage("Fetching matches...");
     try {
+      // Matches stored by the matcher agent; only re-run the (LLM-backed)
+      // match when the job has never been matched.
+      const stored = await fetch(buildUrl(`/jobs/${job.id}/matches`));
+      if (stored.ok) {
+        const storedData = await stored.json();
+        if ((storedData.matches ?? []).length > 0) {
+          setMatches(storedData.matches);
+          setConsoleMessage(
+            `Found ${storedData.matches.length} stored matches for "${job.title}".`,
+          );
+          return;
+        }
+      }
+
       const resp = await fetch(buildUrl("/jobs/match"), {
         method: "POST",
         headers: { "Content-Type": "application/json" },
@@ -1,75 +1,74 @@
 import argparse
-import json
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
+from sqlalchemy import func
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.append(str(ROOT))
 
 from backend.db.repo import SessionLocal  # noqa: E402
-from backend.db.models import Job  # noqa: E402
+from backend.db.models import Job, JobMatch  # noqa: E402
+from backend.agents.state_store import open_state_store  # noqa: E402
+from backend.utils.legacy_matches import import_legacy_matches, legacy_matches  # noqa: E402
 
 
-def load_state(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        raise FileNotFoundError(f"State file not found: {path}")
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+def load_legacy_matches(path: Path) -> Dict[int, List[Dict[str, Any]]]:
+    """Read processed_jobs from a pre-job_matches matcher state (JSON or SQLite)."""
+    legacy = legacy_matches(open_state_store(str(path)).load())
+    if legacy is None:
+        raise ValueError(f"{path} has no legacy 'processed_jobs' map to import")
+    return legacy
 
 
-def backfill_scores(state_file: Path, dry_run: bool = False) -> int:
-    data = load_state(state_file)
-    processed = data.get("processed_jobs", {})
-    if not isinstance(processed, dict):
-        raise ValueError("matcher_state.json missing 'processed_jobs' dict")
-
-    updated = 0
+def backfill_scores(import_state: Optional[Path] = None, dry_run: bool = False) -> Dict[str, int]:
+    """Set jobs.match_score to the best stored combined_score wherever they differ."""
     session = SessionLocal()
-
     try:
-        for job_id_str, payload in processed.items():
-            try:
-                job_id = int(job_id_str)
-            except (TypeError, ValueError):
-                continue
-
-            score = payload.get("score")
-            if score is None:
-                continue
-
-            job = session.query(Job).filter(Job.id == job_id).first()
-            if not job:
-                continue
-
-            if job.match_score == score:
-                continue
-
+        imported = 0
+        if import_state is not None:
+            imported = import_legacy_matches(session, load_legacy_matches(import_state))
+            session.flush()
+
+        best = (
+            session.query(JobMatch.job_id, func.max(JobMatch.combined_score).label("best"))
+            .group_by(JobMatch.job_id)
+            .subquery()
+        )
+        rows = (
+            session.query(Job, best.c.best)
+            .join(best, best.c.job_id == Job.id)
+            .filter((Job.match_score.is_(None)) | (Job.match_score != best.c.best))
+            .all()
+        )
+        for job, score in rows:
             job.match_score = score
-            updated += 1
 
         if dry_run:
             session.rollback()
         else:
             session.commit()
 
-        return updated
+        return {"imported": imported, "updated": len(rows)}
     finally:
         session.close()
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Backfill job.match_score values from matcher_state.json"
+        description="Backfill job.match_score values from the job_matches table"
     )
     parser.add_argument(
-        "--state",
+        "--import-state",
         type=Path,
-        default=Path("matcher_state.json"),
-        help="Path to matcher_state.json",
+        default=None,
+        help=(
+            "Also import per-artifact matches from an old matcher_state.json (processed_jobs), "
+            "or from the matcher_state.json.legacy.json backup the matcher writes when it migrates one"
+        ),
     )
     parser.add_argument(
         "--dry-run",
@@ -79,11 +78,15 @@ def main():
     args = parser.parse_args()
 
     load_dotenv()
-    updated = backfill_scores(args.state, args.dry_run)
+    counts = backfill_scores(args.import_state, args.dry_run)
     if args.dry_run:
-        print(f"[dry-run] Would update match_score for {updated} jobs")
+        if args.import_state is not None:
+            print(f"[dry-run] Would import {counts['imported']} job_matches rows")
+        print(f"[dry-run] Would update match_score for {counts['updated']} jobs")
     else:
-        print(f"Updated match_score for {updated} jobs")
+        if args.import_state is not None:
+            print(f"Imported {counts['imported']} job_matches rows")
+        print(f"Updated match_score for {counts['updated']} jobs")
 
 
 if __name__ == "__main__":
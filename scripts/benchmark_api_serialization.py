@@ -0,0 +1,132 @@
+import argparse
+import gzip
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+
+from backend.db.schemas import JobRead  # noqa: E402
+
+try:
+    import brotli
+except ImportError:  # optional, only used to report br sizes
+    brotli = None
+
+
+SAMPLE_PARAGRAPH = (
+    "We are looking for a Data Engineer to design, build and maintain batch and "
+    "streaming pipelines on AWS (Glue, Lambda, Redshift) and Airflow. You will "
+    "partner with analytics and ML teams, own data quality checks, and write "
+    "production Python and SQL. Experience with dbt, Spark and Kafka is a plus. "
+)
+
+
+def synthetic_jobs(count: int, desc_chars: int) -> List[Dict[str, Any]]:
+    """Build JobRead-shaped dicts with realistic description sizes."""
+    reps = max(1, desc_chars // len(SAMPLE_PARAGRAPH))
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "id": i,
+            "title": f"Senior Data Engineer {i}",
+            "company": f"Company {i % 17}",
+            "location": "New York, NY",
+            "description": SAMPLE_PARAGRAPH * reps,
+            "source_url": f"https://www.adzuna.com/details/{1000000 + i}",
+            "created_at": now,
+            "match_score": 0.5 + (i % 50) / 100,
+        }
+        for i in range(count)
+    ]
+
+
+def db_jobs(count: int) -> List[Dict[str, Any]]:
+    from backend.db.repo import SessionLocal
+    from backend.db.models import Job
+
+    session = SessionLocal()
+    try:
+        rows = session.query(Job).order_by(Job.id.desc()).limit(count).all()
+        return [JobRead.model_validate(r).model_dump() for r in rows]
+    finally:
+        session.close()
+
+
+def time_call(fn: Callable[[], bytes], repeat: int) -> float:
+    """Return the median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare stdlib JSON vs orjson serialization and compressed sizes for a /jobs/ listing."
+    )
+    parser.add_argument("--jobs", type=int, default=100, help="Number of jobs in the listing.")
+    parser.add_argument(
+        "--desc-chars",
+        type=int,
+        default=6000,
+        help="Approximate description length for synthetic jobs.",
+    )
+    parser.add_argument("--repeat", type=int, default=50, help="Timing iterations per method.")
+    parser.add_argument(
+        "--from-db",
+        action="store_true",
+        help="Use the newest jobs from DATABASE_URL instead of synthetic data.",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    raw = db_jobs(args.jobs) if args.from_db else synthetic_jobs(args.jobs, args.desc_chars)
+    # Same work FastAPI does for a response_model=List[JobRead] route
+    models = [JobRead.model_validate(j) for j in raw]
+
+    def stdlib_path() -> bytes:
+        return JSONResponse(content=None).render(jsonable_encoder(models))
+
+    def orjson_path() -> bytes:
+        return ORJSONResponse(content=None).render(jsonable_encoder(models))
+
+    def orjson_direct() -> bytes:
+        return ORJSONResponse(content=None).render([m.model_dump() for m in models])
+
+    body = orjson_path()
+    print(f"Listing: {len(models)} jobs")
+    print(f"{'method':<28}{'median ms':>12}")
+    for name, fn in (
+        ("jsonable_encoder + json", stdlib_path),
+        ("jsonable_encoder + orjson", orjson_path),
+        ("model_dump + orjson", orjson_direct),
+    ):
+        print(f"{name:<28}{time_call(fn, args.repeat):>12.2f}")
+
+    print()
+    print(f"{'encoding':<28}{'bytes':>12}{'ms':>10}")
+    print(f"{'identity':<28}{len(body):>12}{0.0:>10.2f}")
+    gz_ms = time_call(lambda: gzip.compress(body, compresslevel=9), args.repeat)
+    print(f"{'gzip (level 9)':<28}{len(gzip.compress(body, compresslevel=9)):>12}{gz_ms:>10.2f}")
+    if brotli is not None:
+        br_ms = time_call(lambda: brotli.compress(body, quality=4), args.repeat)
+        print(f"{'brotli (quality 4)':<28}{len(brotli.compress(body, quality=4)):>12}{br_ms:>10.2f}")
+    else:
+        print("brotli not installed; skipping br size.")
+
+
+if __name__ == "__main__":
+    main()
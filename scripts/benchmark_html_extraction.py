@@ -0,0 +1,113 @@
+import argparse
+import re
+import statistics
+import sys
+import time
+from html import unescape
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.utils.html_extract import extract_text  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "job_pages"
+
+# Inline tracking/bundle code typical of a live job page's <head>
+PADDING_SCRIPT = (
+    "<script>(function(){var cfg={env:'prod',release:'2025.1',flags:{a:true,b:false}};"
+    "window.__APP_STATE__=window.__APP_STATE__||{};for(var i=0;i<10;i++){cfg['k'+i]=i*2;}"
+    "window.__APP_STATE__.cfg=cfg;})();</script>\n"
+)
+
+# Fragments that only show up in the output if script/style content leaked
+LEAK_MARKERS = ("function(", "window.", "gtag(", "dataLayer", "{", "}")
+
+
+def legacy_regex_extract(html: str) -> str:
+    """JobFetcherAgent._extract_text before the lxml engine, kept for comparison."""
+    if not html:
+        return ""
+
+    match = re.search(r'<section class="adp-body.*?">(.*?)</section>', html, re.S | re.I)
+    if match:
+        html = match.group(1)
+
+    html = re.sub(r"(?is)<(script|style).*?>.*?</\\1>", " ", html)
+    html = re.sub(r"(?s)<.*?>", " ", html)
+    text = unescape(html)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def lxml_extract(html: str) -> str:
+    return extract_text(html, section_class="adp-body")
+
+
+def load_pages(directory: Path, pad_kb: int) -> Dict[str, str]:
+    pages = {}
+    padding = PADDING_SCRIPT * max(0, (pad_kb * 1024) // len(PADDING_SCRIPT))
+    for path in sorted(directory.glob("*.htm*")):
+        html = path.read_text(encoding="utf-8", errors="ignore")
+        # Live pages are mostly script: pad <head> to a realistic size
+        pages[path.name] = html.replace("</head>", padding + "</head>", 1)
+    return pages
+
+
+def time_call(fn: Callable[[str], str], html: str, repeat: int) -> float:
+    """Return the median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(html)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the legacy regex job-page extractor with the lxml engine on saved pages."
+    )
+    parser.add_argument("--pages", type=Path, default=FIXTURES, help="Directory of saved .html pages.")
+    parser.add_argument(
+        "--pad-kb",
+        type=int,
+        default=20,
+        help=(
+            "Inline script added to each page's <head>. Live pages run 100-300 KB, but the "
+            "legacy regex is quadratic on pages without an adp-body section (seconds at 40 KB)."
+        ),
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Timing iterations per page.")
+    parser.add_argument("--show", action="store_true", help="Print each engine's output.")
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.pad_kb)
+    if not pages:
+        print(f"No .html pages in {args.pages}")
+        return
+
+    engines = (("legacy regex", legacy_regex_extract), ("lxml engine", lxml_extract))
+    print(f"{len(pages)} pages from {args.pages} (+{args.pad_kb} KB script each)")
+    print(f"{'page':<34}{'engine':<14}{'median ms':>10}{'chars':>8}{'~tokens':>9}{'leaks':>7}")
+
+    totals: Dict[str, List[float]] = {name: [] for name, _ in engines}
+    for page_name, html in pages.items():
+        for name, fn in engines:
+            text = fn(html)
+            ms = time_call(fn, html, args.repeat)
+            totals[name].append(ms)
+            leaks = sum(text.count(marker) for marker in LEAK_MARKERS)
+            print(f"{page_name:<34}{name:<14}{ms:>10.2f}{len(text):>8}{len(text) // 4:>9}{leaks:>7}")
+            if args.show:
+                print(text, end="\n\n")
+
+    print()
+    for name, samples in totals.items():
+        print(f"{name:<14} total {sum(samples):.2f} ms, median/page {statistics.median(samples):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
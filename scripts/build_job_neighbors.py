@@ -0,0 +1,46 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.db.repo import SessionLocal, init_db  # noqa: E402
+from backend.utils import neighbors  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Precompute each embedded job's nearest artifacts (job_artifact_neighbors) with NumPy, "
+            "in chunks; by default only jobs never computed or behind newer artifacts."
+        )
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute every job over the whole corpus (edited artifacts are picked up without it)",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    init_db()
+
+    session = SessionLocal()
+    started = time.perf_counter()
+    try:
+        counts = neighbors.update_neighbors(session, rebuild=args.rebuild)
+    finally:
+        session.close()
+    print(
+        f"Top {neighbors.TOP_N} neighbors: {counts['built']} jobs computed, {counts['merged']} updated "
+        f"with new artifacts in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -45,6 +45,7 @@ def generate_resume(api_base: str, job: dict, top_k: int, retries: int = 3) -> d
         "company": job.get("company", "") or "",
         "description": job.get("description", "") or "",
         "top_k": top_k,
+        "job_id": job.get("id"),
         "job_focused": True,
     }
     for attempt in range(1, retries + 1):
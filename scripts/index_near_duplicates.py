@@ -0,0 +1,78 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.db.repo import SessionLocal, init_db  # noqa: E402
+from backend.db.models import Job  # noqa: E402
+from backend.utils.near_duplicate import index_job  # noqa: E402
+
+
+def index_existing_jobs(batch_size: int = 200, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Sign and link jobs stored before near-duplicate detection, oldest
+    first, so the earliest posting of a role becomes its canonical job.
+    """
+    session = SessionLocal()
+    try:
+        indexed = linked = 0
+        last_id = 0
+        while True:
+            jobs = (
+                session.query(Job)
+                .filter(Job.id > last_id, Job.description_minhash.is_(None))
+                .order_by(Job.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not jobs:
+                break
+            for job in jobs:
+                last_id = job.id
+                if job.canonical_job_id is not None:
+                    continue
+                match = index_job(session, job)
+                if job.description_minhash is not None:
+                    indexed += 1
+                if match is not None:
+                    linked += 1
+                    print(f"Job {job.id} ({job.title}) -> canonical job {match[0]} (similarity {match[1]:.2f})")
+            # Later batches must see this batch's index rows
+            session.flush()
+            if not dry_run:
+                session.commit()
+
+        if dry_run:
+            session.rollback()
+        return {"indexed": indexed, "linked": linked}
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Add existing jobs to the near-duplicate index and link reposts to their canonical job"
+    )
+    parser.add_argument("--batch-size", type=int, default=200, help="Jobs loaded per query")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report links without writing to the database",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    init_db()
+    counts = index_existing_jobs(args.batch_size, args.dry_run)
+    prefix = "[dry-run] Would index" if args.dry_run else "Indexed"
+    print(f"{prefix} {counts['indexed']} jobs, {counts['linked']} linked to a canonical job")
+
+
+if __name__ == "__main__":
+    main()
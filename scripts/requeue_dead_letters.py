@@ -0,0 +1,62 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.queue.factory import KNOWN_QUEUES, get_queue  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Inspect, requeue or purge agent queue items that exhausted their retries."
+    )
+    parser.add_argument(
+        "--queue",
+        choices=KNOWN_QUEUES,
+        action="append",
+        help="Queue to operate on (repeatable). Defaults to every agent queue.",
+    )
+    parser.add_argument(
+        "--ids",
+        type=int,
+        nargs="+",
+        help="Dead-letter IDs to requeue/purge. Defaults to all of them.",
+    )
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--requeue", action="store_true", help="Move dead items back onto the queue.")
+    action.add_argument("--purge", action="store_true", help="Delete dead items permanently.")
+    parser.add_argument("--limit", type=int, default=50, help="Max items to list per queue (default 50).")
+    return parser.parse_args()
+
+
+def main() -> None:
+    load_dotenv()
+    args = parse_args()
+
+    for name in args.queue or KNOWN_QUEUES:
+        queue = get_queue(name)
+        if args.requeue:
+            count = queue.requeue_dead_letters(args.ids)
+            print(f"{name}: requeued {count} item(s)")
+        elif args.purge:
+            count = queue.purge_dead_letters(args.ids)
+            print(f"{name}: purged {count} item(s)")
+        else:
+            dead = queue.dead_letters(args.limit)
+            print(f"{name}: {len(dead)} dead item(s)")
+            for entry in dead:
+                print(
+                    f"  #{entry['id']} attempts={entry['attempts']} failed_at={entry['failed_at']}\n"
+                    f"    item: {json.dumps(entry['item'])}\n"
+                    f"    error: {entry['last_error']}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import List
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.agents.job_matcher import JobMatcherAgent  # noqa: E402
+from backend.db.repo import SessionLocal  # noqa: E402
+from backend.utils import matching, rescoring  # noqa: E402
+
+
+def parse_ids(raw: str) -> List[int]:
+    return [int(part) for part in raw.split(",") if part.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-match only the jobs whose top-k artifact set changes with new or changed artifacts."
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--artifact-ids", help="Comma-separated ids of new or changed artifacts")
+    group.add_argument("--since-artifact", type=int, help="Use every artifact with a higher id")
+    parser.add_argument("--top-k", type=int, default=JobMatcherAgent.MATCH_TOP_K, help="Top K artifacts per job")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List the affected jobs without re-matching them",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    session = SessionLocal()
+    try:
+        if args.artifact_ids:
+            artifact_ids = parse_ids(args.artifact_ids)
+        else:
+            artifact_ids = rescoring.artifacts_after(session, args.since_artifact)
+        jobs = rescoring.affected_jobs(session, artifact_ids, top_k=args.top_k)
+    finally:
+        session.close()
+
+    print(f"{len(artifact_ids)} artifacts change the top {args.top_k} of {len(jobs)} jobs.")
+    if args.dry_run:
+        for job in jobs:
+            print(f"[dry-run] Job {job['id']}: {job['title']} (strength {job['strength']:.4f})")
+        return
+
+    threshold = JobMatcherAgent.MATCH_THRESHOLD
+    newly_strong = []
+    failures = 0
+    # Canonical jobs come first, so near-duplicates copy their fresh matches
+    for job in jobs:
+        try:
+            result = matching.match_job(
+                job["title"], job["company"], job["description"], top_k=args.top_k, job_id=job["id"]
+            )
+        except Exception as exc:
+            failures += 1
+            print(f"Job {job['id']}: re-match failed ({type(exc).__name__}: {exc})")
+            continue
+        scores = [m["combined_score"] for m in result["matches"]]
+        strength = sum(scores) / len(scores) if scores else 0.0
+        print(f"Job {job['id']}: strength {job['strength']:.4f} -> {strength:.4f}")
+        if job["strength"] < threshold <= strength:
+            newly_strong.append(job["id"])
+
+    print(f"Re-matched {len(jobs) - failures} jobs ({failures} failed).")
+    if newly_strong:
+        print(
+            f"Newly strong (>= {threshold}), not queued for resumes: "
+            + ",".join(str(job_id) for job_id in newly_strong)
+        )
+
+
+if __name__ == "__main__":
+    main()
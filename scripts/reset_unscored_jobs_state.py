@@ -1,8 +1,7 @@
 import argparse
-import json
 import sys
 from pathlib import Path
-from typing import Dict, Any, Set
+from typing import Dict, Set
 
 from dotenv import load_dotenv
 
@@ -12,6 +11,7 @@ if str(ROOT) not in sys.path:
 
 from backend.db.repo import SessionLocal  # noqa: E402
 from backend.db.models import Job  # noqa: E402
+from backend.agents.state_store import StateStore, open_state_store  # noqa: E402
 
 
 def fetch_unscored_job_ids() -> Set[int]:
@@ -24,41 +24,52 @@ def fetch_unscored_job_ids() -> Set[int]:
         session.close()
 
 
-def load_state(path: Path) -> Dict[str, Any]:
-    if not path.exists():
-        raise FileNotFoundError(f"State file not found: {path}")
-    with path.open("r", encoding="utf-8") as fh:
-        return json.load(fh)
+def load_state(path: Path) -> StateStore:
+    """Open the matcher's state store (JSON or SQLite per ALFRED_STATE_BACKEND)."""
+    store = open_state_store(str(path))
+    if not store.load():
+        raise FileNotFoundError(f"State file not found or empty: {path}")
+    return store
 
 
-def prune_state(state: Dict[str, Any], job_ids: Set[int]) -> Dict[str, int]:
-    """Remove the provided job IDs from processed/queued/skipped maps."""
+def prune_state(store: StateStore, job_ids: Set[int], dry_run: bool = False) -> Dict[str, int]:
+    """Remove the provided job IDs from processed/queued/skipped maps (only count them on dry_run)."""
     removed_counts = {"processed_jobs": 0, "queued_jobs": 0, "skipped_jobs": 0}
     target_ids = {str(job_id) for job_id in job_ids}
 
     for key in removed_counts.keys():
-        mapping = state.get(key)
+        mapping = store.data.get(key)
         if not isinstance(mapping, dict):
             continue
 
         for job_id in list(mapping.keys()):
             if job_id in target_ids:
-                mapping.pop(job_id, None)
+                if not dry_run:
+                    store.delete(key, job_id)
                 removed_counts[key] += 1
 
     return removed_counts
 
 
-def save_state(path: Path, state: Dict[str, Any]) -> None:
-    with path.open("w", encoding="utf-8") as fh:
-        json.dump(state, fh, indent=2, ensure_ascii=False)
-        fh.write("\n")
+def schedule_retries(store: StateStore, job_ids: Set[int]) -> int:
+    """
+    Add already-passed job IDs to the matcher's retry_jobs so it matches
+    them again (watermark-based state). Returns the number added.
+    """
+    watermark = int(store.data.get("match_progress", {}).get("watermark", 0))
+    retry_jobs = store.data.get("retry_jobs", {})
+    added = 0
+    for job_id in sorted(job_ids):
+        if job_id <= watermark and str(job_id) not in retry_jobs:
+            store.put("retry_jobs", str(job_id), {"attempts": 0})
+            added += 1
+    return added
 
 
 def main():
     parser = argparse.ArgumentParser(
         description=(
-            "Remove jobs without match_score from matcher_state.json so the matcher will reprocess them."
+            "Make the matcher reprocess jobs without match_score (adds them to retry_jobs in matcher_state)."
         )
     )
     parser.add_argument(
@@ -81,8 +92,28 @@ def main():
         print("No jobs with NULL match_score found.")
         return
 
-    state = load_state(args.state)
-    removed_counts = prune_state(state, job_ids)
+    store = load_state(args.state)
+
+    if "match_progress" in store.data:
+        if args.dry_run:
+            watermark = int(store.data["match_progress"].get("watermark", 0))
+            pending = [i for i in job_ids if i <= watermark and str(i) not in store.data.get("retry_jobs", {})]
+            print(
+                f"Identified {len(job_ids)} jobs without match_score. "
+                f"Would schedule {len(pending)} for re-matching."
+            )
+            print("[dry-run] State file left untouched.")
+            return
+        added = schedule_retries(store, job_ids)
+        store.flush()
+        print(
+            f"Identified {len(job_ids)} jobs without match_score. "
+            f"Scheduled {added} for re-matching."
+        )
+        return
+
+    # State written before the matcher switched to a watermark
+    removed_counts = prune_state(store, job_ids, dry_run=args.dry_run)
 
     total_removed = sum(removed_counts.values())
     print(
@@ -96,7 +127,7 @@ def main():
         print("[dry-run] State file left untouched.")
         return
 
-    save_state(args.state, state)
+    store.flush()
     print(f"State file updated. Total entries removed: {total_removed}")
 
 
@@ -0,0 +1,110 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import func
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from backend.agents.job_matcher import JobMatcherAgent  # noqa: E402
+from backend.db.repo import SessionLocal  # noqa: E402
+from backend.db.models import Job, JobMatch  # noqa: E402
+from backend.utils import matching  # noqa: E402
+from backend.utils.embedding import job_embedding_text, search_similar_artifacts  # noqa: E402
+
+
+def collect_estimates(top_k: int, limit: int | None = None) -> List[Tuple[int, float, float]]:
+    """
+    (job id, prefilter estimate, hybrid strength) for every fully matched
+    job with a stored embedding. The strength is the mean combined score
+    of its job_matches rows, the value JobMatcherAgent compares with
+    MATCH_THRESHOLD. No LLM or embedding calls are made.
+    """
+    session = SessionLocal()
+    try:
+        strength = (
+            session.query(JobMatch.job_id, func.avg(JobMatch.combined_score).label("strength"))
+            .group_by(JobMatch.job_id)
+            .subquery()
+        )
+        query = (
+            session.query(Job, strength.c.strength)
+            .join(strength, strength.c.job_id == Job.id)
+            .filter(Job.description_embedding.isnot(None))
+            .order_by(Job.id)
+        )
+        if limit:
+            query = query.limit(limit)
+
+        rows = []
+        for job, job_strength in query:
+            retrieved = search_similar_artifacts(
+                session, [float(x) for x in job.description_embedding], top_k=top_k
+            )
+            check = matching.prefilter_estimate(
+                job_embedding_text(job.title, job.company, job.description), retrieved
+            )
+            rows.append((job.id, check["estimate"], float(job_strength)))
+        return rows
+    finally:
+        session.close()
+
+
+def floor_report(rows: List[Tuple[int, float, float]], floor: float, threshold: float) -> Dict[str, int]:
+    filtered = [r for r in rows if r[1] < floor]
+    return {
+        "filtered": len(filtered),
+        "lost_strong": sum(1 for r in filtered if r[2] >= threshold),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay the matching prefilter on fully matched jobs and report, per floor, "
+        "how many jobs it would mark low-match and how many of those were strong matches."
+    )
+    parser.add_argument(
+        "--floors",
+        default="0.25,0.3,0.35,0.4,0.45,0.5",
+        help="Comma-separated floors to compare (default: %(default)s)",
+    )
+    parser.add_argument("--top-k", type=int, default=10, help="Artifacts retrieved per job, as the matcher does")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=JobMatcherAgent.MATCH_THRESHOLD,
+        help="Hybrid strength counted as a strong match (default: %(default)s)",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Optional cap on number of jobs")
+    parser.add_argument("--show", action="store_true", help="Print each job's estimate and strength")
+    args = parser.parse_args()
+
+    load_dotenv()
+
+    rows = collect_estimates(args.top_k, args.limit)
+    if not rows:
+        print("No fully matched jobs with a stored embedding found.")
+        return
+
+    if args.show:
+        for job_id, estimate, strength in rows:
+            print(f"job {job_id}: estimate={estimate:.4f} strength={strength:.4f}")
+
+    strong = sum(1 for r in rows if r[2] >= args.threshold)
+    print(
+        f"{len(rows)} jobs, {strong} strong (strength >= {args.threshold}); "
+        f"current floor {matching.PREFILTER_FLOOR} ({matching.PREFILTER_MODE})"
+    )
+    print(f"{'floor':>6}{'low-match':>11}{'share':>8}{'lost strong':>13}")
+    for floor in (float(f) for f in args.floors.split(",") if f.strip()):
+        report = floor_report(rows, floor, args.threshold)
+        share = report["filtered"] / len(rows)
+        print(f"{floor:>6.2f}{report['filtered']:>11}{share:>8.0%}{report['lost_strong']:>13}")
+
+
+if __name__ == "__main__":
+    main()